@@ -0,0 +1,476 @@
+"""
+Headless benchmarks for the widget hot paths of the quiz application.
+
+Runs on Qt's offscreen platform against a throwaway database and reports, for
+each operation, the wall time, the Python allocations (tracemalloc; memory
+allocated by Qt itself is not traced) and the number of widgets it creates and
+leaves behind. Results are printed as a table and can be written as JSON and
+compared against an earlier run.
+
+Usage:
+    python -m benchmarks.ui_benchmarks [--repeat N] [--questions N]
+                                       [--filter TEXT] [--output FILE] [--compare FILE]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# Must be set before the QApplication is created
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Default number of timed runs per benchmark
+DEFAULT_REPEAT = 5
+
+# Default number of questions stepped through by the question benchmarks
+DEFAULT_QUESTIONS = 1000
+
+# Ratio of median times per operation above which --compare reports a regression
+REGRESSION_THRESHOLD = 1.10
+
+# Version of the JSON result format
+RESULT_FORMAT_VERSION = 1
+
+
+class Benchmark:
+    """A named operation to measure.
+
+    setup() prepares whatever the operation needs outside of the measurement,
+    run(state) is the measured part and teardown(state, result) disposes of
+    everything that was created.
+    """
+
+    def __init__(self, name: str, run: Callable, setup: Optional[Callable] = None,
+                 teardown: Optional[Callable] = None, iterations: int = 1):
+        """Initialize the benchmark.
+
+        Args:
+            name: Name of the benchmark in reports
+            run: Callable taking the setup state and returning what it created
+            setup: Callable returning the state passed to run, or None
+            teardown: Callable taking the state and the result of run, or None
+            iterations: Number of operations one call to run performs
+        """
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+        self.teardown = teardown or (lambda state, result: dispose(result))
+        self.iterations = iterations
+
+
+def dispose(*objects) -> None:
+    """Delete widgets created by a benchmark and let Qt process the deletions."""
+    for obj in objects:
+        if obj is not None and hasattr(obj, "deleteLater"):
+            obj.deleteLater()
+    flush_events()
+
+
+def flush_events() -> None:
+    """Process pending events, including deferred deletes."""
+    from PySide6.QtCore import QCoreApplication, QEvent
+
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    QCoreApplication.processEvents()
+    gc.collect()
+
+
+def widget_count() -> int:
+    """Number of widgets currently alive in the application."""
+    from PySide6.QtWidgets import QApplication
+
+    return len(QApplication.allWidgets())
+
+
+def measure(benchmark: Benchmark, repeat: int) -> Dict[str, Any]:
+    """Run a benchmark and collect its timings, allocations and widget counts.
+
+    Args:
+        benchmark: The benchmark to run
+        repeat: Number of timed runs
+
+    Returns:
+        A dictionary with the measurements of the benchmark
+    """
+    # Warm-up run so one-off costs (imports, file parsing, style caches) don't count
+    state = benchmark.setup()
+    benchmark.teardown(state, benchmark.run(state))
+
+    times = []
+    for _ in range(repeat):
+        state = benchmark.setup()
+        flush_events()
+        start = time.perf_counter()
+        result = benchmark.run(state)
+        times.append(time.perf_counter() - start)
+        benchmark.teardown(state, result)
+
+    # Widget counts, in a separate run so the counting doesn't skew the timings
+    flush_events()
+    widgets_at_start = widget_count()
+    state = benchmark.setup()
+    flush_events()
+    widgets_before = widget_count()
+    result = benchmark.run(state)
+    widgets_created = widget_count() - widgets_before
+    benchmark.teardown(state, result)
+    flush_events()
+    widgets_leaked = widget_count() - widgets_at_start
+
+    # Allocations, also in a separate run since tracing slows everything down
+    state = benchmark.setup()
+    flush_events()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    result = benchmark.run(state)
+    traced_after, traced_peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    benchmark.teardown(state, result)
+
+    allocated_blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0
+    )
+
+    median = statistics.median(times)
+    return {
+        "name": benchmark.name,
+        "iterations": benchmark.iterations,
+        "repeat": repeat,
+        "wall_time_s": {
+            "min": min(times),
+            "median": median,
+            "mean": statistics.mean(times),
+            "max": max(times),
+        },
+        "per_iteration_us": median / benchmark.iterations * 1e6,
+        "allocations": {
+            "net_bytes": traced_after - traced_before,
+            "peak_bytes": traced_peak - traced_before,
+            "new_blocks": allocated_blocks,
+        },
+        "widgets": {
+            "created": widgets_created,
+            "leaked": widgets_leaked,
+        },
+    }
+
+
+def build_benchmarks(questions: int) -> List[Benchmark]:
+    """Build the list of benchmarks.
+
+    Args:
+        questions: Number of questions stepped through by the question benchmarks
+
+    Returns:
+        The benchmarks, in the order they run
+    """
+    import main
+    from quizzes.mappings import SUBMENU_ITEMS
+    from quizzes.menu import MainMenu, SubMenu
+    from quizzes.quiz_content import quiz_content
+    from quizzes.quiz_manager import quiz_manager
+
+    # Register the file-based quizzes of quizz_data/, as main.py does at startup
+    quiz_content.scan()
+
+    benchmarks = [
+        Benchmark("main_window", lambda state: main.MainWindow()),
+        Benchmark("main_menu", lambda state: MainMenu()),
+    ]
+
+    for category, items in SUBMENU_ITEMS.items():
+        benchmarks.append(Benchmark(
+            f"sub_menu[{category}]",
+            lambda state, category=category, items=items: SubMenu(category, items)
+        ))
+
+    quiz_variants = [(name, {}) for name in quiz_manager.get_all_quiz_names()]
+    # The math quizzes default to answer buttons; cover the input field as well
+    quiz_variants.append(("MultiplicationQuiz", {"input_mode": True}))
+
+    for name, options in quiz_variants:
+        label = name + ("[input]" if options.get("input_mode") is True else "")
+
+        benchmarks.append(Benchmark(
+            f"create_quiz[{label}]",
+            lambda state, name=name, options=options: quiz_manager.create_quiz(
+                name, show_questions_control=False, **options
+            )
+        ))
+
+        benchmarks.append(Benchmark(
+            f"reenter_quiz[{label}]",
+            lambda container, name=name, options=options: container.set_quiz(
+                container.get_quiz(name, show_questions_control=False, **options)
+            ),
+            setup=lambda name=name, options=options: create_warm_container(name, options),
+            teardown=lambda container, result: dispose(container)
+        ))
+
+        def create_long_quiz(name=name, options=options):
+            return quiz_manager.create_quiz(
+                name, total_questions=questions + 1, show_questions_control=False, **options
+            )
+
+        benchmarks.append(Benchmark(
+            f"next_question[{label}]",
+            run_next_questions(questions),
+            setup=create_long_quiz,
+            teardown=lambda quiz, result: dispose(quiz),
+            iterations=questions
+        ))
+        benchmarks.append(Benchmark(
+            f"generate_new_question[{label}]",
+            run_generate_new_questions(questions),
+            setup=create_long_quiz,
+            teardown=lambda quiz, result: dispose(quiz),
+            iterations=questions
+        ))
+        benchmarks.append(Benchmark(
+            f"answer_question[{label}]",
+            run_answer_questions(questions),
+            setup=lambda create=create_long_quiz: show(create()),
+            teardown=lambda quiz, result: dispose(quiz),
+            iterations=questions
+        ))
+
+    # Per-answer restyling of the question and feedback labels, the legacy way
+    # (a new style sheet per widget) next to the dynamic property way
+    for strategy in ("setStyleSheet", "property"):
+        benchmarks.append(Benchmark(
+            f"answer_feedback_style[{strategy}]",
+            run_feedback_styles(strategy, questions),
+            setup=create_feedback_labels,
+            teardown=lambda labels, result: dispose(labels[2]),
+            iterations=questions
+        ))
+
+    return benchmarks
+
+
+def create_warm_container(name: str, options: Dict[str, Any]):
+    """Create a quiz container that already holds a pooled instance of a quiz."""
+    from quizzes.quiz_container import QuizContainer
+
+    container = QuizContainer()
+    container.set_quiz(container.get_quiz(name, show_questions_control=False, **options))
+    return container
+
+
+def show(widget):
+    """Show a widget and let it lay out and polish, then return it."""
+    widget.show()
+    flush_events()
+    return widget
+
+
+def create_feedback_labels():
+    """Create a shown question label and feedback label styled like the quiz screen.
+
+    Returns:
+        The question label, the feedback label and the window holding them
+    """
+    from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+    from quizzes.style_engine import set_style_role
+
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    question_label = QLabel("7 x 8 = ?")
+    feedback_label = QLabel()
+    set_style_role(question_label, "question")
+    set_style_role(feedback_label, "feedback")
+    layout.addWidget(question_label)
+    layout.addWidget(feedback_label)
+    show(container)
+    return question_label, feedback_label, container
+
+
+def run_feedback_styles(strategy: str, answers: int) -> Callable:
+    """Make a run function showing feedback for answers and resetting it for the next question."""
+    from quizzes import styles
+    from quizzes.style_engine import set_style_state
+
+    def run_set_style_sheet(labels):
+        question_label, feedback_label, _ = labels
+        for i in range(answers):
+            correct = i % 2 == 0
+            feedback_label.setStyleSheet(
+                styles.FEEDBACK_CORRECT_STYLE if correct else styles.FEEDBACK_INCORRECT_STYLE
+            )
+            question_label.setStyleSheet(
+                styles.QUESTION_CORRECT_STYLE if correct else styles.QUESTION_INCORRECT_STYLE
+            )
+            question_label.setStyleSheet(styles.QUESTION_LABEL_STYLE)
+            feedback_label.setStyleSheet(styles.FEEDBACK_LABEL_STYLE)
+
+    def run_property(labels):
+        question_label, feedback_label, _ = labels
+        for i in range(answers):
+            state = "correct" if i % 2 == 0 else "incorrect"
+            set_style_state(feedback_label, state)
+            set_style_state(question_label, state)
+            set_style_state(question_label)
+            set_style_state(feedback_label)
+
+    return run_set_style_sheet if strategy == "setStyleSheet" else run_property
+
+
+def run_next_questions(questions: int) -> Callable:
+    """Make a run function stepping a quiz through questions like the next button does."""
+    def run(quiz):
+        for _ in range(questions):
+            quiz.current_question += 1
+            quiz.next_question()
+    return run
+
+
+def run_answer_questions(questions: int) -> Callable:
+    """Make a run function answering questions, alternately right and wrong, and moving on."""
+    def run(quiz):
+        for i in range(questions):
+            correct = i % 2 == 0
+            if quiz.self_assess_mode:
+                quiz._self_assess(correct)
+            else:
+                quiz.on_answer_button_click(quiz.expected_answer if correct else "wrong")
+            quiz.current_question += 1
+            quiz.next_question()
+    return run
+
+
+def run_generate_new_questions(questions: int) -> Callable:
+    """Make a run function regenerating the current question of a quiz."""
+    def run(quiz):
+        for _ in range(questions):
+            quiz.generate_new_question()
+    return run
+
+
+def git_revision() -> Optional[str]:
+    """Get the commit the benchmarks ran on, if known."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print the results as a table."""
+    header = (f"{'benchmark':<50} {'median ms':>10} {'per op us':>10} "
+              f"{'alloc KiB':>10} {'blocks':>8} {'widgets':>8} {'leaked':>7}")
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(f"{result['name']:<50} "
+              f"{result['wall_time_s']['median'] * 1000:>10.2f} "
+              f"{result['per_iteration_us']:>10.1f} "
+              f"{result['allocations']['peak_bytes'] / 1024:>10.1f} "
+              f"{result['allocations']['new_blocks']:>8} "
+              f"{result['widgets']['created']:>8} "
+              f"{result['widgets']['leaked']:>7}")
+
+
+def compare_results(baseline: Dict[str, Any], results: List[Dict[str, Any]]) -> int:
+    """Print how the results compare to an earlier run.
+
+    Args:
+        baseline: The JSON document of the earlier run
+        results: The results of this run
+
+    Returns:
+        The number of benchmarks that got slower by more than REGRESSION_THRESHOLD
+    """
+    previous = {result["name"]: result for result in baseline.get("results", [])}
+    regressions = 0
+
+    print(f"\nCompared to {baseline.get('revision') or 'baseline'}:")
+    for result in results:
+        old = previous.get(result["name"])
+        if old is None:
+            print(f"  new  {result['name']}")
+            continue
+
+        ratio = result["per_iteration_us"] / old["per_iteration_us"]
+        widgets = result["widgets"]["created"] - old["widgets"]["created"]
+        status = "SLOW" if ratio > REGRESSION_THRESHOLD else "ok  "
+        if ratio > REGRESSION_THRESHOLD:
+            regressions += 1
+        print(f"  {status} {result['name']:<50} x{ratio:.2f} time, {widgets:+d} widgets")
+
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Parse the command line and run the benchmarks."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ui_benchmarks")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"timed runs per benchmark (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--questions", type=int, default=DEFAULT_QUESTIONS,
+                        help=f"questions per question benchmark (default: {DEFAULT_QUESTIONS})")
+    parser.add_argument("--filter", default="",
+                        help="only run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    # Keep the benchmarks away from the real database
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ["QUIZ_DB_FILE"] = os.path.join(tmp_dir, "benchmark.db")
+
+        from PySide6.QtWidgets import QApplication
+        from quizzes.score_writer import score_writer
+        from quizzes.database.db import close_connections
+
+        app = QApplication.instance() or QApplication(sys.argv)
+
+        results = []
+        try:
+            for benchmark in build_benchmarks(args.questions):
+                if args.filter in benchmark.name:
+                    results.append(measure(benchmark, args.repeat))
+        finally:
+            score_writer.shutdown()
+            close_connections()
+
+    print_results(results)
+
+    document = {
+        "format": RESULT_FORMAT_VERSION,
+        "revision": git_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qt_platform": app.platformName(),
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare_results(baseline, results):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,43 @@
-from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QMessageBox
 import sys
+from quizzes.startup_profiler import startup_profiler
+
+# --profile-startup has to hook the import system before the rest is imported
+if __name__ == "__main__" and "--profile-startup" in sys.argv[1:]:
+    startup_profiler.start()
+
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QMessageBox
+from PySide6.QtCore import QTimer, Signal
 import quizzes.styles as styles
 from quizzes.constants import WINDOW_TITLE
-from quizzes.mappings import QUIZ_TYPE_MAP, DEFAULT_QUIZ_QUESTIONS
+from quizzes.mappings import QUIZ_TYPE_MAP, DEFAULT_QUIZ_QUESTIONS, PREWARM_SCREENS
 from quizzes.menu import MainMenu
 from quizzes.quiz_container import QuizContainer
-from quizzes.quiz_manager import quiz_manager
-# Import all quiz classes that might be created through QUIZ_TYPE_MAP
-from quizzes.types import (
-    AdditionQuiz,
-    MultiplicationQuiz,
-    SmallMultiplicationQuiz,
-    SubtractionQuiz
-)
-# Import scores page
-from quizzes.scores_page import ScoresPage
 # Import user manager and components
 from quizzes.user_manager import UserManager
 from quizzes.components import TopBar
-from PySide6.QtWidgets import QLabel
-from PySide6.QtCore import Qt
 # Import debug module
 from quizzes.debug import set_debug_mode, log
+from quizzes.database.db import close_connections, init_db_in_background
+from quizzes.score_writer import score_writer
+from quizzes.quiz_content import quiz_content
+from quizzes.style_engine import install_stylesheet
+
+startup_profiler.mark("main imported")
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitted once, after the window has been painted for the first time
+    first_painted = Signal()
+    
+    def __init__(self, prewarm=PREWARM_SCREENS):
+        """Initialize the main window.
+        
+        Only the main menu is built up front; submenus and the scores page are
+        built on first navigation, or in idle time after the first paint if
+        prewarm is set.
+        
+        Args:
+            prewarm: Whether to build the other screens once the window has been painted
+        """
         super().__init__()
 
         log("Main", "Initializing MainWindow")
@@ -49,6 +62,10 @@ class MainWindow(QMainWindow):
         self.user_manager = UserManager(self)
         self.user_manager.user_changed.connect(self.on_user_data_changed)
         
+        # Report scores and answer attempts the background writer could not save
+        score_writer.save_failed.connect(self.on_score_save_failed)
+        score_writer.attempts_failed.connect(self.on_attempts_save_failed)
+        
         # Add top navigation bar with user selection
         self.top_bar = TopBar(self.user_manager, self)
         self.main_layout.addWidget(self.top_bar)
@@ -61,27 +78,87 @@ class MainWindow(QMainWindow):
         
         self.menu = MainMenu()
         self.quiz_container = QuizContainer()
-        self.scores_page = ScoresPage()
+        # Built on first navigation, see get_scores_page()
+        self.scores_page = None
         
         self.menu.quiz_selected.connect(self.on_quiz_selected)
         self.quiz_container.return_to_menu.connect(self.show_menu)
-        self.scores_page.return_to_menu.connect(self.show_menu)
         
         self.content_layout.addWidget(self.menu, 1)
         self.content_layout.addWidget(self.quiz_container, 1)
-        self.content_layout.addWidget(self.scores_page, 1)
         
         self.quiz_container.hide()
-        self.scores_page.hide()
+        
+        # Idle-time building of the other screens, scheduled on first paint
+        self.prewarm = prewarm
+        self._painted = False
         
         log("Main", "MainWindow initialization complete")
 
+    def paintEvent(self, event):
+        """Paint the window and, after the first paint, schedule the pre-warm."""
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            startup_profiler.mark("first paint")
+            if self.prewarm:
+                QTimer.singleShot(0, self, self.prewarm_screens)
+            self.first_painted.emit()
+
+    def prewarm_screens(self):
+        """Build the screens that are not needed for the first frame."""
+        log("Main", "Pre-warming submenus and scores page")
+        with startup_profiler.span("pre-warm scores page"):
+            self.get_scores_page()
+        self.menu.prewarm_submenus()
+
+    def get_scores_page(self):
+        """Get the scores page, building it on first use.
+        
+        Returns:
+            The ScoresPage widget
+        """
+        if self.scores_page is None:
+            log("Main", "Building scores page")
+            # Imported here so the scores model and its queries stay out of startup
+            from quizzes.scores_page import ScoresPage
+            self.scores_page = ScoresPage()
+            self.scores_page.return_to_menu.connect(self.show_menu)
+            self.scores_page.hide()
+            self.content_layout.addWidget(self.scores_page, 1)
+        return self.scores_page
+
     def on_user_data_changed(self, user_data):
         """Handle user data changes from UserManager."""
         log("Main", f"User data changed: {user_data}")
         # Update any UI elements that depend on the current user
         # This is called when the user selection changes
     
+    def on_score_save_failed(self, records, error):
+        """Warn the user when queued scores could not be saved."""
+        log("Main", f"Failed to save {len(records)} score(s): {error}")
+        details = "\n".join(
+            f"{record['player_name']} - {record['quiz_type']}: "
+            f"{record['score']}/{record['total_questions']}"
+            for record in records
+        )
+        QMessageBox.warning(
+            self,
+            "Score Not Saved",
+            f"The following score(s) could not be saved:\n{details}\n\nError: {error}"
+        )
+    
+    def on_attempts_save_failed(self, attempts, error):
+        """Warn the user when queued answer attempts could not be saved."""
+        log("Main", f"Failed to save {len(attempts)} attempt(s): {error}")
+        players = sorted({attempt['player_name'] for attempt in attempts})
+        QMessageBox.warning(
+            self,
+            "Answers Not Saved",
+            f"{len(attempts)} answer(s) by {', '.join(players)} could not be saved "
+            f"to the answer history.\n\nError: {error}"
+        )
+    
     def on_quiz_selected(self, name):
         """Handle quiz selection from the menu."""
         log("Main", f"Quiz selected: {name}")
@@ -89,12 +166,16 @@ class MainWindow(QMainWindow):
         if name == "Scores":
             self.show_scores()
             return
+        # Special case for bulk user import/export
+        if name == "Users":
+            self.show_roster_dialog()
+            return
 
         quiz_class_name = QUIZ_TYPE_MAP.get(name)
         if quiz_class_name:
             log("Main", f"Creating quiz of type: {quiz_class_name}")
-            # Use the quiz manager to create the quiz
-            quiz = quiz_manager.create_quiz(
+            # Reuse a pooled quiz if possible, otherwise create it through the quiz manager
+            quiz = self.quiz_container.get_quiz(
                 quiz_class_name,
                 total_questions=DEFAULT_QUIZ_QUESTIONS,
                 show_questions_control=False
@@ -111,31 +192,67 @@ class MainWindow(QMainWindow):
         log("Main", "Showing quiz")
         self.quiz_container.set_quiz(quiz)
         self.menu.hide()
-        self.scores_page.hide()
+        if self.scores_page is not None:
+            self.scores_page.hide()
         self.quiz_container.show()
 
     def show_scores(self):
         """Show the scores page."""
         log("Main", "Showing scores page")
-        self.scores_page.refresh()
+        scores_page = self.get_scores_page()
+        scores_page.refresh()
         self.menu.hide()
         self.quiz_container.hide()
-        self.scores_page.show()
+        scores_page.show()
+
+    def show_roster_dialog(self):
+        """Open the dialog for importing and exporting users."""
+        from quizzes.components.roster_dialog import RosterDialog
+        RosterDialog(self).exec()
 
     def show_menu(self):
         """Return to the main menu."""
         log("Main", "Showing main menu")
         self.quiz_container.hide()
-        self.scores_page.hide()
+        if self.scores_page is not None:
+            self.scores_page.hide()
         self.menu.show()
 
+def report_startup_profile(app):
+    """Print the startup profile and quit (used with --profile-startup)."""
+    startup_profiler.stop()
+    startup_profiler.report()
+    QTimer.singleShot(0, app.quit)
+
 if __name__ == "__main__":
     # Check for command line arguments
-    if len(sys.argv) > 1 and sys.argv[1] == "--debug":
+    if "--debug" in sys.argv[1:]:
         set_debug_mode(True)
     
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    # Bring the database schema up to date while the window is being built
+    with startup_profiler.span("start database init thread"):
+        init_db_in_background()
+    # Find the file-based quizzes while the window is being built
+    with startup_profiler.span("start quiz content scan"):
+        quiz_content.start()
+    
+    with startup_profiler.span("create QApplication"):
+        app = QApplication(sys.argv)
+    with startup_profiler.span("install style sheet"):
+        install_stylesheet(app)
+    # Pick up question files added, changed or removed while the app runs
+    quiz_content.watch()
+    with startup_profiler.span("build main window"):
+        window = MainWindow()
+    # Queue the answers of unfinished quizzes, then write everything queued
+    # before closing the database connections
+    app.aboutToQuit.connect(window.quiz_container.flush_attempts)
+    app.aboutToQuit.connect(score_writer.shutdown)
+    app.aboutToQuit.connect(close_connections)
+    with startup_profiler.span("show main window"):
+        window.show()
+    if startup_profiler.active:
+        # Report once the first frame is on screen, then exit
+        window.first_painted.connect(lambda: report_startup_profile(app))
     sys.exit(app.exec())
 
@@ -1,21 +1,22 @@
 """
 Quiz application package.
+
+Public names are loaded lazily (PEP 562), so importing the package or one of
+its light modules (styles, mappings, menu) does not import every quiz type.
 """
-import random
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QSizePolicy, QLabel
-from .base_quiz import BaseQuiz
-from .styles import *
+import importlib
 
-# Import and expose the factory function
-from .create_quiz_factory import create_custom_quiz
+from .lazy_imports import lazy_module_attrs
 
-# Import quiz types from the types subpackage
-from .types import (
-    AdditionQuiz,
-    MultiplicationQuiz,
-    SmallMultiplicationQuiz,
-    SubtractionQuiz
-)
+# Public name -> module it lives in, imported on first access
+_LAZY_ATTRIBUTES = {
+    'BaseQuiz': '.base_quiz',
+    'create_custom_quiz': '.create_quiz_factory',
+    'AdditionQuiz': '.types',
+    'MultiplicationQuiz': '.types',
+    'SmallMultiplicationQuiz': '.types',
+    'SubtractionQuiz': '.types',
+}
 
 __all__ = [
     'MultiplicationQuiz', 
@@ -23,4 +24,14 @@ __all__ = [
     'create_custom_quiz',
     'SmallMultiplicationQuiz',
     'SubtractionQuiz'
-] 
\ No newline at end of file
+]
+
+def _style_constant(name):
+    """Style constants used to be star-imported from styles and are still package attributes."""
+    if name.isupper():
+        styles = importlib.import_module('.styles', __name__)
+        if hasattr(styles, name):
+            return getattr(styles, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__getattr__, __dir__ = lazy_module_attrs(globals(), _LAZY_ATTRIBUTES, fallback=_style_constant)
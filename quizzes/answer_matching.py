@@ -0,0 +1,186 @@
+"""
+Answer matching for file-based quizzes.
+
+Typed answers are compared by their canonical form: casefolded, Unicode
+compatibility-decomposed with the accents dropped (so "zepsuc sie" matches
+"zepsuć się") and with whitespace collapsed. Canonical forms of the accepted
+answers are computed when a question file is compiled and kept with each
+question as a frozenset, so grading an exact match is one set lookup.
+
+Answers that are not an exact match may still be accepted if they are within a
+small edit distance of an accepted answer. The allowed distance grows with the
+answer's length (one edit per ANSWER_CHARS_PER_EDIT characters, at most
+ANSWER_MAX_EDIT_DISTANCE), and answers with digits must always match exactly.
+For questions with many accepted answers, candidates are found through the
+strings left after deleting up to that many characters, so the cost depends on
+the length of the typed answer rather than on the number of accepted answers.
+Each candidate is then checked with a banded edit distance that stops as soon
+as the distance is exceeded.
+"""
+import unicodedata
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+
+from .mappings import ANSWER_MAX_EDIT_DISTANCE, ANSWER_CHARS_PER_EDIT
+
+# Letters that don't decompose into a base letter and an accent
+_LETTER_FOLDS = str.maketrans({
+    'ł': 'l', 'Ł': 'L', 'ø': 'o', 'Ø': 'O', 'đ': 'd', 'Đ': 'D',
+    'ħ': 'h', 'Ħ': 'H', 'ı': 'i', 'æ': 'ae', 'Æ': 'AE', 'œ': 'oe', 'Œ': 'OE',
+})
+
+# Questions with more accepted answers than this look near misses up in a
+# deletion index instead of comparing with each answer
+_SCAN_LIMIT = 32
+
+
+def canonical_form(answer: Any) -> str:
+    """
+    Get the form answers are compared in.
+
+    Args:
+        answer: An answer (numbers are compared as text)
+
+    Returns:
+        The answer casefolded, without accents and with whitespace collapsed
+    """
+    text = unicodedata.normalize('NFKD', str(answer).translate(_LETTER_FOLDS))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.casefold().split())
+
+def accepted_forms(question: Mapping[str, Any]) -> FrozenSet[str]:
+    """
+    Get the canonical forms of the answers a question accepts.
+
+    Args:
+        question: A question dict; its 'correct_answers', if any, replace its 'answer'
+
+    Returns:
+        The non-empty canonical forms
+    """
+    answers = question.get('correct_answers') or [question.get('answer', '')]
+    if isinstance(answers, (str, int, float)):
+        answers = [answers]
+    return frozenset(form for form in map(canonical_form, answers) if form)
+
+def allowed_distance(form: str, max_distance: int = ANSWER_MAX_EDIT_DISTANCE) -> int:
+    """
+    Get the number of edits an accepted answer tolerates.
+
+    Args:
+        form: Canonical form of the accepted answer
+        max_distance: Upper limit
+
+    Returns:
+        One edit per ANSWER_CHARS_PER_EDIT characters, at most max_distance;
+        0 for answers with digits, where one character changes the meaning
+    """
+    if any(char.isdigit() for char in form):
+        return 0
+    return min(max_distance, len(form) // ANSWER_CHARS_PER_EDIT)
+
+def within_distance(first: str, second: str, max_distance: int) -> bool:
+    """
+    Check whether two strings are at most max_distance edits apart (Levenshtein).
+
+    Only the diagonal band of width 2 * max_distance + 1 is computed, and the
+    check stops at the first row whose every entry exceeds max_distance.
+
+    Args:
+        first: One string
+        second: The other string
+        max_distance: Largest accepted distance
+
+    Returns:
+        True if the distance is at most max_distance
+    """
+    if abs(len(first) - len(second)) > max_distance:
+        return False
+    if first == second:
+        return True
+
+    beyond = max_distance + 1
+    previous = [column if column <= max_distance else beyond for column in range(len(second) + 1)]
+    for row in range(1, len(first) + 1):
+        low = max(1, row - max_distance)
+        high = min(len(second), row + max_distance)
+        current = [beyond] * (len(second) + 1)
+        current[0] = row if row <= max_distance else beyond
+        best = current[0]
+        char = first[row - 1]
+        for column in range(low, high + 1):
+            cost = previous[column - 1] + (char != second[column - 1])
+            cost = min(cost, previous[column] + 1, current[column - 1] + 1, beyond)
+            current[column] = cost
+            best = min(best, cost)
+        if best > max_distance:
+            return False
+        previous = current
+    return previous[len(second)] <= max_distance
+
+def _deletions(form: str, count: int) -> Set[str]:
+    """Get every string left after deleting at most count characters of form."""
+    variants = {form}
+    level = {form}
+    for _ in range(count):
+        level = {variant[:i] + variant[i + 1:] for variant in level for i in range(len(variant))}
+        variants |= level
+    return variants
+
+
+class AnswerMatcher:
+    """Grades typed answers against the accepted answers of one question."""
+
+    def __init__(self, forms: Iterable[str], max_distance: int = ANSWER_MAX_EDIT_DISTANCE):
+        """
+        Initialize a matcher.
+
+        Args:
+            forms: Canonical forms of the accepted answers (see accepted_forms())
+            max_distance: Most edits any accepted answer tolerates
+        """
+        self.forms = forms if isinstance(forms, frozenset) else frozenset(forms)
+        self.max_distance = max_distance
+        # Deletion variant -> accepted forms it comes from, built on the first near miss
+        self._variants: Optional[Dict[str, List[str]]] = None
+
+    def matches(self, answer: Any, fuzzy: bool = True) -> bool:
+        """
+        Check whether an answer is accepted.
+
+        Args:
+            answer: The answer given
+            fuzzy: Whether answers a few edits away count; off for picked options
+
+        Returns:
+            True if the answer is correct
+        """
+        form = canonical_form(answer)
+        if form in self.forms:
+            return True
+        if not fuzzy or not form or self.max_distance <= 0:
+            return False
+
+        if len(self.forms) <= _SCAN_LIMIT:
+            return any(
+                within_distance(form, accepted, allowed_distance(accepted, self.max_distance))
+                for accepted in self.forms
+            )
+
+        if self._variants is None:
+            self._variants = self._index_variants()
+        if not self._variants:
+            return False
+
+        for variant in _deletions(form, self.max_distance):
+            for accepted in self._variants.get(variant, ()):
+                if within_distance(form, accepted, allowed_distance(accepted, self.max_distance)):
+                    return True
+        return False
+
+    def _index_variants(self) -> Dict[str, List[str]]:
+        """Index the accepted forms by their deletion variants, up to each allowed distance."""
+        variants: Dict[str, List[str]] = {}
+        for accepted in self.forms:
+            for variant in _deletions(accepted, allowed_distance(accepted, self.max_distance)):
+                variants.setdefault(variant, []).append(accepted)
+        return variants
@@ -5,24 +5,22 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLa
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QIntValidator
 import random
+import time
+import uuid
 from typing import List, Optional, Callable, Union, Dict, Any
-from .styles import (
-    QUESTION_LABEL_STYLE, QUESTION_CORRECT_STYLE, QUESTION_INCORRECT_STYLE,
-    FEEDBACK_LABEL_STYLE, FEEDBACK_CORRECT_STYLE, FEEDBACK_INCORRECT_STYLE,
-    ANSWER_BUTTON_STYLE, NEXT_BUTTON_STYLE, MAIN_BORDER_STYLE,
-    DEFAULT_SPACING, BUTTON_SPACING, RETURN_BUTTON_STYLE,
-    ANSWER_INPUT_STYLE, SUBMIT_BUTTON_STYLE
-)
+from .styles import MAIN_BORDER_STYLE, DEFAULT_SPACING, BUTTON_SPACING
+# Widgets are styled through the application style sheet by role and state
+from .style_engine import set_style_role, set_style_state
 from .constants import (
     PROGRESS_LABEL_TEXT, SCORE_LABEL_TEXT, RESULTS_TITLE_TEXT, RESULTS_SCORE_TEXT,
     NEW_QUIZ_TOOLTIP, MENU_RETURN_TOOLTIP, NEXT_BUTTON_ICON, RESTART_BUTTON_ICON,
     HOME_BUTTON_ICON, CORRECT_BUTTON_ICON, MAIN_WINDOW_ERROR,
     CORRECT_FEEDBACK, INCORRECT_FEEDBACK
 )
-from .mappings import DEFAULT_QUIZ_QUESTIONS
+from .mappings import DEFAULT_QUIZ_QUESTIONS, ATTEMPT_FLUSH_SIZE
 from .components import ScoreIndicator
-# Import database module for score saving
-from .database.scores import save_score
+# Import the write-behind score writer for score saving
+from .score_writer import score_writer
 # Import debug module
 from .debug import log
 
@@ -65,6 +63,9 @@ class BaseQuiz(QWidget):
             if input_mode == "self_assess":
                 self.self_assess_mode = True
                 self.input_mode = False
+            elif input_mode == "buttons":
+                self.input_mode = False
+                self.self_assess_mode = False
             else:
                 self.input_mode = bool(input_mode)
                 self.self_assess_mode = False
@@ -77,6 +78,20 @@ class BaseQuiz(QWidget):
         self.num2: int = 0
         self.expected_answer: Optional[int] = None
         
+        # Answer attempt log, buffered per session and written in batches
+        self.session_id: str = uuid.uuid4().hex
+        self.pending_attempts: List[Dict[str, Any]] = []
+        self.question_text: str = ""
+        self.question_shown_at: float = time.monotonic()
+        
+        # Pooled answer widgets: one panel per answer mode, built on first use and
+        # then only relabelled and shown or hidden for each question
+        self.answer_panels: Dict[str, QWidget] = {}
+        self.active_answer_panel: Optional[QWidget] = None
+        self.option_buttons: List[QPushButton] = []
+        self.option_values: List[Union[int, str]] = []
+        self.int_validator = QIntValidator(self)
+        
         # Main layout
         self.main_layout = QVBoxLayout()
         self.main_layout.setContentsMargins(20, 20, 20, 20)
@@ -140,7 +155,7 @@ class BaseQuiz(QWidget):
         """Create the question display area."""
         # Question label (with stretch to adapt to window height)
         self.question_label = QLabel()
-        self.question_label.setStyleSheet(QUESTION_LABEL_STYLE)
+        set_style_role(self.question_label, "question")
         self.question_label.setAlignment(Qt.AlignCenter)
         self.question_label.setMinimumHeight(60)  # Minimum height instead of fixed
         # Allow question label to expand vertically when window is resized
@@ -172,7 +187,7 @@ class BaseQuiz(QWidget):
         
         # Feedback label
         self.feedback_label = QLabel()
-        self.feedback_label.setStyleSheet(FEEDBACK_LABEL_STYLE)
+        set_style_role(self.feedback_label, "feedback")
         self.feedback_label.setAlignment(Qt.AlignCenter)
         self.feedback_label.setWordWrap(True)  # Allow text wrapping
         self.feedback_label.setMaximumHeight(100)  # Limit the maximum height
@@ -188,7 +203,7 @@ class BaseQuiz(QWidget):
         # Next question button
         self.next_button = QPushButton(NEXT_BUTTON_ICON)  # Right arrow emoji
         self.next_button.setFixedSize(60, 60)  # Fixed size
-        self.next_button.setStyleSheet(NEXT_BUTTON_STYLE)
+        set_style_role(self.next_button, "next")
         self.next_button.setFont(QFont("Arial", 20))  # Adjust font size for the emoji
         self.next_button.clicked.connect(self.on_next_button_click)
         self.next_button.setEnabled(False)
@@ -210,12 +225,12 @@ class BaseQuiz(QWidget):
         self.results_layout.addStretch(1)
         
         self.results_title = QLabel(RESULTS_TITLE_TEXT)
-        self.results_title.setStyleSheet("font-size: 32px; font-weight: bold;")
+        set_style_role(self.results_title, "results-title")
         self.results_title.setAlignment(Qt.AlignCenter)
         self.results_layout.addWidget(self.results_title)
         
         self.results_score = QLabel()
-        self.results_score.setStyleSheet("font-size: 20px;")
+        set_style_role(self.results_score, "results-score")
         self.results_score.setAlignment(Qt.AlignCenter)
         self.results_layout.addWidget(self.results_score)
         
@@ -228,7 +243,7 @@ class BaseQuiz(QWidget):
         # Restart button with icon
         self.restart_button = QPushButton(RESTART_BUTTON_ICON)  # Restart emoji
         self.restart_button.setMinimumSize(80, 80)
-        self.restart_button.setStyleSheet(NEXT_BUTTON_STYLE)
+        set_style_role(self.restart_button, "next")
         self.restart_button.setFont(QFont("Arial", 20))
         self.restart_button.setToolTip(NEW_QUIZ_TOOLTIP)
         self.restart_button.clicked.connect(self.restart_quiz)
@@ -237,7 +252,7 @@ class BaseQuiz(QWidget):
         # Home button for returning to menu
         self.menu_button = QPushButton(HOME_BUTTON_ICON)  # Home emoji
         self.menu_button.setMinimumSize(80, 80)
-        self.menu_button.setStyleSheet(RETURN_BUTTON_STYLE)
+        set_style_role(self.menu_button, "return")
         self.menu_button.setFont(QFont("Arial", 20))
         self.menu_button.setToolTip(MENU_RETURN_TOOLTIP)
         self.menu_button.clicked.connect(self.return_to_menu)
@@ -272,6 +287,10 @@ class BaseQuiz(QWidget):
 
     def restart_quiz(self) -> None:
         """Restart the quiz with a new set of questions."""
+        # Close the attempt log of the previous session
+        self.flush_attempts()
+        self.session_id = uuid.uuid4().hex
+        
         # Reset quiz state
         self.current_question = 0  # Will be set to 1 by next_question
         self.correct_answers = 0
@@ -292,6 +311,8 @@ class BaseQuiz(QWidget):
 
     def return_to_menu(self) -> None:
         """Return to the main menu."""
+        self.flush_attempts()
+        
         # Find the main window (which should be the top-level parent)
         main_window = self.window()
         if main_window and hasattr(main_window, 'show_menu'):
@@ -321,7 +342,9 @@ class BaseQuiz(QWidget):
         # Format the question text
         question_text = self.format_question()
         self.question_label.setText(question_text)
-        self.question_label.setStyleSheet(QUESTION_LABEL_STYLE)  # Reset style
+        self.question_text = question_text
+        self.question_shown_at = time.monotonic()
+        set_style_state(self.question_label)  # Reset style
         
         # Clear answer buttons from previous question
         self.clear_answer_buttons()
@@ -337,17 +360,17 @@ class BaseQuiz(QWidget):
             # Use the configured input mode
             temp_input_mode = self.input_mode
         
-        # Create answer interface (buttons or input field)
+        # Show the answer interface (buttons or input field)
         if self.self_assess_mode:
             self.create_answer_buttons(options)
         elif temp_input_mode:
-            self._create_input_field()
+            self._show_input_field()
         else:
-            self._create_option_buttons(options)
+            self._show_option_buttons(options)
         
         # Reset feedback
         self.feedback_label.setText("")
-        self.feedback_label.setStyleSheet(FEEDBACK_LABEL_STYLE)
+        set_style_state(self.feedback_label)
         
         # Disable next button until an answer is given
         self.next_button.setEnabled(False)
@@ -369,15 +392,16 @@ class BaseQuiz(QWidget):
         
         # Set color based on score
         if score_percent >= 80:
-            self.results_score.setStyleSheet("font-size: 20px; color: green;")
+            set_style_state(self.results_score, "good")
         elif score_percent >= 60:
-            self.results_score.setStyleSheet("font-size: 20px; color: orange;")
+            set_style_state(self.results_score, "fair")
         else:
-            self.results_score.setStyleSheet("font-size: 20px; color: red;")
+            set_style_state(self.results_score, "poor")
         
-        # Save score to database
+        # Queue score for saving; the database write happens off the GUI thread
         quiz_type = self.__class__.__name__
-        save_score(quiz_type, self.correct_answers, self.total_questions, self.player_name)
+        score_writer.submit(quiz_type, self.correct_answers, self.total_questions, self.player_name)
+        self.flush_attempts()
         
         # Hide quiz UI elements
         self.question_label.hide()
@@ -396,11 +420,49 @@ class BaseQuiz(QWidget):
         pass
     
     def clear_answer_buttons(self) -> None:
-        """Clear all answer buttons or input fields from the layout."""
-        for i in reversed(range(self.answers_layout.count())): 
-            widget = self.answers_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
+        """Hide the answer buttons or input field of the current question.
+        
+        The widgets are kept and reused for the next question that needs them.
+        """
+        if self.active_answer_panel is not None:
+            self.active_answer_panel.hide()
+            self.active_answer_panel = None
+    
+    def _answer_panel(self, mode: str, build: Callable[[QGridLayout], None]) -> QWidget:
+        """Get the pooled panel for an answer mode, building it on first use.
+        
+        Args:
+            mode: Name of the answer mode ('buttons', 'input' or 'self_assess')
+            build: Callable adding the mode's widgets to the panel's grid layout
+            
+        Returns:
+            The panel, shown as the active answer panel
+        """
+        panel = self.answer_panels.get(mode)
+        if panel is None:
+            panel = QWidget()
+            layout = QGridLayout()
+            layout.setContentsMargins(0, 0, 0, 0)
+            layout.setSpacing(BUTTON_SPACING)
+            panel.setLayout(layout)
+            build(layout)
+            panel.hide()
+            self.answers_layout.addWidget(panel, 0, 0)
+            self.answer_panels[mode] = panel
+        
+        if self.active_answer_panel is not panel:
+            self.clear_answer_buttons()
+            panel.show()
+            self.active_answer_panel = panel
+        return panel
+    
+    def _answer_widgets(self) -> List[QWidget]:
+        """Get the widgets of the active answer panel."""
+        if self.active_answer_panel is None:
+            return []
+        layout = self.active_answer_panel.layout()
+        return [layout.itemAt(i).widget() for i in range(layout.count())
+                if layout.itemAt(i).widget() is not None]
     
     def generate_answer_options(self) -> List[int]:
         """Generate answer options including the correct answer and distractors.
@@ -428,50 +490,80 @@ class BaseQuiz(QWidget):
             options: List of answer options
         """
         if self.self_assess_mode:
-            self._create_self_assess_buttons()
+            self._show_self_assess_buttons()
         elif self.input_mode:
-            self._create_input_field()
+            self._show_input_field()
         else:
-            self._create_option_buttons(options)
+            self._show_option_buttons(options)
 
-    def _create_option_buttons(self, options: List[int]) -> None:
-        """Create buttons for each answer option in a 2x2 grid.
+    def _show_option_buttons(self, options: List[Union[int, str]]) -> None:
+        """Show a button for each answer option in a 2x2 grid.
+        
+        Buttons are created the first time they are needed and relabelled for
+        later questions; buttons beyond the number of options are hidden.
         
         Args:
-            options: List of answer options (integers)
+            options: List of answer options
         """
-        for i, option in enumerate(options):
-            row, col = divmod(i, 2)
-            button = QPushButton(str(option))
-            button.setStyleSheet(ANSWER_BUTTON_STYLE)
+        panel = self._answer_panel("buttons", lambda layout: None)
+        layout = panel.layout()
+        
+        # Grow the pool if this question has more options than any before
+        while len(self.option_buttons) < len(options):
+            index = len(self.option_buttons)
+            button = QPushButton()
+            set_style_role(button, "answer")
             button.setMinimumHeight(50)
-            button.clicked.connect(lambda checked, ans=option: self.on_answer_button_click(ans))
-            self.answers_layout.addWidget(button, row, col)
+            # Look the answer up at click time so the button can be relabelled
+            button.clicked.connect(
+                lambda checked, i=index: self.on_answer_button_click(self.option_values[i])
+            )
+            row, col = divmod(index, 2)
+            layout.addWidget(button, row, col)
+            self.option_buttons.append(button)
+        
+        self.option_values = list(options)
+        for i, button in enumerate(self.option_buttons):
+            if i < len(options):
+                button.setText(str(options[i]))
+                button.setEnabled(True)
+                button.show()
+            else:
+                button.hide()
 
-    def _create_input_field(self) -> None:
-        """Create a text input field and submit button for direct answer input."""
+    def _show_input_field(self) -> None:
+        """Show the text input field and submit button for direct answer input."""
+        self._answer_panel("input", self._build_input_field)
+        
+        # Only use the numeric validator if the expected answer is numeric
+        validator = self.int_validator if isinstance(self.expected_answer, (int, float)) else None
+        if self.answer_input.validator() is not validator:
+            self.answer_input.setValidator(validator)
+        
+        self.answer_input.clear()
+        self.answer_input.setEnabled(True)
+        self.submit_button.setEnabled(True)
+    
+    def _build_input_field(self, layout: QGridLayout) -> None:
+        """Create the text input field and submit button of the input panel."""
         # Create input field
         self.answer_input = QLineEdit()
-        self.answer_input.setStyleSheet(ANSWER_INPUT_STYLE)
+        set_style_role(self.answer_input, "answer")
         self.answer_input.setPlaceholderText("Enter your answer...")
         self.answer_input.setMinimumHeight(50)
         
-        # Only add numeric validator if expected answer is numeric
-        if isinstance(self.expected_answer, (int, float)):
-            self.answer_input.setValidator(QIntValidator())
-        
         # Connect return key to submit answer
         self.answer_input.returnPressed.connect(self.handle_submit_button)
         
         # Create submit button
         self.submit_button = QPushButton("Submit")
-        self.submit_button.setStyleSheet(SUBMIT_BUTTON_STYLE)
+        set_style_role(self.submit_button, "submit")
         self.submit_button.setMinimumHeight(50)
         self.submit_button.clicked.connect(self.handle_submit_button)
         
-        # Add to layout - one row layout with input field and submit button
-        self.answers_layout.addWidget(self.answer_input, 0, 0)
-        self.answers_layout.addWidget(self.submit_button, 0, 1)
+        # One row layout with input field and submit button
+        layout.addWidget(self.answer_input, 0, 0)
+        layout.addWidget(self.submit_button, 0, 1)
 
     def handle_submit_button(self) -> None:
         """Handle the submit button click in input mode."""
@@ -504,13 +596,13 @@ class BaseQuiz(QWidget):
             selected_answer: The answer selected by the user
         """
         # Disable all answer buttons
-        for i in range(self.answers_layout.count()):
-            button = self.answers_layout.itemAt(i).widget()
-            if button is not None:
-                button.setEnabled(False)
+        for widget in self._answer_widgets():
+            widget.setEnabled(False)
         
         # Check the answer
-        if self.check_answer(selected_answer):
+        is_correct = self.check_answer(selected_answer)
+        self.record_attempt(selected_answer, is_correct)
+        if is_correct:
             self.correct_answers += 1
             self.show_correct_feedback()
         else:
@@ -526,6 +618,39 @@ class BaseQuiz(QWidget):
         else:
             self.next_button.setText(NEXT_BUTTON_ICON)
 
+    def record_attempt(self, given_answer: Optional[Union[int, str]], correct: bool) -> None:
+        """Buffer an answer to the current question for the attempt log.
+        
+        Attempts are kept in memory and handed to the score writer in one batch
+        at the end of the session (or every ATTEMPT_FLUSH_SIZE answers), so
+        answering a question never touches the disk.
+        
+        Args:
+            given_answer: The answer given by the user, or None if self-assessed
+            correct: Whether the answer was correct
+        """
+        latency_ms = int((time.monotonic() - self.question_shown_at) * 1000)
+        self.pending_attempts.append({
+            "session_id": self.session_id,
+            "quiz_type": self.__class__.__name__,
+            "player_name": self.player_name,
+            "question_number": self.current_question,
+            "question": self.question_text,
+            "expected_answer": None if self.expected_answer is None else str(self.expected_answer),
+            "given_answer": None if given_answer is None else str(given_answer),
+            "correct": correct,
+            "latency_ms": latency_ms
+        })
+        
+        if len(self.pending_attempts) >= ATTEMPT_FLUSH_SIZE:
+            self.flush_attempts()
+    
+    def flush_attempts(self) -> None:
+        """Hand the buffered attempts to the score writer."""
+        if self.pending_attempts:
+            score_writer.submit_attempts(self.pending_attempts)
+            self.pending_attempts = []
+    
     def check_answer(self, user_answer: Union[int, str]) -> bool:
         """Check if the given answer is correct.
         
@@ -548,16 +673,16 @@ class BaseQuiz(QWidget):
     def show_correct_feedback(self) -> None:
         """Show feedback for a correct answer."""
         self.feedback_label.setText(CORRECT_FEEDBACK)
-        self.feedback_label.setStyleSheet(FEEDBACK_CORRECT_STYLE)
+        set_style_state(self.feedback_label, "correct")
         self.question_label.setText(self.format_question_with_answer())
-        self.question_label.setStyleSheet(QUESTION_CORRECT_STYLE)
+        set_style_state(self.question_label, "correct")
     
     def show_incorrect_feedback(self) -> None:
         """Show feedback for an incorrect answer."""
         self.feedback_label.setText(INCORRECT_FEEDBACK.format(self.expected_answer))
-        self.feedback_label.setStyleSheet(FEEDBACK_INCORRECT_STYLE)
+        set_style_state(self.feedback_label, "incorrect")
         self.question_label.setText(self.format_question_with_answer())
-        self.question_label.setStyleSheet(QUESTION_INCORRECT_STYLE)
+        set_style_state(self.question_label, "incorrect")
 
     def calculate_answer(self) -> int:
         """Calculate the correct answer based on the generated numbers.
@@ -686,29 +811,41 @@ class BaseQuiz(QWidget):
         # Clear feedback label
         self.feedback_label.setText("")
 
-    def _create_self_assess_buttons(self) -> None:
-        """Create a show answer button and thumbs up/down buttons for self-assessment mode."""
+    def _show_self_assess_buttons(self) -> None:
+        """Show the show answer button, with the thumbs up/down buttons hidden until it is used."""
+        self._answer_panel("self_assess", self._build_self_assess_buttons)
+        
+        self.show_answer_button.setEnabled(True)
+        self.show_answer_button.show()
+        for button in (self.thumbs_up_button, self.thumbs_down_button):
+            button.setEnabled(True)
+            button.hide()
+    
+    def _build_self_assess_buttons(self, layout: QGridLayout) -> None:
+        """Create the show answer button and thumbs up/down buttons of the self-assessment panel."""
         # Create show answer button
         self.show_answer_button = QPushButton("Show Answer")
-        self.show_answer_button.setStyleSheet(ANSWER_BUTTON_STYLE)
+        set_style_role(self.show_answer_button, "answer")
         self.show_answer_button.setMinimumHeight(50)
         self.show_answer_button.clicked.connect(self._reveal_answer)
-        self.answers_layout.addWidget(self.show_answer_button, 0, 0, 1, 2)
+        layout.addWidget(self.show_answer_button, 0, 0, 1, 2)
         
         # Create thumbs up/down buttons (initially hidden)
         self.thumbs_up_button = QPushButton("👍 Correct")
-        self.thumbs_up_button.setStyleSheet(ANSWER_BUTTON_STYLE + "background-color: #a3e4a3;")
+        set_style_role(self.thumbs_up_button, "answer")
+        set_style_state(self.thumbs_up_button, "correct")
         self.thumbs_up_button.setMinimumHeight(50)
         self.thumbs_up_button.clicked.connect(lambda: self._self_assess(True))
         self.thumbs_up_button.hide()
-        self.answers_layout.addWidget(self.thumbs_up_button, 1, 0)
+        layout.addWidget(self.thumbs_up_button, 1, 0)
         
         self.thumbs_down_button = QPushButton("👎 Incorrect")
-        self.thumbs_down_button.setStyleSheet(ANSWER_BUTTON_STYLE + "background-color: #e4a3a3;")
+        set_style_role(self.thumbs_down_button, "answer")
+        set_style_state(self.thumbs_down_button, "incorrect")
         self.thumbs_down_button.setMinimumHeight(50)
         self.thumbs_down_button.clicked.connect(lambda: self._self_assess(False))
         self.thumbs_down_button.hide()
-        self.answers_layout.addWidget(self.thumbs_down_button, 1, 1)
+        layout.addWidget(self.thumbs_down_button, 1, 1)
         
     def _reveal_answer(self) -> None:
         """Reveal the answer and show the thumbs up/down buttons."""
@@ -728,6 +865,9 @@ class BaseQuiz(QWidget):
         Args:
             correct: Whether the user self-assessed as correct
         """
+        # Self-assessed questions have no typed answer to log
+        self.record_attempt(None, correct)
+        
         # Update score if user said they were correct
         if correct:
             self.correct_answers += 1
@@ -1,15 +1,27 @@
 """
 Components package for quiz application.
 Contains UI components used across the application.
+
+Components are imported on first access (PEP 562), so using one of them does
+not import the others.
 """
-from .base_component import BaseComponent
-from .score_indicator import ScoreIndicator
-from .navigation_bar import NavigationBar
-from .top_bar import TopBar
+from ..lazy_imports import lazy_module_attrs
+
+# Public name -> module it lives in, imported on first access
+_LAZY_ATTRIBUTES = {
+    'BaseComponent': '.base_component',
+    'ScoreIndicator': '.score_indicator',
+    'NavigationBar': '.navigation_bar',
+    'TopBar': '.top_bar',
+    'UserPicker': '.user_picker',
+}
 
 __all__ = [
     'BaseComponent',
     'ScoreIndicator', 
     'NavigationBar',
-    'TopBar'
-] 
\ No newline at end of file
+    'TopBar',
+    'UserPicker'
+]
+
+__getattr__, __dir__ = lazy_module_attrs(globals(), _LAZY_ATTRIBUTES)
@@ -107,12 +107,12 @@ class NavigationBar(BaseComponent):
         self.main_layout.addWidget(container)
         return spinbox
     
-    def add_user_dropdown(self, users, current_user_id=1):
+    def add_user_dropdown(self, model, current_user_id=1):
         """
         Add a user selection dropdown to the navigation bar.
         
         Args:
-            users: List of user dictionaries with 'id' and 'display_name' keys
+            model: The shared UserListModel to show
             current_user_id: ID of the currently selected user
             
         Returns:
@@ -131,19 +131,10 @@ class NavigationBar(BaseComponent):
         # Add combobox
         user_combo = QComboBox()
         user_combo.setFixedWidth(150)
-        
-        # Populate with users
-        current_index = 0
-        for i, user in enumerate(users):
-            user_combo.addItem(user['display_name'], user['id'])
-            if user['id'] == current_user_id:
-                current_index = i
-        
-        # Add a special item for adding a new user
-        user_combo.addItem("+ Add New User", -1)
+        user_combo.setModel(model)
         
         # Set current user
-        user_combo.setCurrentIndex(current_index)
+        user_combo.setCurrentIndex(max(model.row_of(current_user_id), 0))
         
         # Connect signal
         user_combo.currentIndexChanged.connect(self._on_user_changed)
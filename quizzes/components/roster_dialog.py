@@ -0,0 +1,174 @@
+"""
+Roster dialog for importing and exporting users in bulk.
+"""
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton,
+    QPlainTextEdit, QFileDialog, QMessageBox, QApplication
+)
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal
+from ..database.roster import (
+    import_roster, export_roster, detect_format, format_report,
+    ON_CONFLICT_UPDATE, ON_CONFLICT_SKIP, IMPORT_ERRORS
+)
+from ..user_directory import user_directory
+from ..debug import log
+
+# File dialog filter for roster files
+ROSTER_FILE_FILTER = "Rosters (*.csv *.json);;CSV files (*.csv);;JSON files (*.json)"
+
+
+class RosterImportSignals(QObject):
+    """Signals used by RosterImport to report back to the GUI thread."""
+
+    # import report
+    finished = Signal(dict)
+    # error message
+    failed = Signal(str)
+
+
+class RosterImport(QRunnable):
+    """Imports a roster file on a worker thread."""
+
+    def __init__(self, path, on_conflict, dry_run):
+        """Initialize the import.
+
+        Args:
+            path: Path of the roster file
+            on_conflict: ON_CONFLICT_UPDATE or ON_CONFLICT_SKIP
+            dry_run: Whether to only validate the file
+        """
+        super().__init__()
+        self.path = path
+        self.on_conflict = on_conflict
+        self.dry_run = dry_run
+        self.signals = RosterImportSignals()
+
+    def run(self):
+        """Run the import; the worker thread uses its own database connection."""
+        try:
+            with open(self.path, 'r', encoding='utf-8', newline='') as stream:
+                report = import_roster(
+                    stream, detect_format(self.path),
+                    on_conflict=self.on_conflict, dry_run=self.dry_run
+                )
+        except IMPORT_ERRORS as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        self.signals.finished.emit(report)
+
+
+class RosterDialog(QDialog):
+    """Dialog for importing users from and exporting them to CSV or JSON rosters."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # The running RosterImport, if any
+        self._import = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Set up the dialog UI."""
+        self.setWindowTitle("Import / Export Users")
+        self.setMinimumSize(560, 400)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # Import options
+        self.overwrite_checkbox = QCheckBox("Overwrite display names of existing users")
+        self.overwrite_checkbox.setChecked(True)
+        layout.addWidget(self.overwrite_checkbox)
+
+        self.dry_run_checkbox = QCheckBox("Only check the file, don't import it")
+        layout.addWidget(self.dry_run_checkbox)
+
+        # Report of the last import or export
+        self.report_view = QPlainTextEdit()
+        self.report_view.setReadOnly(True)
+        self.report_view.setPlaceholderText(
+            "Rosters are CSV files with 'username' and 'display_name' columns, "
+            "or JSON lists of objects with the same keys."
+        )
+        layout.addWidget(self.report_view)
+
+        # Buttons
+        buttons_layout = QHBoxLayout()
+        self.import_button = QPushButton("Import...")
+        self.import_button.clicked.connect(self.import_file)
+
+        self.export_button = QPushButton("Export...")
+        self.export_button.clicked.connect(self.export_file)
+
+        self.close_button = QPushButton("Close")
+        self.close_button.clicked.connect(self.accept)
+
+        buttons_layout.addWidget(self.import_button)
+        buttons_layout.addWidget(self.export_button)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.close_button)
+        layout.addLayout(buttons_layout)
+
+    def import_file(self):
+        """Ask for a roster file and start importing it on a worker thread."""
+        path, _ = QFileDialog.getOpenFileName(self, "Import Users", "", ROSTER_FILE_FILTER)
+        if not path:
+            return
+
+        overwrite = self.overwrite_checkbox.isChecked()
+        on_conflict = ON_CONFLICT_UPDATE if overwrite else ON_CONFLICT_SKIP
+        roster_import = RosterImport(path, on_conflict, self.dry_run_checkbox.isChecked())
+        roster_import.signals.finished.connect(self._on_import_finished)
+        roster_import.signals.failed.connect(self._on_import_failed)
+        self._set_importing(roster_import)
+        self.report_view.setPlainText(f"Importing {path}...")
+        QThreadPool.globalInstance().start(roster_import)
+
+    def _on_import_finished(self, report):
+        """Show the report of a finished import."""
+        dry_run = self._import.dry_run
+        self._set_importing(None)
+        if not dry_run:
+            # Pick up the new users in every user selector
+            user_directory.reload()
+
+        self.report_view.setPlainText("\n".join(format_report(report, dry_run)))
+
+    def _on_import_failed(self, error):
+        """Report an import that failed and was rolled back."""
+        self._set_importing(None)
+        log("RosterDialog", f"Import failed: {error}")
+        self.report_view.setPlainText(f"Import failed, nothing was changed:\n{error}")
+        QMessageBox.warning(self, "Import Failed", error)
+
+    def _set_importing(self, roster_import):
+        """Remember the running import and lock the buttons while there is one."""
+        self._import = roster_import
+        busy = roster_import is not None
+        for button in (self.import_button, self.export_button, self.close_button):
+            button.setEnabled(not busy)
+
+    def done(self, result):
+        """Close the dialog, unless an import is still running."""
+        # The import's results arrive here; closing now would drop the user reload
+        if self._import is None:
+            super().done(result)
+
+    def export_file(self):
+        """Ask for a file name and export every user to it."""
+        path, _ = QFileDialog.getSaveFileName(self, "Export Users", "users.csv", ROSTER_FILE_FILTER)
+        if not path:
+            return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            with open(path, 'w', encoding='utf-8', newline='') as stream:
+                count = export_roster(stream, detect_format(path))
+        except OSError as e:
+            log("RosterDialog", f"Export failed: {e}")
+            QMessageBox.warning(self, "Export Failed", str(e))
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.report_view.setPlainText(f"Exported {count} user(s) to {path}")
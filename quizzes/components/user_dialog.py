@@ -6,7 +6,7 @@ from PySide6.QtWidgets import (
     QPushButton, QMessageBox
 )
 from PySide6.QtCore import Qt
-from ..database.users import create_user, update_user, get_user_by_username
+from ..user_directory import user_directory
 
 class UserDialog(QDialog):
     """Dialog for adding or editing a user."""
@@ -92,7 +92,7 @@ class UserDialog(QDialog):
         try:
             if self.is_edit_mode:
                 # Update existing user
-                success = update_user(self.user_id, display_name)
+                success = user_directory.update_user(self.user_id, display_name)
                 print(f"Update user result: {success}")
                 if success:
                     self.accept()
@@ -101,7 +101,7 @@ class UserDialog(QDialog):
             else:
                 # Create new user
                 # Check if username exists
-                existing_user = get_user_by_username(username)
+                existing_user = user_directory.get_user_by_username(username)
                 print(f"Existing user check: {existing_user}")
                 if existing_user:
                     QMessageBox.warning(self, "Username Exists", 
@@ -110,7 +110,7 @@ class UserDialog(QDialog):
                     
                 # Create user
                 try:
-                    user_id = create_user(username, display_name)
+                    user_id = user_directory.create_user(username, display_name)
                     print(f"Create user result: {user_id}")
                     if user_id:
                         self.user_id = user_id
@@ -0,0 +1,186 @@
+"""
+Searchable user picker component for quiz application.
+
+A line edit with a completer popup. Typing searches the user prefix index and
+the popup lists at most SEARCH_RESULT_LIMIT matches plus "+ Add New User".
+With nothing typed the popup browses the shared user list model instead; its
+list view only lays out the visible rows, however big the roster is.
+"""
+from PySide6.QtWidgets import QLabel, QLineEdit, QCompleter
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QEvent, QTimer, Qt, Signal
+
+from ..constants import ADD_USER_ITEM_TEXT
+from ..user_directory import user_directory
+from ..user_list_model import user_list_model, ADD_USER_ID
+from ..user_search import user_search_index, normalize, SEARCH_RESULT_LIMIT
+from .base_component import BaseComponent
+
+
+class UserSearchModel(QAbstractListModel):
+    """The users matching the current search text, plus an "add user" row.
+
+    Like UserListModel, the display role holds the display name and
+    Qt.UserRole the user ID.
+    """
+
+    def __init__(self, index=user_search_index, limit=SEARCH_RESULT_LIMIT, parent=None):
+        """
+        Initialize an empty result list.
+
+        Args:
+            index: The UserSearchIndex to query
+            limit: Maximum number of users listed
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.search_index = index
+        self.limit = limit
+        self.query = ""
+        self._users = []
+
+    def set_query(self, text: str) -> None:
+        """
+        Replace the results with the users matching a search text.
+
+        Args:
+            text: The text typed so far
+        """
+        self.beginResetModel()
+        self.query = text
+        self._users = self.search_index.search(text, self.limit)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        """Number of matching users plus the "add user" row."""
+        if parent.isValid():
+            return 0
+        return len(self._users) + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Display name for the display role and user ID for Qt.UserRole."""
+        if not index.isValid() or index.row() > len(self._users):
+            return None
+
+        if index.row() == len(self._users):
+            user = {"id": ADD_USER_ID, "display_name": ADD_USER_ITEM_TEXT}
+        else:
+            user = self._users[index.row()]
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return user["display_name"]
+        if role == Qt.UserRole:
+            return user["id"]
+        return None
+
+
+class UserPicker(BaseComponent):
+    """User selector with type-ahead search."""
+
+    # Signal emitted when a user (or ADD_USER_ID) is picked from the list
+    user_selected = Signal(int)  # user_id
+
+    def __init__(self, current_user=None, parent=None):
+        """
+        Initialize the user picker.
+
+        Args:
+            current_user: Dict of the user shown initially
+            parent: Parent widget
+        """
+        super().__init__(parent=parent)
+        self.current_user = current_user or {}
+
+        layout = self.create_layout(orientation='horizontal', spacing=5)
+        layout.addWidget(QLabel("User:"))
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setFixedWidth(150)
+        self.search_edit.setPlaceholderText("Search users...")
+        layout.addWidget(self.search_edit)
+
+        self.results_model = UserSearchModel(parent=self)
+        self.completer = QCompleter(self.results_model, self)
+        # The model is already filtered by the search index
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(SEARCH_RESULT_LIMIT + 1)
+        # Rows all have the same height, so browsing the roster lays out only the visible ones
+        self.completer.popup().setUniformItemSizes(True)
+        self.search_edit.setCompleter(self.completer)
+
+        self.search_edit.textEdited.connect(self._on_text_edited)
+        self.search_edit.returnPressed.connect(self._on_return_pressed)
+        self.search_edit.editingFinished.connect(self._restore_text)
+        self.completer.activated[QModelIndex].connect(self._on_activated)
+        self.search_edit.installEventFilter(self)
+        user_directory.user_updated.connect(self._on_user_updated)
+
+        self._restore_text()
+
+    def set_current_user(self, user):
+        """
+        Show a user as the selected one.
+
+        Args:
+            user: Dict with at least 'id' and 'display_name'
+        """
+        self.current_user = user or {}
+        self._restore_text()
+
+    def eventFilter(self, watched, event):
+        """Offer the first users of the roster when the search field gets focus."""
+        if watched is self.search_edit and event.type() == QEvent.FocusIn:
+            # Deferred so the click that focused the field doesn't close the popup
+            QTimer.singleShot(0, self._show_roster)
+        return super().eventFilter(watched, event)
+
+    def _show_roster(self):
+        """Select the text and show the unfiltered start of the roster."""
+        if self.search_edit.hasFocus():
+            self.search_edit.selectAll()
+            self._show_results("")
+
+    def _on_text_edited(self, text):
+        """Search as the user types."""
+        self._show_results(text)
+
+    def _show_results(self, text):
+        """Fill the popup with the users matching text, or the whole roster if there is none."""
+        if normalize(text):
+            self.results_model.set_query(text)
+            model = self.results_model
+        else:
+            model = user_list_model
+        if self.completer.model() is not model:
+            self.completer.setModel(model)
+        self.completer.complete()
+
+    def _on_return_pressed(self):
+        """Pick the best match when Enter is pressed without choosing a row."""
+        if self.completer.model() is not self.results_model:
+            return
+        user_id = self.results_model.index(0).data(Qt.UserRole)
+        if user_id is not None and user_id != ADD_USER_ID:
+            self.completer.popup().hide()
+            self.user_selected.emit(user_id)
+
+    def _on_activated(self, index):
+        """Pick the user of an activated popup row."""
+        user_id = index.data(Qt.UserRole)
+        # Deferred until the completer has put the row's text in the field and
+        # closed the popup, so the field ends up showing the selected user
+        QTimer.singleShot(0, lambda: self._select(user_id))
+
+    def _select(self, user_id):
+        """Show the current user and announce the picked one."""
+        self._restore_text()
+        if user_id is not None:
+            self.user_selected.emit(user_id)
+
+    def _restore_text(self):
+        """Show the current user's name instead of any unfinished search text."""
+        self.search_edit.setText(self.current_user.get("display_name") or "")
+
+    def _on_user_updated(self, user):
+        """Follow renames of the current user."""
+        if user["id"] == self.current_user.get("id"):
+            self.set_current_user(user)
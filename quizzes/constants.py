@@ -22,4 +22,6 @@ MAIN_WINDOW_ERROR = "Error: Could not find main window or show_menu method"
 
 CORRECT_FEEDBACK = "Super! Dobra robota!"
 INCORRECT_FEEDBACK = "Niestety, poprawna odpowiedź to {}"
-INCORRECT_FEEDBACK_SHORT = "Nie! Poprawna odpowiedź to {}" 
\ No newline at end of file
+INCORRECT_FEEDBACK_SHORT = "Nie! Poprawna odpowiedź to {}" 
+
+ADD_USER_ITEM_TEXT = "+ Add New User"
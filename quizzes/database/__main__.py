@@ -0,0 +1,133 @@
+"""
+Command line maintenance tools for the quiz database.
+
+Usage:
+    python -m quizzes.database check-plans [--db PATH]
+    python -m quizzes.database rebuild-stats
+    python -m quizzes.database import-users FILE [--format csv|json]
+                                                 [--on-conflict update|skip] [--dry-run]
+    python -m quizzes.database export-users FILE [--format csv|json]
+
+FILE may be '-' for standard input or output.
+"""
+import argparse
+import sqlite3
+import sys
+
+def check_plans(args) -> int:
+    """Report listing queries that are not served by an index."""
+    from .query_plans import check_query_plans, INDEXED_QUERIES
+
+    conn = sqlite3.connect(args.db) if args.db else None
+    problems = check_query_plans(conn)
+
+    for name in INDEXED_QUERIES:
+        if name in problems:
+            print(f"FAIL {name}: {'; '.join(problems[name])}")
+        else:
+            print(f"ok   {name}")
+
+    return 1 if problems else 0
+
+def rebuild_stats(args) -> int:
+    """Recompute the per-quiz-type score statistics."""
+    from .scores import rebuild_score_statistics, get_score_statistics
+
+    rebuild_score_statistics()
+    stats = get_score_statistics()
+    print(f"Rebuilt statistics for {stats['total_quizzes']} score(s)")
+    return 0
+
+def _open_roster(path: str, mode: str):
+    """Open a roster file, or wrap stdin/stdout for '-'."""
+    if path == '-':
+        stream = sys.stdin if 'r' in mode else sys.stdout
+        # Don't let the with block close the standard streams
+        return open(stream.fileno(), mode, encoding='utf-8', newline='', closefd=False)
+    return open(path, mode, encoding='utf-8', newline='')
+
+def import_users(args) -> int:
+    """Import a roster file and report rows that were not imported as-is."""
+    from .roster import import_roster, detect_format, format_report, IMPORT_ERRORS
+
+    fmt = args.format or detect_format(args.file)
+    try:
+        with _open_roster(args.file, 'r') as stream:
+            report = import_roster(stream, fmt, on_conflict=args.on_conflict, dry_run=args.dry_run)
+    except IMPORT_ERRORS as e:
+        print(f"Import failed, nothing was changed: {e}", file=sys.stderr)
+        return 1
+
+    summary, *issues = format_report(report, args.dry_run)
+    for line in issues:
+        print(line)
+    print(summary)
+    return 0
+
+def export_users(args) -> int:
+    """Write every user to a roster file."""
+    from .roster import export_roster, detect_format
+
+    fmt = args.format or detect_format(args.file)
+    with _open_roster(args.file, 'w') as stream:
+        count = export_roster(stream, fmt)
+    if args.file != '-':
+        print(f"Exported {count} user(s) to {args.file}")
+    return 0
+
+def main(argv=None) -> int:
+    """Parse the command line and run the selected command."""
+    parser = argparse.ArgumentParser(prog="python -m quizzes.database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    plans_parser = subparsers.add_parser(
+        "check-plans",
+        help="fail if a listing query falls back to a table scan"
+    )
+    plans_parser.add_argument(
+        "--db",
+        help="database file to check (default: a fresh in-memory schema)"
+    )
+    plans_parser.set_defaults(func=check_plans)
+
+    stats_parser = subparsers.add_parser(
+        "rebuild-stats",
+        help="recompute the score statistics table from the scores table"
+    )
+    stats_parser.set_defaults(func=rebuild_stats)
+
+    import_parser = subparsers.add_parser(
+        "import-users",
+        help="add or update users from a CSV or JSON roster in one transaction"
+    )
+    import_parser.add_argument("file", help="roster file, or - for standard input")
+    import_parser.add_argument(
+        "--format", choices=("csv", "json"),
+        help="file format (default: from the file extension, csv for -)"
+    )
+    import_parser.add_argument(
+        "--on-conflict", choices=("update", "skip"), default="update",
+        help="for existing usernames, overwrite the display name or keep it (default: update)"
+    )
+    import_parser.add_argument(
+        "--dry-run", action="store_true",
+        help="validate and report without changing the database"
+    )
+    import_parser.set_defaults(func=import_users)
+
+    export_parser = subparsers.add_parser(
+        "export-users",
+        help="write every user to a CSV or JSON roster"
+    )
+    export_parser.add_argument("file", help="roster file, or - for standard output")
+    export_parser.add_argument(
+        "--format", choices=("csv", "json"),
+        help="file format (default: from the file extension, csv for -)"
+    )
+    export_parser.set_defaults(func=export_users)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Attempts module for logging individual answers given during a quiz.
+"""
+from typing import List, Dict, Any
+from .db import get_connection
+
+def save_attempts(attempts: List[Dict[str, Any]]) -> None:
+    """
+    Save a batch of answer attempts to the database in a single transaction.
+    
+    Args:
+        attempts: Attempt dictionaries with 'session_id', 'quiz_type', 'player_name',
+                  'question_number', 'question', 'expected_answer', 'given_answer',
+                  'correct' and 'latency_ms' keys. 'given_answer' is None for
+                  self-assessed questions.
+    """
+    if not attempts:
+        return
+    
+    rows = [
+        (
+            attempt['session_id'],
+            attempt['quiz_type'],
+            attempt.get('player_name') or "Anonymous",
+            attempt['question_number'],
+            attempt['question'],
+            attempt.get('expected_answer'),
+            attempt.get('given_answer'),
+            1 if attempt['correct'] else 0,
+            attempt.get('latency_ms')
+        )
+        for attempt in attempts
+    ]
+    
+    conn = get_connection()
+    
+    try:
+        conn.executemany('''
+        INSERT INTO attempts (
+            session_id, quiz_type, player_name, question_number, question,
+            expected_answer, given_answer, correct, latency_ms
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
@@ -2,61 +2,200 @@
 SQLite database module for quiz application.
 Handles connection and initialization of the database.
 """
+import atexit
 import os
 import sqlite3
+import threading
+import weakref
 from pathlib import Path
 
+from .migrations import migrate
+
 # Get the project root directory
 ROOT_DIR = Path(__file__).parent.parent.parent
-DB_FILE = os.path.join(ROOT_DIR, 'quiz_data.db')
+# QUIZ_DB_FILE points the application at another database (e.g. for benchmarks)
+DB_FILE = os.environ.get('QUIZ_DB_FILE') or os.path.join(ROOT_DIR, 'quiz_data.db')
+
+# Connections of finished threads kept open for the next threads that need one
+MAX_IDLE_CONNECTIONS = 4
+
+# Pragmas applied to every connection when it is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",       # Readers don't block the writer and vice versa
+    "PRAGMA synchronous = NORMAL",     # Safe with WAL, avoids an fsync per commit
+    "PRAGMA cache_size = -8000",       # ~8 MB page cache per connection
+    "PRAGMA mmap_size = 67108864",     # Map up to 64 MB of the database file
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",      # Wait for other kiosks instead of failing at once
+)
+
+
+class _Lease:
+    """A thread's hold on a connection, kept in the thread's local storage.
+
+    When the thread finishes, its local storage and the lease go away and the
+    connection is handed back to the manager.
+    """
+
+    __slots__ = ('conn', 'release', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
+        # Set by ConnectionManager._lease(); calling it hands the connection back early
+        self.release = None
+
+
+class ConnectionManager:
+    """Hands out one long-lived SQLite connection per thread.
+
+    A thread keeps its connection until it finishes, so callers pay the
+    connection setup cost only once per thread, and sqlite3's per-connection
+    statement cache keeps each statement compiled across calls. Connections of
+    finished threads are kept open (up to MAX_IDLE_CONNECTIONS) and handed to
+    the next thread that asks: Qt thread pool workers drop their Python thread
+    state, and with it their connection, after every task. The first connection
+    handed out also brings the schema up to date; nothing touches the database
+    before then.
+    """
+
+    def __init__(self, db_file, max_idle=MAX_IDLE_CONNECTIONS):
+        """Initialize the connection manager.
+
+        Args:
+            db_file: Path to the SQLite database file
+            max_idle: Number of connections of finished threads kept open
+        """
+        self.db_file = db_file
+        self.max_idle = max_idle
+        self._local = threading.local()
+        self._idle = []
+        self._lock = threading.Lock()
+        # Connections leased before the last close_all() are closed when they come back
+        self._generation = 0
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def get_connection(self):
+        """Get the connection owned by the calling thread, leasing one if needed.
+
+        Returns:
+            The sqlite3 connection object
+        """
+        lease = getattr(self._local, 'lease', None)
+        if lease is None:
+            lease = self._lease()
+            self._local.lease = lease
+        if not self._schema_ready:
+            self._ensure_schema(lease.conn)
+        return lease.conn
+
+    def _ensure_schema(self, conn):
+        """Run pending migrations once per process.
+
+        Other threads asking for a connection meanwhile wait here until the
+        schema is ready.
+        """
+        with self._schema_lock:
+            if not self._schema_ready:
+                migrate(conn)
+                self._schema_ready = True
+
+    def _lease(self):
+        """Lease an idle connection, or a new one, to the calling thread until it finishes."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            generation = self._generation
+        if conn is None:
+            conn = self._open()
+        lease = _Lease(conn)
+        lease.release = weakref.finalize(lease, self._release, conn, generation)
+        # Threads still running at exit keep their connection; close_all() leaves them alone
+        lease.release.atexit = False
+        return lease
+
+    def _release(self, conn, generation):
+        """Take back a finished thread's connection, keeping it for the next one if possible."""
+        if conn.in_transaction:
+            # Don't hand a half-done transaction to another thread
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            if generation == self._generation and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        self._close(conn)
+
+    def _open(self):
+        """Open and configure a new connection."""
+        # Connections move to another thread once the thread that leased them finishes;
+        # only one thread uses a connection at a time
+        conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Makes rows accessible by column name
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @staticmethod
+    def _close(conn):
+        """Close a connection, ignoring errors."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close_all(self):
+        """Close the idle connections and the calling thread's own one.
+
+        Connections of threads that are still running (the score writer may
+        still be saving, for example) are closed when those threads finish.
+        Threads that ask again afterwards get a fresh connection.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._generation += 1
+        lease = self._local.__dict__.pop('lease', None)
+        if lease is not None:
+            lease.release()
+        for conn in idle:
+            self._close(conn)
+
+
+# Shared connection manager for the application database
+connection_manager = ConnectionManager(DB_FILE)
 
 def get_connection():
     """
-    Create a connection to the SQLite database.
-    Returns the connection object.
+    Get the calling thread's connection to the SQLite database.
+    The connection is shared and must not be closed by the caller.
     """
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row  # Makes rows accessible by column name
-    return conn
+    return connection_manager.get_connection()
+
+def close_connections():
+    """
+    Close the idle database connections and the calling thread's one.
+    Called automatically at interpreter exit.
+    """
+    connection_manager.close_all()
+
+atexit.register(close_connections)
 
 def init_db():
     """
-    Initialize the database by creating necessary tables if they don't exist.
+    Initialize the database by applying any pending schema migrations.
+    This happens automatically on first use, so calling it is optional.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Create users table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT NOT NULL UNIQUE,
-        display_name TEXT,
-        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # Create scores table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS scores (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        quiz_type TEXT NOT NULL,
-        player_name TEXT DEFAULT 'Anonymous',
-        score INTEGER NOT NULL,
-        total_questions INTEGER NOT NULL,
-        percentage REAL NOT NULL,
-        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # Insert default user if it doesn't exist
-    cursor.execute('''
-    INSERT OR IGNORE INTO users (username, display_name)
-    VALUES ('anonymous', 'Anonymous')
-    ''')
-    
-    conn.commit()
-    conn.close()
+    get_connection()
 
-# Initialize the database when the module is imported
-init_db() 
\ No newline at end of file
+def init_db_in_background():
+    """
+    Initialize the database on a background thread.
+    Queries issued before it finishes wait for the schema instead of failing.
+    
+    Returns:
+        The started thread
+    """
+    thread = threading.Thread(target=init_db, name="DatabaseInit", daemon=True)
+    thread.start()
+    return thread
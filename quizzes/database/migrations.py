@@ -0,0 +1,241 @@
+"""
+Versioned schema migrations for the quiz database.
+The schema version applied to a database file is tracked in PRAGMA user_version.
+"""
+from typing import List, Tuple
+
+# Recomputes the per-quiz-type aggregates in score_stats from the scores table.
+# Used by the migration that introduces score_stats and by rebuild_score_statistics().
+REBUILD_SCORE_STATS = [
+    'DELETE FROM score_stats',
+    '''
+    INSERT INTO score_stats (
+        quiz_type, total_quizzes, sum_percentage, max_percentage,
+        min_percentage, sum_score, total_questions_asked
+    )
+    SELECT quiz_type, COUNT(*), SUM(percentage), MAX(percentage),
+           MIN(percentage), SUM(score), SUM(total_questions)
+    FROM scores
+    GROUP BY quiz_type
+    ''',
+]
+
+# Adds one score to the aggregates of its quiz type. Used by the insert and
+# update triggers of migration 3.
+_ADD_SCORE_TO_STATS = '''
+            INSERT INTO score_stats (
+                quiz_type, total_quizzes, sum_percentage, max_percentage,
+                min_percentage, sum_score, total_questions_asked
+            )
+            VALUES (
+                NEW.quiz_type, 1, NEW.percentage, NEW.percentage,
+                NEW.percentage, NEW.score, NEW.total_questions
+            )
+            ON CONFLICT (quiz_type) DO UPDATE SET
+                total_quizzes = total_quizzes + 1,
+                sum_percentage = sum_percentage + excluded.sum_percentage,
+                max_percentage = MAX(max_percentage, excluded.max_percentage),
+                min_percentage = MIN(min_percentage, excluded.min_percentage),
+                sum_score = sum_score + excluded.sum_score,
+                total_questions_asked = total_questions_asked + excluded.total_questions_asked;
+'''
+
+# Takes one score out of the aggregates of its quiz type. The minimum and
+# maximum are only looked up again (one index search on idx_scores_quiz_rank)
+# when the removed score was the extreme; quiz types left without scores are
+# dropped. Used by the delete and update triggers of migration 3.
+_REMOVE_SCORE_FROM_STATS = '''
+            UPDATE score_stats SET
+                total_quizzes = total_quizzes - 1,
+                sum_percentage = sum_percentage - OLD.percentage,
+                max_percentage = CASE WHEN OLD.percentage < max_percentage THEN max_percentage
+                    ELSE (SELECT MAX(percentage) FROM scores WHERE quiz_type = OLD.quiz_type) END,
+                min_percentage = CASE WHEN OLD.percentage > min_percentage THEN min_percentage
+                    ELSE (SELECT MIN(percentage) FROM scores WHERE quiz_type = OLD.quiz_type) END,
+                sum_score = sum_score - OLD.score,
+                total_questions_asked = total_questions_asked - OLD.total_questions
+            WHERE quiz_type = OLD.quiz_type;
+            DELETE FROM score_stats WHERE quiz_type = OLD.quiz_type AND total_quizzes <= 0;
+'''
+
+# Ordered list of (version, statements). Append new migrations at the end and
+# never edit one that has already shipped.
+MIGRATIONS: List[Tuple[int, List[str]]] = [
+    # Base schema
+    (1, [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            display_name TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            quiz_type TEXT NOT NULL,
+            player_name TEXT DEFAULT 'Anonymous',
+            score INTEGER NOT NULL,
+            total_questions INTEGER NOT NULL,
+            percentage REAL NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        INSERT OR IGNORE INTO users (username, display_name)
+        VALUES ('anonymous', 'Anonymous')
+        ''',
+    ]),
+    # Covering indexes for the score listings. Each index starts with the
+    # filter column, follows the ORDER BY of its query and then carries every
+    # other column of the table, so the queries never touch the table itself.
+    (2, [
+        '''
+        CREATE INDEX IF NOT EXISTS idx_scores_quiz_rank ON scores (
+            quiz_type, percentage DESC, timestamp DESC, id DESC,
+            player_name, score, total_questions
+        )
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_scores_rank ON scores (
+            percentage DESC, timestamp DESC, id DESC,
+            quiz_type, player_name, score, total_questions
+        )
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_scores_player_history ON scores (
+            player_name, timestamp DESC, id DESC,
+            quiz_type, score, total_questions, percentage
+        )
+        ''',
+    ]),
+    # Per-quiz-type score aggregates, kept up to date by triggers in the same
+    # transaction as every change to scores
+    (3, [
+        '''
+        CREATE TABLE IF NOT EXISTS score_stats (
+            quiz_type TEXT PRIMARY KEY,
+            total_quizzes INTEGER NOT NULL,
+            sum_percentage REAL NOT NULL,
+            max_percentage REAL,
+            min_percentage REAL,
+            sum_score INTEGER NOT NULL,
+            total_questions_asked INTEGER NOT NULL
+        )
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_scores_stats_insert
+        AFTER INSERT ON scores
+        BEGIN{_ADD_SCORE_TO_STATS}        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_scores_stats_delete
+        AFTER DELETE ON scores
+        BEGIN{_REMOVE_SCORE_FROM_STATS}        END
+        ''',
+        # An update takes the old row out and adds the new one like an insert
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_scores_stats_update
+        AFTER UPDATE OF quiz_type, score, total_questions, percentage ON scores
+        BEGIN{_REMOVE_SCORE_FROM_STATS}{_ADD_SCORE_TO_STATS}        END
+        ''',
+        *REBUILD_SCORE_STATS,
+    ]),
+    # Per-question answer log for item analytics
+    (4, [
+        '''
+        CREATE TABLE IF NOT EXISTS attempts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            quiz_type TEXT NOT NULL,
+            player_name TEXT DEFAULT 'Anonymous',
+            question_number INTEGER NOT NULL,
+            question TEXT NOT NULL,
+            expected_answer TEXT,
+            given_answer TEXT,
+            correct INTEGER NOT NULL,
+            latency_ms INTEGER,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_attempts_question ON attempts (
+            quiz_type, question, correct
+        )
+        ''',
+    ]),
+    # Case-insensitive indexes for searching users by name prefix. A LIKE 'abc%'
+    # on a column can only use an index built with NOCASE collation.
+    (5, [
+        '''
+        CREATE INDEX IF NOT EXISTS idx_users_display_name_nocase ON users (
+            display_name COLLATE NOCASE, id
+        )
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_users_username_nocase ON users (
+            username COLLATE NOCASE
+        )
+        ''',
+    ]),
+]
+
+# Version of the newest migration
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn) -> int:
+    """
+    Get the schema version of the database.
+
+    Args:
+        conn: An open sqlite3 connection
+
+    Returns:
+        The value of PRAGMA user_version
+    """
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn) -> int:
+    """
+    Apply every migration newer than the database's schema version.
+
+    An up-to-date database costs a single PRAGMA read. Otherwise each migration
+    runs in its own write transaction together with the version bump, so a
+    failed migration leaves the database at the previous version.
+
+    Args:
+        conn: An open sqlite3 connection
+
+    Returns:
+        The schema version after migrating
+    """
+    current_version = get_schema_version(conn)
+    if current_version >= SCHEMA_VERSION:
+        return current_version
+
+    for version, statements in MIGRATIONS:
+        if version <= current_version:
+            continue
+
+        try:
+            # Take the write lock up front and re-check, since another process
+            # sharing the database file may have migrated while we waited
+            conn.execute('BEGIN IMMEDIATE')
+            if get_schema_version(conn) >= version:
+                conn.commit()
+                current_version = version
+                continue
+
+            for statement in statements:
+                conn.execute(statement)
+            # PRAGMA doesn't accept parameters; version is a trusted int
+            conn.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        current_version = version
+
+    return current_version
@@ -0,0 +1,101 @@
+"""
+Query plan checks for the quiz database.
+
+Runs EXPLAIN QUERY PLAN over the listing queries and reports any query that
+falls back to a full table scan, an unplanned index scan or a temporary sort
+instead of searching an index.
+"""
+import re
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from .migrations import migrate
+from .scores import (
+    TOP_SCORES_BY_TYPE_SQL, TOP_SCORES_SQL, PLAYER_HISTORY_SQL, SCORES_PAGE_SQL
+)
+from .users import SEARCH_USERS_BY_DISPLAY_NAME_SQL, SEARCH_USERS_BY_USERNAME_SQL
+
+# Queries that must be served by an index: name -> (sql, sample parameters)
+INDEXED_QUERIES: Dict[str, Tuple[str, tuple]] = {
+    'top_scores_by_type': (TOP_SCORES_BY_TYPE_SQL, ('MultiplicationQuiz', 10)),
+    'top_scores': (TOP_SCORES_SQL, (10,)),
+    'player_history': (PLAYER_HISTORY_SQL, ('Anonymous', 20)),
+    'scores_first_page': (SCORES_PAGE_SQL[(False, False)], (100,)),
+    'scores_next_page': (SCORES_PAGE_SQL[(False, True)], (90.0, '2025-01-01 00:00:00', 10, 100)),
+    'scores_first_page_by_type': (
+        SCORES_PAGE_SQL[(True, False)], ('MultiplicationQuiz', 100)
+    ),
+    'scores_next_page_by_type': (
+        SCORES_PAGE_SQL[(True, True)],
+        ('MultiplicationQuiz', 90.0, '2025-01-01 00:00:00', 10, 100)
+    ),
+    'search_users_by_display_name': (SEARCH_USERS_BY_DISPLAY_NAME_SQL, ('an%', 20)),
+    'search_users_by_username': (SEARCH_USERS_BY_USERNAME_SQL, ('an%', 20)),
+}
+
+# Queries that may walk a whole covering index: name -> index. They have no
+# filter, so they read the index in ORDER BY order and stop at the LIMIT.
+ORDERED_INDEX_SCANS: Dict[str, str] = {
+    'top_scores': 'idx_scores_rank',
+    'scores_first_page': 'idx_scores_rank',
+}
+
+_COVERING_INDEX_SCAN = re.compile(r'SCAN \S+ USING COVERING INDEX (\S+)')
+
+def explain_query_plan(conn, sql: str, params: tuple = ()) -> List[str]:
+    """
+    Get the query plan for a statement.
+
+    Args:
+        conn: An open sqlite3 connection
+        sql: The statement to explain
+        params: Parameters for the statement
+
+    Returns:
+        The plan steps as reported by SQLite (the 'detail' column)
+    """
+    rows = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+    return [row[3] for row in rows]
+
+def is_unindexed_step(detail: str, allowed_scan: Optional[str] = None) -> bool:
+    """
+    Check whether a query plan step reads a table or sorts without searching an index.
+
+    Args:
+        detail: A plan step as returned by explain_query_plan()
+        allowed_scan: Covering index the query may walk in full, see ORDERED_INDEX_SCANS
+
+    Returns:
+        True for temporary sorts and for every SCAN step except a walk over allowed_scan
+    """
+    if 'USE TEMP B-TREE' in detail:
+        return True
+    if not detail.startswith('SCAN'):
+        return False
+    match = _COVERING_INDEX_SCAN.fullmatch(detail)
+    return allowed_scan is None or match is None or match.group(1) != allowed_scan
+
+def check_query_plans(conn: Optional[sqlite3.Connection] = None) -> Dict[str, List[str]]:
+    """
+    Check that every query in INDEXED_QUERIES is served by an index.
+
+    Args:
+        conn: Connection to check against. Defaults to a fresh in-memory
+              database with all migrations applied.
+
+    Returns:
+        A dictionary of query name -> offending plan steps, empty if all queries are indexed
+    """
+    if conn is None:
+        conn = sqlite3.connect(':memory:')
+        migrate(conn)
+
+    problems = {}
+    for name, (sql, params) in INDEXED_QUERIES.items():
+        allowed_scan = ORDERED_INDEX_SCANS.get(name)
+        bad_steps = [step for step in explain_query_plan(conn, sql, params)
+                     if is_unindexed_step(step, allowed_scan)]
+        if bad_steps:
+            problems[name] = bad_steps
+
+    return problems
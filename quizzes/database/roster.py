@@ -0,0 +1,304 @@
+"""
+Bulk roster import and export for the users table.
+
+Rosters are CSV files with a header row or JSON documents holding a list of
+user objects (either the whole document or its "users" member). Both columns
+are 'username' and 'display_name'; other columns such as the exported
+'created_at' are ignored, so an export can be imported again.
+
+Imports read and validate the file one row at a time and write valid rows with
+executemany in batches, all inside one transaction: either the whole roster is
+applied or nothing is. Every row that was not applied as-is ends up in the
+report with its line number.
+"""
+import csv
+import json
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .db import get_connection
+from ..json_stream import iter_array_items
+from ..debug import log
+
+# Errors an import can fail with; the import is rolled back, so nothing is changed
+IMPORT_ERRORS = (OSError, ValueError, csv.Error, sqlite3.Error)
+
+# Columns written by export_roster()
+EXPORT_COLUMNS = ('username', 'display_name', 'created_at')
+
+# Supported file formats
+ROSTER_FORMATS = ('csv', 'json')
+
+# Rows written per executemany() call
+IMPORT_BATCH_SIZE = 500
+
+# Length limits for imported values
+USERNAME_MAX_LENGTH = 50
+DISPLAY_NAME_MAX_LENGTH = 100
+
+# Usernames that an import must never change
+RESERVED_USERNAMES = frozenset({'anonymous'})
+
+# What to do with rows whose username already exists
+ON_CONFLICT_UPDATE = 'update'  # Overwrite the display name
+ON_CONFLICT_SKIP = 'skip'      # Keep the existing user as it is
+
+# Kinds of issues in an import report
+ISSUE_INVALID = 'invalid'
+ISSUE_DUPLICATE = 'duplicate'
+ISSUE_RESERVED = 'reserved'
+ISSUE_CONFLICT = 'conflict'
+
+UPSERT_SQL = {
+    ON_CONFLICT_UPDATE: '''
+    INSERT INTO users (username, display_name) VALUES (?, ?)
+    ON CONFLICT (username) DO UPDATE SET display_name = excluded.display_name
+    ''',
+    ON_CONFLICT_SKIP: '''
+    INSERT INTO users (username, display_name) VALUES (?, ?)
+    ON CONFLICT (username) DO NOTHING
+    ''',
+}
+
+def detect_format(path: str) -> str:
+    """
+    Guess the roster format from a file name.
+
+    Args:
+        path: The file name
+
+    Returns:
+        'json' for .json files, 'csv' otherwise
+    """
+    return 'json' if path.lower().endswith('.json') else 'csv'
+
+def iter_roster_rows(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Read the raw rows of a roster file one at a time.
+
+    Args:
+        stream: Text stream of the file (for CSV opened with newline='')
+        fmt: 'csv' or 'json'
+
+    Yields:
+        (line, row) tuples. For CSV the line is the file line the row ends on
+        and the row a dict; for JSON the line is the 1-based position in the
+        list and the row whatever the list holds.
+
+    Raises:
+        ValueError: If the file has no username column or is not a list of users
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        if not reader.fieldnames or 'username' not in reader.fieldnames:
+            raise ValueError("CSV roster needs a header row with a 'username' column")
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'json':
+        for position, row in enumerate(iter_array_items(stream, key='users'), start=1):
+            yield position, row
+    else:
+        raise ValueError(f"Unknown roster format: {fmt}")
+
+def validate_row(row: Any) -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+    """
+    Validate one roster row.
+
+    Args:
+        row: A dict with a 'username' and an optional 'display_name'
+
+    Returns:
+        ((username, display_name), None) for a valid row, or (None, reason)
+    """
+    if not isinstance(row, dict):
+        return None, "Row is not an object"
+
+    username = row.get('username')
+    display_name = row.get('display_name')
+    if username is not None and not isinstance(username, str):
+        return None, "Username must be text"
+    if display_name is not None and not isinstance(display_name, str):
+        return None, "Display name must be text"
+
+    username = (username or '').strip()
+    display_name = ' '.join((display_name or '').split()) or username
+
+    if not username:
+        return None, "Username is missing"
+    if any(char.isspace() or not char.isprintable() for char in username):
+        return None, "Username must not contain spaces or control characters"
+    if len(username) > USERNAME_MAX_LENGTH:
+        return None, f"Username is longer than {USERNAME_MAX_LENGTH} characters"
+    if len(display_name) > DISPLAY_NAME_MAX_LENGTH:
+        return None, f"Display name is longer than {DISPLAY_NAME_MAX_LENGTH} characters"
+
+    return (username, display_name), None
+
+def import_roster(stream: TextIO, fmt: str, on_conflict: str = ON_CONFLICT_UPDATE,
+                  dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Import users from a roster file in one transaction.
+
+    Rows are validated as they are read. Invalid rows, repeated usernames and
+    reserved usernames are reported and left out; existing usernames with a
+    different display name are reported as conflicts and resolved per on_conflict.
+
+    Args:
+        stream: Text stream of the roster (for CSV opened with newline='')
+        fmt: 'csv' or 'json'
+        on_conflict: ON_CONFLICT_UPDATE or ON_CONFLICT_SKIP
+        dry_run: Validate and report everything, then roll back
+
+    Returns:
+        A report dictionary with 'inserted', 'updated', 'unchanged' and 'skipped'
+        counts and an 'issues' list of {'line', 'username', 'kind', 'message'} dicts
+
+    Raises:
+        ValueError: If the file itself is malformed; nothing is imported then
+    """
+    if on_conflict not in UPSERT_SQL:
+        raise ValueError(f"Unknown conflict policy: {on_conflict}")
+
+    report = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'issues': []}
+    seen_usernames = set()
+    batch: List[Tuple[int, str, str]] = []
+
+    conn = get_connection()
+    # Take the write lock up front so the conflict checks stay valid until commit
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for line, row in iter_roster_rows(stream, fmt):
+            values, reason = validate_row(row)
+            if values is None:
+                username = row.get('username') if isinstance(row, dict) else None
+                _add_issue(report, line, username, ISSUE_INVALID, reason)
+                continue
+
+            username, display_name = values
+            if username in seen_usernames:
+                _add_issue(report, line, username, ISSUE_DUPLICATE,
+                           "Username appears earlier in the file")
+                continue
+            seen_usernames.add(username)
+
+            if username.lower() in RESERVED_USERNAMES:
+                _add_issue(report, line, username, ISSUE_RESERVED,
+                           "Username is reserved and cannot be imported")
+                continue
+
+            batch.append((line, username, display_name))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                _write_batch(conn, batch, on_conflict, report)
+                batch = []
+
+        if batch:
+            _write_batch(conn, batch, on_conflict, report)
+
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    # Conflicts are found per batch, after the other issues of the batch's rows
+    report['issues'].sort(key=lambda issue: issue['line'])
+    log("Roster", f"Imported roster: {report['inserted']} new, {report['updated']} updated, "
+                  f"{report['unchanged']} unchanged, {len(report['issues'])} issue(s)"
+                  f"{' (dry run)' if dry_run else ''}")
+    return report
+
+def format_report(report: Dict[str, Any], dry_run: bool = False) -> List[str]:
+    """
+    Describe an import report.
+
+    Args:
+        report: The dictionary returned by import_roster()
+        dry_run: Whether the import was only a check
+
+    Returns:
+        A summary line followed by one line per issue
+    """
+    lines = [
+        f"{'Would import' if dry_run else 'Imported'}: {report['inserted']} new, "
+        f"{report['updated']} updated, {report['unchanged']} unchanged, "
+        f"{report['skipped']} skipped"
+    ]
+    for issue in report['issues']:
+        lines.append(f"line {issue['line']}: {issue['kind']:9} "
+                     f"{issue['username'] or '-'}: {issue['message']}")
+    return lines
+
+def _add_issue(report: Dict[str, Any], line: int, username: Optional[str], kind: str,
+               message: str) -> None:
+    """Record a row that was not imported as-is."""
+    report['issues'].append({'line': line, 'username': username, 'kind': kind, 'message': message})
+    if kind != ISSUE_CONFLICT:
+        report['skipped'] += 1
+
+def _write_batch(conn, batch: List[Tuple[int, str, str]], on_conflict: str,
+                 report: Dict[str, Any]) -> None:
+    """Classify a batch of valid rows against the existing users and upsert it."""
+    placeholders = ', '.join('?' * len(batch))
+    existing = {
+        row['username']: row['display_name']
+        for row in conn.execute(
+            f'SELECT username, display_name FROM users WHERE username IN ({placeholders})',
+            [username for _, username, _ in batch]
+        )
+    }
+
+    rows = []
+    for line, username, display_name in batch:
+        if username not in existing:
+            report['inserted'] += 1
+            rows.append((username, display_name))
+        elif existing[username] == display_name:
+            report['unchanged'] += 1
+        elif on_conflict == ON_CONFLICT_UPDATE:
+            _add_issue(report, line, username, ISSUE_CONFLICT,
+                       f"Renamed from {existing[username]!r} to {display_name!r}")
+            report['updated'] += 1
+            rows.append((username, display_name))
+        else:
+            _add_issue(report, line, username, ISSUE_CONFLICT,
+                       f"Kept existing name {existing[username]!r} instead of {display_name!r}")
+            report['skipped'] += 1
+
+    conn.executemany(UPSERT_SQL[on_conflict], rows)
+
+def export_roster(stream: TextIO, fmt: str) -> int:
+    """
+    Write every user to a roster file, one row at a time.
+
+    Args:
+        stream: Text stream to write to (for CSV opened with newline='')
+        fmt: 'csv' or 'json'
+
+    Returns:
+        The number of users written
+    """
+    if fmt not in ROSTER_FORMATS:
+        raise ValueError(f"Unknown roster format: {fmt}")
+
+    conn = get_connection()
+    cursor = conn.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM users ORDER BY id")
+
+    count = 0
+    if fmt == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in cursor:
+            writer.writerow(tuple(row))
+            count += 1
+    else:
+        stream.write('{"users": [')
+        for row in cursor:
+            stream.write(',\n  ' if count else '\n  ')
+            stream.write(json.dumps(dict(row), ensure_ascii=False))
+            count += 1
+        stream.write('\n]}\n' if count else ']}\n')
+
+    log("Roster", f"Exported {count} users")
+    return count
@@ -2,8 +2,63 @@
 Scores module for saving and retrieving quiz scores.
 """
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from .db import get_connection
+from .migrations import REBUILD_SCORE_STATS
+
+# Listing queries. Each one is served by a covering index (see migrations.py)
+# and is checked against its query plan by query_plans.py.
+TOP_SCORES_BY_TYPE_SQL = '''
+SELECT * FROM scores
+WHERE quiz_type = ?
+ORDER BY percentage DESC, timestamp DESC
+LIMIT ?
+'''
+
+TOP_SCORES_SQL = '''
+SELECT * FROM scores
+ORDER BY percentage DESC, timestamp DESC
+LIMIT ?
+'''
+
+PLAYER_HISTORY_SQL = '''
+SELECT * FROM scores
+WHERE player_name = ?
+ORDER BY timestamp DESC
+LIMIT ?
+'''
+
+# Columns returned by get_scores_page(), in order
+SCORE_PAGE_COLUMNS = (
+    'id', 'quiz_type', 'player_name', 'score', 'total_questions', 'percentage', 'timestamp'
+)
+
+# Default number of rows per page for get_scores_page()
+SCORES_PAGE_SIZE = 100
+
+def _scores_page_sql(by_quiz_type: bool, after_cursor: bool) -> str:
+    """Build the keyset pagination query for one combination of filters."""
+    conditions = []
+    if by_quiz_type:
+        conditions.append("quiz_type = ?")
+    if after_cursor:
+        # Row value comparison continues right after the last row of the previous page
+        conditions.append("(percentage, timestamp, id) < (?, ?, ?)")
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    return f'''
+SELECT {', '.join(SCORE_PAGE_COLUMNS)} FROM scores
+{where_clause}
+ORDER BY percentage DESC, timestamp DESC, id DESC
+LIMIT ?
+'''
+
+# Keyset pagination queries keyed by (filtered by quiz type, continuing after a cursor)
+SCORES_PAGE_SQL = {
+    (by_quiz_type, after_cursor): _scores_page_sql(by_quiz_type, after_cursor)
+    for by_quiz_type in (False, True)
+    for after_cursor in (False, True)
+}
 
 def save_score(quiz_type: str, score: int, total_questions: int, player_name: str = "Anonymous") -> int:
     """
@@ -23,17 +78,57 @@ def save_score(quiz_type: str, score: int, total_questions: int, player_name: st
     
     percentage = (score / total_questions) * 100 if total_questions > 0 else 0
     
-    cursor.execute('''
-    INSERT INTO scores (quiz_type, player_name, score, total_questions, percentage)
-    VALUES (?, ?, ?, ?, ?)
-    ''', (quiz_type, player_name, score, total_questions, percentage))
-    
-    score_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    try:
+        cursor.execute('''
+        INSERT INTO scores (quiz_type, player_name, score, total_questions, percentage)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (quiz_type, player_name, score, total_questions, percentage))
+        
+        score_id = cursor.lastrowid
+        conn.commit()
+    except Exception:
+        # The connection is shared, so never leave a transaction open on it
+        conn.rollback()
+        raise
     
     return score_id
 
+def save_scores(records: List[Dict[str, Any]]) -> None:
+    """
+    Save several quiz scores to the database in a single transaction.
+    
+    Args:
+        records: Score dictionaries with 'quiz_type', 'score', 'total_questions'
+                 and optionally 'player_name' keys
+    """
+    if not records:
+        return
+    
+    rows = []
+    for record in records:
+        score = record['score']
+        total_questions = record['total_questions']
+        percentage = (score / total_questions) * 100 if total_questions > 0 else 0
+        rows.append((
+            record['quiz_type'],
+            record.get('player_name') or "Anonymous",
+            score,
+            total_questions,
+            percentage
+        ))
+    
+    conn = get_connection()
+    
+    try:
+        conn.executemany('''
+        INSERT INTO scores (quiz_type, player_name, score, total_questions, percentage)
+        VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
 def get_top_scores(quiz_type: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
     """
     Get the top scores from the database.
@@ -49,25 +144,54 @@ def get_top_scores(quiz_type: Optional[str] = None, limit: int = 10) -> List[Dic
     cursor = conn.cursor()
     
     if quiz_type:
-        cursor.execute('''
-        SELECT * FROM scores
-        WHERE quiz_type = ?
-        ORDER BY percentage DESC, timestamp DESC
-        LIMIT ?
-        ''', (quiz_type, limit))
+        cursor.execute(TOP_SCORES_BY_TYPE_SQL, (quiz_type, limit))
     else:
-        cursor.execute('''
-        SELECT * FROM scores
-        ORDER BY percentage DESC, timestamp DESC
-        LIMIT ?
-        ''', (limit,))
+        cursor.execute(TOP_SCORES_SQL, (limit,))
     
     rows = cursor.fetchall()
-    conn.close()
     
     # Convert rows to dictionaries
     return [dict(row) for row in rows]
 
+def get_scores_page(
+    quiz_type: Optional[str] = None,
+    after: Optional[Tuple[float, str, int]] = None,
+    page_size: int = SCORES_PAGE_SIZE
+) -> Tuple[List[tuple], Optional[Tuple[float, str, int]]]:
+    """
+    Get one page of scores, best first, using keyset pagination.
+    
+    Instead of an OFFSET, each page continues after the last row of the previous
+    one, so every page is a single index range read no matter how deep it is.
+    
+    Args:
+        quiz_type: Optional filter by quiz type
+        after: Cursor returned with the previous page, or None for the first page
+        page_size: Maximum number of rows to return
+        
+    Returns:
+        A tuple of (rows, next_cursor). Rows are tuples in SCORE_PAGE_COLUMNS order.
+        next_cursor is None when there are no more rows.
+    """
+    conn = get_connection()
+    
+    params = []
+    if quiz_type:
+        params.append(quiz_type)
+    if after is not None:
+        params.extend(after)
+    params.append(page_size)
+    
+    sql = SCORES_PAGE_SQL[(bool(quiz_type), after is not None)]
+    rows = [tuple(row) for row in conn.execute(sql, params)]
+    
+    next_cursor = None
+    if len(rows) == page_size:
+        last = rows[-1]
+        next_cursor = (last[5], last[6], last[0])  # (percentage, timestamp, id)
+    
+    return rows, next_cursor
+
 def get_player_history(player_name: str, limit: int = 20) -> List[Dict[str, Any]]:
     """
     Get the score history for a specific player.
@@ -82,15 +206,9 @@ def get_player_history(player_name: str, limit: int = 20) -> List[Dict[str, Any]
     conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute('''
-    SELECT * FROM scores
-    WHERE player_name = ?
-    ORDER BY timestamp DESC
-    LIMIT ?
-    ''', (player_name, limit))
+    cursor.execute(PLAYER_HISTORY_SQL, (player_name, limit))
     
     rows = cursor.fetchall()
-    conn.close()
     
     # Convert rows to dictionaries
     return [dict(row) for row in rows]
@@ -99,6 +217,9 @@ def get_score_statistics(quiz_type: Optional[str] = None) -> Dict[str, Any]:
     """
     Get statistics about scores.
     
+    Statistics are read from the score_stats aggregate table, which is kept in
+    sync with the scores table by triggers, so this never scans the scores.
+    
     Args:
         quiz_type: Optional filter by quiz type
         
@@ -115,20 +236,38 @@ def get_score_statistics(quiz_type: Optional[str] = None) -> Dict[str, Any]:
         where_clause = "WHERE quiz_type = ?"
         query_params.append(quiz_type)
     
+    # Aggregating the per-quiz-type rows gives the same result for one type or all
     cursor.execute(f'''
     SELECT 
-        COUNT(*) as total_quizzes,
-        AVG(percentage) as avg_percentage,
-        MAX(percentage) as max_percentage,
-        MIN(percentage) as min_percentage,
-        AVG(score) as avg_score,
-        SUM(score) as total_correct_answers,
-        SUM(total_questions) as total_questions_asked
-    FROM scores
+        COALESCE(SUM(total_quizzes), 0) as total_quizzes,
+        SUM(sum_percentage) / SUM(total_quizzes) as avg_percentage,
+        MAX(max_percentage) as max_percentage,
+        MIN(min_percentage) as min_percentage,
+        CAST(SUM(sum_score) AS REAL) / SUM(total_quizzes) as avg_score,
+        SUM(sum_score) as total_correct_answers,
+        SUM(total_questions_asked) as total_questions_asked
+    FROM score_stats
     {where_clause}
     ''', query_params)
     
     result = dict(cursor.fetchone())
-    conn.close()
     
-    return result 
\ No newline at end of file
+    return result
+
+def rebuild_score_statistics() -> None:
+    """
+    Recompute the score_stats aggregate table from the scores table.
+    
+    Only needed if the aggregates were changed by hand or scores were written
+    with the triggers disabled.
+    """
+    conn = get_connection()
+    
+    try:
+        conn.execute('BEGIN')
+        for statement in REBUILD_SCORE_STATS:
+            conn.execute(statement)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
@@ -3,6 +3,37 @@ User management module for quiz application.
 """
 from typing import List, Dict, Any, Optional
 from .db import get_connection
+from ..debug import log
+
+# Prefix searches. Each one is served by a COLLATE NOCASE index (see
+# migrations.py) and is checked against its query plan by query_plans.py.
+# The pattern must be a literal 'prefix%' for SQLite to turn it into an index range.
+SEARCH_USERS_BY_DISPLAY_NAME_SQL = '''
+SELECT * FROM users
+WHERE display_name LIKE ? ESCAPE '\\'
+ORDER BY display_name COLLATE NOCASE, id
+LIMIT ?
+'''
+
+SEARCH_USERS_BY_USERNAME_SQL = '''
+SELECT * FROM users
+WHERE username LIKE ? ESCAPE '\\'
+ORDER BY username COLLATE NOCASE
+LIMIT ?
+'''
+
+def prefix_pattern(prefix: str) -> str:
+    """
+    Build a LIKE pattern matching strings that start with a prefix.
+
+    Args:
+        prefix: The literal prefix
+
+    Returns:
+        The prefix with LIKE wildcards escaped, followed by '%'
+    """
+    escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"{escaped}%"
 
 def get_all_users() -> List[Dict[str, Any]]:
     """
@@ -18,11 +49,10 @@ def get_all_users() -> List[Dict[str, Any]]:
         cursor.execute('SELECT * FROM users ORDER BY display_name')
         
         rows = cursor.fetchall()
-        conn.close()
         
         # Convert rows to dictionaries
         users = [dict(row) for row in rows]
-        print(f"Retrieved {len(users)} users from database")
+        log("Users", f"Retrieved {len(users)} users from database")
         return users
     except Exception as e:
         print(f"Error getting users: {str(e)}")
@@ -45,7 +75,6 @@ def get_user(user_id: int) -> Optional[Dict[str, Any]]:
     cursor.execute('SELECT * FROM users WHERE id = ?', (user_id,))
     
     row = cursor.fetchone()
-    conn.close()
     
     return dict(row) if row else None
 
@@ -65,7 +94,6 @@ def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
     cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
     
     row = cursor.fetchone()
-    conn.close()
     
     return dict(row) if row else None
 
@@ -80,7 +108,7 @@ def create_user(username: str, display_name: str = None) -> int:
     Returns:
         The ID of the newly created user
     """
-    print(f"Creating user: username='{username}', display_name='{display_name}'")
+    log("Users", f"Creating user: username='{username}', display_name='{display_name}'")
     if display_name is None:
         display_name = username
         
@@ -93,14 +121,12 @@ def create_user(username: str, display_name: str = None) -> int:
             (username, display_name)
         )
         user_id = cursor.lastrowid
-        print(f"User created with ID: {user_id}")
+        log("Users", f"User created with ID: {user_id}")
         conn.commit()
     except Exception as e:
         conn.rollback()
-        print(f"Error creating user in database: {str(e)}")
+        log("Users", f"Error creating user in database: {str(e)}")
         raise e
-    finally:
-        conn.close()
         
     return user_id
 
@@ -128,8 +154,6 @@ def update_user(user_id: int, display_name: str) -> bool:
     except Exception as e:
         conn.rollback()
         success = False
-    finally:
-        conn.close()
         
     return success
 
@@ -157,7 +181,29 @@ def delete_user(user_id: int) -> bool:
     except Exception as e:
         conn.rollback()
         success = False
-    finally:
-        conn.close()
         
-    return success 
\ No newline at end of file
+    return success
+
+def search_users(prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Find users whose display name or username starts with a prefix, ignoring case.
+    
+    Args:
+        prefix: The text the user typed
+        limit: Maximum number of users to return
+        
+    Returns:
+        Up to limit matching users, ordered by display name
+    """
+    conn = get_connection()
+    pattern = prefix_pattern(prefix)
+    
+    matches = {}
+    for sql in (SEARCH_USERS_BY_DISPLAY_NAME_SQL, SEARCH_USERS_BY_USERNAME_SQL):
+        for row in conn.execute(sql, (pattern, limit)):
+            matches[row['id']] = dict(row)
+    
+    users = sorted(
+        matches.values(), key=lambda user: ((user['display_name'] or '').casefold(), user['id'])
+    )
+    return users[:limit]
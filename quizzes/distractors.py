@@ -0,0 +1,381 @@
+"""
+Distractors for multiple-choice questions of file-based quizzes.
+
+Questions without 'options' get their wrong answers from the other answers of
+the same file, picking the ones that look most like the correct answer.
+Similarity is the cosine similarity of IDF-weighted character trigram vectors.
+
+A DistractorIndex holds every distinct answer of a file, the trigrams of each
+answer in CSR form and an inverted index from trigram to answers. A lookup
+sums the weights of shared trigrams over the postings of the answer's own
+trigrams, so it only touches answers that have a trigram in common with it.
+Trigrams found in more than MAX_POSTINGS answers are left out of lookups; they
+are too common to tell answers apart and would make lookups scan most of a
+big file.
+
+Indexes are built when a question file is compiled and kept in a section of
+its question store, so loading one maps its arrays from the store file without
+copying them. Stores compiled without NumPy, and those of files too big to
+index while compiling (see question_store.compile_store()), have no such
+section; their index is built in memory the first time the file is used in
+button mode.
+"""
+import os
+import random
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .mappings import QUESTION_BANK_CACHE_SIZE
+from .question_store import QuestionStore, open_question_store
+from .answer_matching import canonical_form
+from .debug import log
+
+# Length of the character n-grams compared (at most 3, see DistractorIndex.build())
+NGRAM_SIZE = 3
+
+# Answers a trigram may occur in and still be used by lookups
+MAX_POSTINGS = 5000
+
+# Layout of the index in a question store section; bump FORMAT_VERSION whenever it changes
+FORMAT_VERSION = 3
+# Separates the answers in the stored index
+_ANSWER_SEPARATOR = '\x00'
+# Arrays of a stored index, in section order
+_ARRAYS = ('gram_offsets', 'gram_ids', 'weights', 'norms', 'posting_offsets', 'postings')
+
+
+def answer_key(answer) -> str:
+    """Get the form of an answer used to tell answers apart; the one answers are graded in."""
+    return canonical_form(answer)
+
+
+class DistractorIndex:
+    """Finds the answers of a file that are most similar to a given answer."""
+
+    def __init__(self, answers: List[str], gram_offsets: np.ndarray, gram_ids: np.ndarray,
+                 weights: np.ndarray, norms: np.ndarray, posting_offsets: np.ndarray,
+                 postings: np.ndarray, content_hash: str = '', keys: Optional[List[str]] = None):
+        """
+        Initialize an index from its arrays; use build() or from_store() instead.
+
+        Args:
+            answers: The distinct answers
+            gram_offsets: Start of each answer's trigrams in gram_ids (CSR row offsets)
+            gram_ids: Trigram ids of every answer
+            weights: Squared IDF weight of each trigram
+            norms: Length of each answer's weighted trigram vector
+            posting_offsets: Start of each trigram's answers in postings
+            postings: Answer numbers of every trigram
+            content_hash: Hash of the question file the index was built from
+            keys: answer_key() of each answer, computed if not given
+        """
+        self.answers = answers
+        self.gram_offsets = gram_offsets
+        self.gram_ids = gram_ids
+        self.weights = weights
+        self.norms = norms
+        self.posting_offsets = posting_offsets
+        self.postings = postings
+        self.content_hash = content_hash
+        if keys is None:
+            keys = [answer_key(answer) for answer in answers]
+        self.keys = keys
+        self._numbers: Dict[str, int] = {key: number for number, key in enumerate(keys)}
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    @classmethod
+    def build(cls, answers: Iterable, content_hash: str = '') -> 'DistractorIndex':
+        """
+        Build the index of a file's answers.
+
+        Args:
+            answers: Every answer of the file; repeats are indexed once
+            content_hash: Hash of the question file
+
+        Returns:
+            The DistractorIndex
+        """
+        distinct: List[str] = []
+        keys: List[str] = []
+        seen = set()
+        for answer in answers:
+            answer = str(answer)
+            key = answer_key(answer)
+            if not key or key in seen or _ANSWER_SEPARATOR in answer:
+                continue
+            seen.add(key)
+            distinct.append(answer)
+            keys.append(key)
+
+        # Code points of every key, padded with spaces so word edges count, one
+        # separator after each key
+        text = ''.join(f" {key} {_ANSWER_SEPARATOR}" for key in keys)
+        points = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        windows = len(points) - NGRAM_SIZE + 1
+        separator = points == ord(_ANSWER_SEPARATOR)
+
+        # Each n-gram packed into one integer (code points have 21 bits), and
+        # the answer it belongs to; n-grams across a separator are dropped
+        codes = np.zeros(max(windows, 0), dtype=np.int64)
+        crosses = np.zeros(max(windows, 0), dtype=bool)
+        for offset in range(NGRAM_SIZE):
+            codes = (codes << 21) | points[offset:offset + windows]
+            crosses |= separator[offset:offset + windows]
+        answer_numbers = np.cumsum(separator)[:windows] - separator[:windows]
+        codes, answer_numbers = codes[~crosses], answer_numbers[~crosses]
+
+        # Number the distinct n-grams, then keep each n-gram once per answer,
+        # sorted by answer
+        _, gram_numbers = np.unique(codes, return_inverse=True)
+        vocabulary_size = int(gram_numbers.max()) + 1 if len(gram_numbers) else 0
+        pairs = np.unique(answer_numbers * max(vocabulary_size, 1) + gram_numbers)
+        rows = (pairs // max(vocabulary_size, 1)).astype(np.int32)
+        gram_ids = (pairs % max(vocabulary_size, 1)).astype(np.int32)
+        row_lengths = np.bincount(rows, minlength=len(distinct))
+        gram_offsets = np.concatenate(([0], np.cumsum(row_lengths))).astype(np.int64)
+
+        # Smoothed inverse document frequency of each trigram
+        frequencies = np.bincount(gram_ids, minlength=vocabulary_size)
+        idf = np.log((len(distinct) + 1) / (frequencies + 1)) + 1
+        weights = (idf * idf).astype(np.float32)
+        squares = np.bincount(rows, weights=weights[gram_ids], minlength=len(distinct))
+        norms = np.sqrt(squares).astype(np.float32)
+
+        # Inverted index: answers of each trigram, in answer order
+        order = np.argsort(gram_ids, kind='stable')
+        postings = rows[order]
+        posting_offsets = np.concatenate(([0], np.cumsum(frequencies))).astype(np.int64)
+
+        return cls(distinct, gram_offsets, gram_ids, weights, norms, posting_offsets, postings,
+                   content_hash, keys)
+
+    def similar(self, answer, k: int, exclude: Iterable = (),
+                rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Get the answers most similar to an answer, without the answer itself.
+
+        If fewer than k answers share a trigram with it, the rest are picked at
+        random from the other answers.
+
+        Args:
+            answer: The correct answer
+            k: Number of answers to return
+            exclude: Other answers that must not be returned (e.g. accepted alternatives)
+            rng: Random number generator for the random picks, defaults to the random module
+
+        Returns:
+            Up to k answers, most similar first
+        """
+        excluded = {answer_key(answer)}
+        excluded.update(answer_key(other) for other in exclude)
+        excluded_numbers = {self._numbers[key] for key in excluded if key in self._numbers}
+
+        picked = [number for number in self._most_similar(answer, k + len(excluded_numbers))
+                  if number not in excluded_numbers][:k]
+
+        if len(picked) < k and len(self.answers) > len(picked) + len(excluded_numbers):
+            rng = rng or random
+            taken = excluded_numbers.union(picked)
+            # Sample from a few more than needed, so excluded answers can be dropped
+            sample_size = min(len(self.answers), k + len(taken))
+            for number in rng.sample(range(len(self.answers)), sample_size):
+                if len(picked) == k:
+                    break
+                if number not in taken:
+                    picked.append(number)
+                    taken.add(number)
+        return [self.answers[number] for number in picked]
+
+    def _most_similar(self, answer, count: int) -> List[int]:
+        """Get the numbers of the (at most count) answers most similar to an indexed answer."""
+        number = self._numbers.get(answer_key(answer))
+        if number is None or count <= 0:
+            return []
+
+        grams = self.gram_ids[self.gram_offsets[number]:self.gram_offsets[number + 1]]
+        starts = self.posting_offsets[grams]
+        lengths = self.posting_offsets[grams + 1] - starts
+        usable = lengths <= MAX_POSTINGS
+        grams, starts, lengths = grams[usable], starts[usable], lengths[usable]
+        if not len(grams):
+            return []
+
+        # Positions of the postings of every usable trigram, concatenated
+        run_starts = np.cumsum(lengths) - lengths
+        positions = np.arange(lengths.sum()) + np.repeat(starts - run_starts, lengths)
+        candidates = self.postings[positions]
+        shared = np.repeat(self.weights[grams], lengths)
+
+        # Dot products with the candidates, then cosine similarity
+        numbers, inverse = np.unique(candidates, return_inverse=True)
+        dots = np.bincount(inverse, weights=shared)
+        scores = dots / (self.norms[numbers] * self.norms[number])
+        scores[numbers == number] = -1.0
+
+        count = min(count, len(numbers))
+        best = np.argpartition(-scores, count - 1)[:count]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [int(numbers[i]) for i in best if scores[i] > 0]
+
+    def to_section(self) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Serialize the index for a question store section.
+
+        Returns:
+            (data, layout): the arrays, 8-byte aligned and little-endian, then
+            the answers and their keys as UTF-8 text; the layout locates them
+            for from_section()
+        """
+        parts: List[bytes] = []
+        layout: Dict[str, Any] = {'version': FORMAT_VERSION, 'arrays': {}}
+        offset = 0
+        for name in _ARRAYS:
+            array = getattr(self, name)
+            dtype = array.dtype.newbyteorder('<')
+            padding = -offset % 8
+            parts.append(b'\0' * padding)
+            offset += padding
+            layout['arrays'][name] = [offset, dtype.str, len(array)]
+            data = array.astype(dtype, copy=False).tobytes()
+            parts.append(data)
+            offset += len(data)
+
+        for name in ('answers', 'keys'):
+            text = _ANSWER_SEPARATOR.join(getattr(self, name)).encode('utf-8')
+            layout[name] = [offset, len(text)]
+            parts.append(text)
+            offset += len(text)
+        return b''.join(parts), layout
+
+    @classmethod
+    def from_section(cls, data: memoryview, layout: Dict[str, Any],
+                     content_hash: str = '') -> Optional['DistractorIndex']:
+        """
+        Read an index from a question store section; the arrays share its memory.
+
+        Args:
+            data: The section's bytes
+            layout: The section's layout, as written by to_section()
+            content_hash: Hash of the question file of the store
+
+        Returns:
+            The DistractorIndex, or None if the section has another layout version
+        """
+        if layout.get('version') != FORMAT_VERSION:
+            return None
+        arrays = [
+            np.frombuffer(data, dtype=np.dtype(dtype), count=count, offset=offset)
+            for offset, dtype, count in (layout['arrays'][name] for name in _ARRAYS)
+        ]
+        answers, keys = (
+            str(data[start:start + length], 'utf-8').split(_ANSWER_SEPARATOR) if length else []
+            for start, length in (layout['answers'], layout['keys'])
+        )
+        return cls(answers, *arrays, content_hash, keys)
+
+    @classmethod
+    def from_store(cls, store: QuestionStore) -> 'DistractorIndex':
+        """
+        Get the index of a question store from its section, or build it if it has none.
+
+        Args:
+            store: The question store
+
+        Returns:
+            The DistractorIndex
+        """
+        section = store.section('distractors')
+        if section is not None:
+            index = cls.from_section(*section, store.content_hash)
+            if index is not None:
+                return index
+
+        index = cls.build(
+            (store.field(number, 'answer', '') for number in range(len(store))), store.content_hash
+        )
+        log("Distractors", f"Indexed {len(index)} answers of {os.path.basename(store.path)}")
+        return index
+
+
+class DistractorIndexCache:
+    """Shares the distractor indexes of question files through an in-process LRU."""
+
+    def __init__(self, max_size: int = QUESTION_BANK_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size: Number of indexes kept in memory
+        """
+        self.max_size = max(1, max_size)
+        self._indexes: 'OrderedDict[str, DistractorIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, file_path: str, store: Optional[QuestionStore] = None) -> DistractorIndex:
+        """
+        Get the distractor index of a question file.
+
+        Args:
+            file_path: Path to the JSON question file
+            store: The file's question store, if the quiz reads from a particular one
+
+        Returns:
+            The shared DistractorIndex
+
+        Raises:
+            OSError: If the file can't be read or its question store can't be written
+            ValueError: If the file is not a valid question file
+        """
+        path = os.path.abspath(file_path)
+        if store is None:
+            store = open_question_store(path)
+
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is not None and index.content_hash == store.content_hash:
+                self._indexes.move_to_end(path)
+                return index
+
+        index = DistractorIndex.from_store(store)
+
+        with self._lock:
+            self._indexes[path] = index
+            self._indexes.move_to_end(path)
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        Drop an index (or every index) from memory.
+
+        Args:
+            file_path: Path of the question file, or None for all of them
+        """
+        with self._lock:
+            if file_path is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(os.path.abspath(file_path), None)
+
+
+# Create a singleton instance
+distractor_index_cache = DistractorIndexCache()
+
+def load_distractor_index(file_path: str, store: Optional[QuestionStore] = None) -> DistractorIndex:
+    """
+    Get the shared distractor index of a question file.
+
+    Args:
+        file_path: Path to the JSON question file
+        store: The file's question store, if the quiz reads from a particular one
+
+    Returns:
+        The DistractorIndex
+    """
+    return distractor_index_cache.load(file_path, store)
@@ -0,0 +1,187 @@
+"""
+Incremental reading of large JSON arrays.
+
+iter_array_items() yields the items of a JSON array one at a time while reading
+the file in fixed-size chunks, so memory use depends on the size of one item
+rather than on the size of the file. The array can be the whole document or a
+member of the top-level object (e.g. {"users": [...]}). sample_array_items()
+builds on it to pick a fixed number of random items in one pass.
+"""
+import json
+import math
+import random
+import re
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+# Characters read from the file at a time
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _ChunkedReader:
+    """A window over a text stream with just enough JSON scanning for arrays."""
+
+    def __init__(self, stream: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read another chunk, dropping the consumed part of the buffer. False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character without consuming it, '' at EOF."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON but found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off at the end of the buffer
+                if self._fill():
+                    continue
+                raise
+            if end == len(self.buffer) and self._fill():
+                # A number at the very end of the buffer may continue in the next chunk
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array_items(stream: TextIO, key: Optional[str] = None,
+                     members: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Yield the items of a JSON array without loading the whole document.
+
+    Args:
+        stream: Text stream positioned at the start of the document
+        key: If the document is an object, the member holding the array.
+             A document that is itself an array is accepted either way.
+        members: If given, receives the other object members (e.g. metadata).
+                 Those before the array are there once iteration has started,
+                 those after it once the iteration is exhausted.
+
+    Yields:
+        Each item of the array, decoded
+
+    Raises:
+        ValueError: If the document is not an array (or an object with key)
+    """
+    reader = _ChunkedReader(stream)
+    in_object = reader.peek() == "{"
+
+    if in_object:
+        if key is None:
+            raise ValueError("Expected a JSON array")
+        reader.expect("{")
+        # Skip members until the array, decoding (small) values on the way
+        while True:
+            if reader.peek() == "}":
+                raise ValueError(f"JSON object has no {key!r} member")
+            name = reader.value()
+            reader.expect(":")
+            if name == key:
+                break
+            value = reader.value()
+            if members is not None:
+                members[name] = value
+            if reader.peek() == ",":
+                reader.expect(",")
+
+    reader.expect("[")
+    if reader.peek() != "]":
+        while True:
+            yield reader.value()
+            if reader.peek() == "]":
+                break
+            reader.expect(",")
+
+    if in_object and members is not None:
+        reader.expect("]")
+        # Collect the members after the array too
+        while reader.peek() == ",":
+            reader.expect(",")
+            name = reader.value()
+            reader.expect(":")
+            members[name] = reader.value()
+
+
+def sample_array_items(stream: TextIO, k: int, key: Optional[str] = None,
+                       members: Optional[Dict[str, Any]] = None,
+                       rng: Optional[random.Random] = None) -> Tuple[List[Any], int]:
+    """
+    Pick k items of a JSON array uniformly at random in a single pass.
+
+    Uses reservoir sampling, so at most k items are held in memory however
+    long the array is. Algorithm L computes how many items to pass over before
+    the next replacement, so random numbers are only drawn for replacements.
+
+    Args:
+        stream: Text stream positioned at the start of the document
+        k: Number of items to pick
+        key: As for iter_array_items()
+        members: As for iter_array_items()
+        rng: Random number generator, defaults to the random module
+
+    Returns:
+        (items, count): the picked items in array order, and the number of
+        items in the whole array. Fewer than k items are returned only if the
+        array is shorter than k.
+    """
+    rng = rng or random
+    # (position in the array, item) pairs, so array order can be restored
+    reservoir: List[Tuple[int, Any]] = []
+    count = 0
+    if k <= 0:
+        for count, _ in enumerate(iter_array_items(stream, key, members), start=1):
+            pass
+        return [], count
+
+    def uniform() -> float:
+        """A random number in (0, 1), so its logarithm is defined."""
+        value = rng.random()
+        while value == 0.0:
+            value = rng.random()
+        return value
+
+    weight = math.exp(math.log(uniform()) / k)
+    next_position = k + math.floor(math.log(uniform()) / math.log(1 - weight)) + 1
+
+    for count, item in enumerate(iter_array_items(stream, key, members), start=1):
+        if count <= k:
+            reservoir.append((count, item))
+        elif count == next_position:
+            reservoir[rng.randrange(k)] = (count, item)
+            weight *= math.exp(math.log(uniform()) / k)
+            next_position += math.floor(math.log(uniform()) / math.log(1 - weight)) + 1
+
+    reservoir.sort(key=lambda entry: entry[0])
+    return [item for _, item in reservoir], count
@@ -0,0 +1,48 @@
+"""
+Lazy package attributes (PEP 562).
+
+Packages list their public names with the module each one lives in and get a
+module-level __getattr__ and __dir__ from lazy_module_attrs(), so a name's
+module is only imported when the name is first used:
+
+    __getattr__, __dir__ = lazy_module_attrs(globals(), {'TopBar': '.top_bar'})
+"""
+import importlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def lazy_module_attrs(
+    module_globals: Dict[str, Any],
+    attributes: Dict[str, str],
+    fallback: Optional[Callable[[str], Any]] = None
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Create the __getattr__ and __dir__ functions of a package with lazy attributes.
+
+    Args:
+        module_globals: The package's globals(); loaded names are cached there,
+                        so __getattr__ is only called once per name
+        attributes: Public name -> module it lives in, relative to the package
+        fallback: Called with names that are not in attributes; raises
+                  AttributeError for unknown names
+
+    Returns:
+        (__getattr__, __dir__) for the package
+    """
+    package = module_globals['__name__']
+
+    def __getattr__(name: str) -> Any:
+        module_name = attributes.get(name)
+        if module_name is not None:
+            value = getattr(importlib.import_module(module_name, package), name)
+        elif fallback is not None:
+            value = fallback(name)
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(module_globals) | set(attributes))
+
+    return __getattr__, __dir__
@@ -23,11 +23,11 @@ SUBMENU_ITEMS = {
     "Languages": [
         "English Words",
         "Spanish Words",
-        "Advanced Phrasal Verbs"
     ],
     "Settings": [
         "Preferences",
         "Themes",
+        "Users",
     ],
     "Stats": [
         "Progress",
@@ -36,16 +36,56 @@ SUBMENU_ITEMS = {
     ]
 }
 
-# Maps menu item names to quiz class names
+# Maps menu item names to quiz class names.
+# Quizzes found in the quiz data directory are added to both mappings at runtime
+# (see quiz_content.py).
 QUIZ_TYPE_MAP = {
     "Mnożenie 2-5": "MultiplicationQuiz",
     "Dodawanie do 20": "AdditionQuiz",
     "Mnożenie małych liczb": "SmallMultiplicationQuiz",
     "Odejmowanie od 10-20": "SubtractionQuiz",
     "Dzielenie": "DivisionQuiz",
-    "Advanced Phrasal Verbs": "AdvancedPhrasalVerbsQuiz",
-    "Scores": "Scores"  # Special case for the scores page
+    "Scores": "Scores",  # Special case for the scores page
+    "Users": "Users"  # Special case for the roster import/export dialog
 }
 
 # Quiz configuration parameters
-DEFAULT_QUIZ_QUESTIONS = 20  # Default number of questions in a quiz 
\ No newline at end of file
+DEFAULT_QUIZ_QUESTIONS = 20  # Default number of questions in a quiz
+
+# Number of buffered answer attempts that triggers a write before the quiz ends
+ATTEMPT_FLUSH_SIZE = 50
+
+# Whether the main window builds the submenus and scores page in idle time after it is first painted
+PREWARM_SCREENS = True
+
+# Number of quiz widgets kept alive for reuse when a quiz is entered again
+QUIZ_POOL_SIZE = 4
+
+# Number of parsed question files kept in memory for reuse by file-based quizzes
+QUESTION_BANK_CACHE_SIZE = 16
+
+# Question files at least this big are sampled while streaming instead of loaded
+# whole, when a quiz needs fewer questions than the file has
+QUESTION_STREAMING_MIN_BYTES = 8 * 1024 * 1024
+
+# Menu category of question files whose metadata doesn't name one
+DEFAULT_CONTENT_CATEGORY = "Languages"
+
+# Milliseconds to wait after a change in the quiz data directory before rescanning it
+CONTENT_RELOAD_DELAY_MS = 300
+
+# Rosters with at least this many users are searched through the database's
+# COLLATE NOCASE indexes instead of an in-memory prefix index (see user_search.py)
+USER_SEARCH_SQL_MIN_USERS = 10000
+
+# Most typos accepted in a typed answer to a file-based quiz question
+ANSWER_MAX_EDIT_DISTANCE = 1
+
+# Answer length (in characters) per accepted typo; shorter answers must match exactly
+ANSWER_CHARS_PER_EDIT = 5
+
+# Most question files watched for in-place writes; each can take a file descriptor (kqueue)
+CONTENT_WATCH_MAX_FILES = 64
+
+# Milliseconds between rescans of a data directory with more question files than are watched
+CONTENT_POLL_INTERVAL_MS = 2000
@@ -2,10 +2,12 @@
 Menu components for the quiz application.
 """
 from PySide6.QtWidgets import QWidget, QGridLayout, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QStackedWidget
-from PySide6.QtCore import Signal, Qt, QSize
+from PySide6.QtCore import Signal, Qt, QSize, QTimer
 from PySide6.QtGui import QIcon, QFont
 import quizzes.styles as styles
 from quizzes.mappings import MENU_CATEGORIES, SUBMENU_ITEMS, QUIZ_TYPE_MAP
+from quizzes.quiz_content import quiz_content
+from quizzes.debug import log
 
 # Define icons for each category
 CATEGORY_ICONS = {
@@ -60,23 +62,48 @@ class SubMenu(QWidget):
         self.buttons_layout = QGridLayout()
         self.buttons_layout.setSpacing(styles.MENU_LAYOUT_SPACING)
         
-        # Add buttons in a grid (3 columns)
-        for i, item in enumerate(items):
+        # Buttons by item name, laid out in a grid (3 columns)
+        self.buttons = {}
+        for item in items:
+            self.add_item(item)
+        
+        self.main_layout.addLayout(self.buttons_layout)
+        self.main_layout.addStretch(1)  # Add stretch to push content to top
+    
+    def add_item(self, item):
+        """Add a button for an item, or update the existing one.
+        
+        Args:
+            item: The item name (a key of QUIZ_TYPE_MAP if it is implemented)
+        """
+        button = self.buttons.get(item)
+        if button is None:
             button = QPushButton(item)
             button.setMinimumSize(*styles.MENU_BUTTON_SIZE)
-            button.setStyleSheet(styles.MENU_BUTTON_STYLE)
             button.clicked.connect(lambda checked, name=item: self.on_button_click(name))
-            
-            # Style the button differently if it's implemented
-            if item in QUIZ_TYPE_MAP:
-                button.setStyleSheet(styles.MENU_BUTTON_STYLE)
-            else:
-                button.setStyleSheet(styles.MENU_BUTTON_DISABLED_STYLE)
-                
-            self.buttons_layout.addWidget(button, i // 3, i % 3)
+            position = len(self.buttons)
+            self.buttons_layout.addWidget(button, position // 3, position % 3)
+            self.buttons[item] = button
         
-        self.main_layout.addLayout(self.buttons_layout)
-        self.main_layout.addStretch(1)  # Add stretch to push content to top
+        # Style the button differently if it's implemented
+        if item in QUIZ_TYPE_MAP:
+            button.setStyleSheet(styles.MENU_BUTTON_STYLE)
+        else:
+            button.setStyleSheet(styles.MENU_BUTTON_DISABLED_STYLE)
+    
+    def remove_item(self, item):
+        """Remove the button of an item, moving the following buttons up.
+        
+        Args:
+            item: The item name
+        """
+        button = self.buttons.pop(item, None)
+        if button is None:
+            return
+        self.buttons_layout.removeWidget(button)
+        button.deleteLater()
+        for position, remaining in enumerate(self.buttons.values()):
+            self.buttons_layout.addWidget(remaining, position // 3, position % 3)
     
     def on_button_click(self, name):
         """Handle button clicks and emit quiz_selected signal."""
@@ -144,18 +171,68 @@ class MainMenu(QWidget):
         # Add main menu to stacked widget
         self.stacked_widget.addWidget(self.main_menu_widget)
         
-        # Create submenus for each category
+        # Submenus are built the first time their category is opened
         self.submenus = {}
-        for category, items in SUBMENU_ITEMS.items():
-            submenu = SubMenu(category, items)
+        
+        # Quizzes found, changed or removed in the data directory after a submenu was built
+        quiz_content.quiz_added.connect(self.on_content_quiz_added)
+        quiz_content.quiz_updated.connect(self.on_content_quiz_updated)
+        quiz_content.quiz_removed.connect(self.on_content_quiz_removed)
+    
+    def get_submenu(self, category):
+        """Get the submenu for a category, building it on first use.
+        
+        Args:
+            category: The category name (a key of SUBMENU_ITEMS)
+            
+        Returns:
+            The SubMenu widget
+        """
+        submenu = self.submenus.get(category)
+        if submenu is None:
+            log("MainMenu", f"Building submenu {category}")
+            submenu = SubMenu(category, SUBMENU_ITEMS.get(category, []))
             submenu.quiz_selected.connect(self.on_quiz_selected)
             submenu.back_to_main.connect(self.show_main_menu)
             self.submenus[category] = submenu
             self.stacked_widget.addWidget(submenu)
+        return submenu
+    
+    def prewarm_submenus(self):
+        """Build the submenus not opened yet in idle time, one per event loop pass."""
+        pending = [category for category in SUBMENU_ITEMS if category not in self.submenus]
+        
+        def build_next():
+            # Skip categories opened by the user in the meantime
+            while pending and pending[0] in self.submenus:
+                pending.pop(0)
+            if pending:
+                self.get_submenu(pending.pop(0))
+                QTimer.singleShot(0, self, build_next)
+        
+        QTimer.singleShot(0, self, build_next)
+    
+    def on_content_quiz_added(self, entry):
+        """Add a discovered quiz to its submenu, if that is built already."""
+        submenu = self.submenus.get(entry['category'])
+        if submenu is not None:
+            submenu.add_item(entry['title'])
+    
+    def on_content_quiz_updated(self, old_entry, entry):
+        """Move a changed quiz's button if its title or category changed."""
+        if (old_entry['title'], old_entry['category']) != (entry['title'], entry['category']):
+            self.on_content_quiz_removed(old_entry)
+            self.on_content_quiz_added(entry)
+    
+    def on_content_quiz_removed(self, entry):
+        """Remove the button of a quiz whose file was removed."""
+        submenu = self.submenus.get(entry['category'])
+        if submenu is not None:
+            submenu.remove_item(entry['title'])
     
     def show_submenu(self, category):
         """Switch to the submenu for the selected category."""
-        self.stacked_widget.setCurrentWidget(self.submenus[category])
+        self.stacked_widget.setCurrentWidget(self.get_submenu(category))
     
     def show_main_menu(self):
         """Switch back to the main menu."""
@@ -0,0 +1,243 @@
+"""
+Question banks for file-based quizzes.
+
+A question bank is a question file parsed into Python objects. Quizzes read
+their questions from the file's compiled question store (see question_store);
+banks are the fallback when no store can be written, e.g. when the cache
+directory is read-only, so they are only kept in memory. Loaded banks are
+shared through an in-process LRU keyed by the file's path, modification time
+and size, so opening a quiz again (or creating several quizzes from one file)
+costs a stat() call.
+
+Files of QUESTION_STREAMING_MIN_BYTES or more can instead be sampled while
+streaming, holding only the questions a quiz session needs in memory.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .mappings import QUESTION_BANK_CACHE_SIZE, QUESTION_STREAMING_MIN_BYTES
+from .json_stream import iter_array_items, sample_array_items
+from .answer_matching import accepted_forms
+from .debug import log
+
+# Project root directory
+ROOT_DIR = Path(__file__).parent.parent
+# QUIZ_CACHE_DIR puts the question stores and the content manifest elsewhere (e.g. for benchmarks)
+CACHE_DIR = os.environ.get('QUIZ_CACHE_DIR') or os.path.join(ROOT_DIR, '.cache', 'question_banks')
+
+
+class QuestionBank:
+    """The questions and metadata of one question file.
+
+    Banks are shared between quizzes, so neither the question list nor the
+    question dicts may be modified; quizzes copy the list to shuffle it.
+    """
+
+    def __init__(self, path: str, questions: Tuple[Dict[str, Any], ...], metadata: Dict[str, Any],
+                 mtime_ns: int = 0, size: int = 0):
+        """
+        Initialize a question bank.
+
+        Args:
+            path: Absolute path of the source file
+            questions: The question dicts, in file order
+            metadata: The file's 'metadata' object, or an empty dict
+            mtime_ns: Modification time of the source file when it was loaded
+            size: Size of the source file when it was loaded
+        """
+        self.path = path
+        self.questions = questions
+        self.metadata = metadata
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+    @property
+    def input_mode(self) -> Optional[str]:
+        """The input mode requested by the file's metadata, if any."""
+        return self.metadata.get('input_mode')
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+
+def compile_questions(data: Any) -> Tuple[Tuple[Dict[str, Any], ...], Dict[str, Any]]:
+    """
+    Extract the questions and metadata from a parsed question file.
+
+    Files are either a list of questions or an object with a 'questions' list
+    and an optional 'metadata' object. Each question gets an 'accepted_forms'
+    frozenset with the canonical forms of its answers (see answer_matching).
+
+    Args:
+        data: The parsed JSON document
+
+    Returns:
+        (questions, metadata); entries that are not objects are dropped
+
+    Raises:
+        ValueError: If the document has neither form
+    """
+    if isinstance(data, dict) and 'questions' in data:
+        questions, metadata = data['questions'], data.get('metadata') or {}
+    elif isinstance(data, list):
+        questions, metadata = data, {}
+    else:
+        raise ValueError("expected a list of questions or an object with 'questions'")
+
+    if not isinstance(questions, list) or not isinstance(metadata, dict):
+        raise ValueError("'questions' must be a list and 'metadata' an object")
+    questions = tuple(item for item in questions if isinstance(item, dict))
+    for item in questions:
+        item['accepted_forms'] = accepted_forms(item)
+    return questions, metadata
+
+
+class QuestionBankCache:
+    """Shares parsed question files through an in-process LRU."""
+
+    def __init__(self, max_size: int = QUESTION_BANK_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size: Number of banks kept in memory
+        """
+        self.max_size = max(1, max_size)
+        self._banks: 'OrderedDict[str, QuestionBank]' = OrderedDict()
+        # Banks may be loaded from worker threads as well as the GUI thread
+        self._lock = threading.Lock()
+
+    def load(self, file_path: str) -> QuestionBank:
+        """
+        Get the question bank of a file, parsing it only if it is new or changed.
+
+        Args:
+            file_path: Path to the JSON question file
+
+        Returns:
+            The shared QuestionBank
+
+        Raises:
+            OSError: If the file can't be read
+            ValueError: If the file is not a valid question file
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+
+        with self._lock:
+            bank = self._banks.get(path)
+            if bank is not None and (bank.mtime_ns, bank.size) == (stat.st_mtime_ns, stat.st_size):
+                self._banks.move_to_end(path)
+                return bank
+
+        with open(path, 'rb') as f:
+            questions, metadata = compile_questions(json.loads(f.read().decode('utf-8')))
+        bank = QuestionBank(path, questions, metadata, stat.st_mtime_ns, stat.st_size)
+        log("QuestionBank", f"Parsed {os.path.basename(path)}: {len(questions)} questions")
+
+        with self._lock:
+            self._banks[path] = bank
+            self._banks.move_to_end(path)
+            while len(self._banks) > self.max_size:
+                self._banks.popitem(last=False)
+        return bank
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        Drop a bank (or every bank) from memory; the next load checks the file again.
+
+        Args:
+            file_path: Path of the question file, or None for all of them
+        """
+        with self._lock:
+            if file_path is None:
+                self._banks.clear()
+            else:
+                self._banks.pop(os.path.abspath(file_path), None)
+
+
+# Create a singleton instance
+question_bank_cache = QuestionBankCache()
+
+def load_question_bank(file_path: str) -> QuestionBank:
+    """
+    Get the shared question bank of a file.
+
+    Args:
+        file_path: Path to the JSON question file
+
+    Returns:
+        The QuestionBank
+    """
+    return question_bank_cache.load(file_path)
+
+def should_stream(file_path: str) -> bool:
+    """
+    Check whether a question file is big enough to be sampled instead of loaded whole.
+
+    Args:
+        file_path: Path to the JSON question file
+
+    Returns:
+        True if the file is at least QUESTION_STREAMING_MIN_BYTES long
+    """
+    try:
+        return os.path.getsize(file_path) >= QUESTION_STREAMING_MIN_BYTES
+    except OSError:
+        return False
+
+def sample_questions(file_path: str, k: int,
+                     rng=None) -> Tuple[List[Dict[str, Any]], int, Dict[str, Any]]:
+    """
+    Pick k random questions from a question file in one streaming pass.
+
+    Memory use is bounded by k questions, not by the size of the file. Like
+    load_question_bank(), accepts a list of questions or an object with a
+    'questions' list and an optional 'metadata' object.
+
+    Args:
+        file_path: Path to the JSON question file
+        k: Number of questions to pick
+        rng: Random number generator, defaults to the random module
+
+    Returns:
+        (questions, total, metadata): the picked questions in file order, the
+        number of entries in the file and the file's metadata
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If the file is not a valid question file
+    """
+    members: Dict[str, Any] = {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        sample, total = sample_array_items(f, k, key='questions', members=members, rng=rng)
+
+    questions = [item for item in sample if isinstance(item, dict)]
+    metadata = members.get('metadata')
+    log("QuestionBank", f"Sampled {len(questions)} of {total} questions "
+                        f"from {os.path.basename(file_path)}")
+    return questions, total, metadata if isinstance(metadata, dict) else {}
+
+def load_question_metadata(file_path: str) -> Dict[str, Any]:
+    """
+    Get the metadata of a question file without loading a big file whole.
+
+    Args:
+        file_path: Path to the JSON question file
+
+    Returns:
+        The file's 'metadata' object, or an empty dict
+    """
+    if not should_stream(file_path):
+        return load_question_bank(file_path).metadata
+
+    members: Dict[str, Any] = {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        # Starting the iteration reads the members before the question list
+        next(iter_array_items(f, key='questions', members=members), None)
+    metadata = members.get('metadata')
+    return metadata if isinstance(metadata, dict) else {}
@@ -0,0 +1,510 @@
+"""
+Memory-mapped question stores for file-based quizzes.
+
+A question store is a compiled form of a question file that quizzes read in
+place instead of loading it into Python objects. The file holds a fixed-width
+index with one (offset, length) entry per field of every question and a heap
+with the field values as UTF-8 text, followed by optional sections with data
+derived from the whole file (such as the distractor index, see distractors):
+
+    header | heap | index | sections | info
+
+Stores are opened with mmap, so looking up question i reads two index entries
+and decodes just that question's fields; nothing else is loaded. Every quiz
+window of a process shares one mapping per file, and other processes map the
+same pages from the operating system's page cache.
+
+Stores are compiled in one streaming pass over the question file, in memory
+that doesn't grow with the file, so even files too large for
+load_question_bank() never have to be held in memory. The store is the only
+compiled form of a question file.
+"""
+import hashlib
+import io
+import json
+import mmap
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .mappings import QUESTION_BANK_CACHE_SIZE, QUESTION_STREAMING_MIN_BYTES
+from .json_stream import iter_array_items
+from .answer_matching import accepted_forms
+from .question_bank import CACHE_DIR
+from .debug import log
+
+# Question fields kept in a store, in index order; 'accepted_forms' is derived
+# when the store is compiled (see answer_matching.accepted_forms())
+FIELDS = ('question', 'answer', 'options', 'correct_answers', 'accepted_forms')
+_FIELD_NUMBERS = {name: number for number, name in enumerate(FIELDS)}
+
+# Store file layout; bump FORMAT_VERSION whenever it changes.
+# Header: magic, version, field count, question count, source mtime_ns, source size,
+# content hash, heap offset, index offset, info offset, info length
+MAGIC = b'QSTR'
+FORMAT_VERSION = 3
+_HEADER = struct.Struct('<4sHHIQQ16sQQQI')
+_MTIME = struct.Struct('<Q')
+_MTIME_OFFSET = 12
+# Index entry: offset into the heap, length in bytes
+_ENTRY = struct.Struct('<II')
+
+# Length flags of an index entry
+_MISSING = 0xFFFFFFFF   # The question has no such field
+_JSON = 0x80000000      # The value is JSON text rather than a plain string
+
+# Bytes read at a time when hashing a source file, and heap and index bytes
+# buffered before they are written out while compiling
+_HASH_CHUNK_SIZE = 1024 * 1024
+_HEAP_BUFFER_SIZE = 1024 * 1024
+_INDEX_BUFFER_SIZE = 256 * 1024
+
+# Encodes non-string field values
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+class QuestionStore:
+    """A read-only, memory-mapped question store.
+
+    Stores are shared between quizzes and stay valid while they are in use,
+    even after the cache has replaced them with a newer compilation.
+    """
+
+    def __init__(self, store_path: str):
+        """
+        Open a store file.
+
+        Args:
+            store_path: Path of the compiled store
+
+        Raises:
+            OSError: If the file can't be opened
+            ValueError: If the file is not a store of the current format
+        """
+        self.store_path = store_path
+        with open(store_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            header = _HEADER.unpack_from(self._map)
+        except struct.error:
+            raise ValueError(f"{store_path} is not a question store")
+        (magic, version, field_count, self.count, self.mtime_ns, self.size, content_hash,
+         heap_offset, self._index_offset, info_offset, info_length) = header
+        if magic != MAGIC or version != FORMAT_VERSION or field_count != len(FIELDS):
+            raise ValueError(f"{store_path} is not a question store of version {FORMAT_VERSION}")
+
+        self.content_hash = content_hash.hex()
+        self._buffer = memoryview(self._map)
+        self._heap = self._buffer[heap_offset:self._index_offset]
+        info = json.loads(str(self._buffer[info_offset:info_offset + info_length], 'utf-8'))
+        self.path = info['path']
+        self.metadata = info['metadata']
+        # Section name -> [offset, length, layout]
+        self._sections: Dict[str, list] = info.get('sections', {})
+
+    @property
+    def input_mode(self) -> Optional[str]:
+        """The input mode requested by the file's metadata, if any."""
+        return self.metadata.get('input_mode')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def field(self, index: int, name: str, default: Any = None) -> Any:
+        """
+        Get one field of one question, decoding only that field.
+
+        Args:
+            index: Position of the question in the file
+            name: One of FIELDS
+            default: Returned if the question has no such field
+
+        Returns:
+            The field's value
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(f"question {index} out of range")
+        entry = self._index_offset + _ENTRY.size * (index * len(FIELDS) + _FIELD_NUMBERS[name])
+        offset, length = _ENTRY.unpack_from(self._map, entry)
+        if length == _MISSING:
+            return default
+        text = str(self._heap[offset:offset + (length & ~_JSON)], 'utf-8')
+        return json.loads(text) if length & _JSON else text
+
+    def get(self, index: int) -> Dict[str, Any]:
+        """
+        Get one question as a dict, like the entries of a QuestionBank.
+
+        Args:
+            index: Position of the question in the file
+
+        Returns:
+            A new dict with the question's fields
+        """
+        question = {}
+        for name in FIELDS:
+            value = self.field(index, name, _MISSING)
+            if value is not _MISSING:
+                question[name] = value
+        return question
+
+    def section(self, name: str) -> Optional[Tuple[memoryview, Dict[str, Any]]]:
+        """
+        Get an optional section of the store without copying it.
+
+        Args:
+            name: Name of the section
+
+        Returns:
+            (the section's bytes, its layout), or None if the store has no such section
+        """
+        entry = self._sections.get(name)
+        if entry is None:
+            return None
+        offset, length, layout = entry
+        return self._buffer[offset:offset + length], layout
+
+    def select(self, limit: Optional[int] = None, shuffle: bool = True,
+               rng: Optional[random.Random] = None) -> 'StoreSelection':
+        """
+        Pick the questions of a quiz session.
+
+        Args:
+            limit: Number of questions to pick, None for all
+            shuffle: Pick random questions in random order, else the first ones in order
+            rng: Random number generator, defaults to the random module
+
+        Returns:
+            A StoreSelection; only the picked positions are held in memory
+        """
+        count = self.count if limit is None else max(0, min(limit, self.count))
+        return StoreSelection(self, count, shuffle, rng)
+
+
+class StoreSelection(Sequence):
+    """The questions of one quiz session, decoded from the store on access."""
+
+    def __init__(self, store: QuestionStore, count: int, shuffle: bool = True,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize a selection.
+
+        Args:
+            store: The store to read questions from
+            count: Number of questions
+            shuffle: Pick random questions in random order, else the first ones in order
+            rng: Random number generator, defaults to the random module
+        """
+        self.store = store
+        self.count = count
+        self.shuffle = shuffle
+        self._rng = rng or random
+        self.indices: Sequence[int] = range(count)
+        if shuffle:
+            self.reshuffle()
+
+    def reshuffle(self) -> None:
+        """Pick new random questions; all of them in a new order if count is the whole store."""
+        if self.shuffle:
+            self.indices = array('I', self._rng.sample(range(len(self.store)), self.count))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        return self.store.get(self.indices[position])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in self.indices:
+            yield self.store.get(index)
+
+
+class _HashingReader(io.RawIOBase):
+    """A binary reader that hashes everything read through it."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.hash = hashlib.blake2b(digest_size=16)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self.raw.readinto(buffer)
+        if count:
+            self.hash.update(memoryview(buffer)[:count])
+        return count
+
+
+def compile_store(source_path: str, store_path: str, stat: os.stat_result) -> None:
+    """
+    Compile a question file into a store in one streaming pass.
+
+    Like load_question_bank(), accepts a list of questions or an object with a
+    'questions' list and an optional 'metadata' object; entries that are not
+    objects are dropped. The store is written to a temporary file and moved
+    into place, so readers never see a partial store.
+
+    Memory use doesn't grow with the file: the heap is written out as it
+    fills and the index is spooled to a temporary file until the heap is
+    complete. The store's sections need every answer at once, so they are
+    only built for files smaller than QUESTION_STREAMING_MIN_BYTES; the
+    distractor index of a bigger file is built when a quiz first needs it.
+
+    Args:
+        source_path: Absolute path of the question file
+        store_path: Path to write the store to
+        stat: The question file's stat result
+
+    Raises:
+        OSError: If the file can't be read or the store can't be written
+        ValueError: If the file is not a valid question file
+    """
+    temp_path = f"{store_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(os.path.dirname(store_path), exist_ok=True)
+    index = array('I')
+    add_entry = index.append
+    members: Dict[str, Any] = {}
+    answers: Optional[List[Any]] = [] if stat.st_size < QUESTION_STREAMING_MIN_BYTES else None
+    heap = bytearray()
+    heap_length = 0
+    count = 0
+
+    try:
+        with open(source_path, 'rb') as raw, open(temp_path, 'wb') as out, \
+                tempfile.TemporaryFile(dir=os.path.dirname(store_path)) as index_file:
+            hashing = _HashingReader(raw)
+            source = io.TextIOWrapper(io.BufferedReader(hashing), encoding='utf-8')
+            out.write(b'\0' * _HEADER.size)
+
+            for item in iter_array_items(source, key='questions', members=members):
+                if not isinstance(item, dict):
+                    continue
+                item['accepted_forms'] = sorted(accepted_forms(item))
+                if answers is not None:
+                    answers.append(item.get('answer', ''))
+                count += 1
+                for name in FIELDS:
+                    value = item.get(name, _MISSING)
+                    if value is _MISSING:
+                        add_entry(0)
+                        add_entry(_MISSING)
+                        continue
+                    if isinstance(value, str):
+                        data, flags = value.encode('utf-8'), 0
+                    else:
+                        data, flags = _encode_json(value).encode('utf-8'), _JSON
+                    add_entry(heap_length)
+                    add_entry(len(data) | flags)
+                    heap += data
+                    heap_length += len(data)
+                if len(heap) >= _HEAP_BUFFER_SIZE:
+                    if heap_length >= _JSON:
+                        raise ValueError("question file is too large for a question store")
+                    out.write(heap)
+                    heap.clear()
+                if len(index) * index.itemsize >= _INDEX_BUFFER_SIZE:
+                    _write_index(index_file, index)
+            if heap_length >= _JSON:
+                raise ValueError("question file is too large for a question store")
+            out.write(heap)
+            # Finish hashing whatever follows the questions
+            source.read()
+
+            metadata = members.get('metadata') or {}
+            if not isinstance(metadata, dict):
+                raise ValueError("'metadata' must be an object")
+
+            _write_index(index_file, index)
+            heap_end = _HEADER.size + heap_length
+            # Keep the index aligned for readers that map it as an array
+            padding = -heap_end % 8
+            out.write(b'\0' * padding)
+            index_offset = heap_end + padding
+            index_file.seek(0)
+            shutil.copyfileobj(index_file, out)
+            offset = index_offset + count * len(FIELDS) * _ENTRY.size
+
+            sections = {}
+            built = _compile_sections(answers) if answers is not None else {}
+            for name, (data, layout) in built.items():
+                # Sections are aligned for readers that map them as arrays
+                padding = -offset % 8
+                out.write(b'\0' * padding)
+                sections[name] = [offset + padding, len(data), layout]
+                out.write(data)
+                offset += padding + len(data)
+
+            info = {'path': source_path, 'metadata': metadata, 'sections': sections}
+            info = json.dumps(info, ensure_ascii=False).encode('utf-8')
+            info_offset = offset
+            out.write(info)
+
+            out.seek(0)
+            out.write(_HEADER.pack(
+                MAGIC, FORMAT_VERSION, len(FIELDS), count,
+                stat.st_mtime_ns, stat.st_size, hashing.hash.digest(),
+                _HEADER.size, index_offset, info_offset, len(info)
+            ))
+        os.replace(temp_path, store_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def _write_index(index_file, index: array) -> None:
+    """Append buffered index entries to the spooled index, little-endian, and empty the buffer."""
+    if sys.byteorder != 'little':
+        index.byteswap()
+    index_file.write(index.tobytes())
+    del index[:]
+
+def _compile_sections(answers: List[Any]) -> Dict[str, Tuple[bytes, Dict[str, Any]]]:
+    """
+    Build the sections of a store from the answers of its questions.
+
+    Returns:
+        Section name -> (data, layout); without NumPy there are no sections and
+        distractor indexes are built in memory when they are needed
+    """
+    try:
+        from .distractors import DistractorIndex
+    except ImportError:
+        return {}
+    return {'distractors': DistractorIndex.build(answers).to_section()}
+
+def _hash_file(path: str) -> str:
+    """Hash a file's contents the way compile_store() does."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class QuestionStoreCache:
+    """Opens question stores, compiling them when their question file is new or changed."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_size: int = QUESTION_BANK_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            cache_dir: Directory for the store files
+            max_size: Number of stores kept open
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max(1, max_size)
+        self._stores: 'OrderedDict[str, QuestionStore]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, file_path: str) -> QuestionStore:
+        """
+        Get the store of a question file.
+
+        Args:
+            file_path: Path to the JSON question file
+
+        Returns:
+            The shared QuestionStore
+
+        Raises:
+            OSError: If the file can't be read or its store can't be written
+            ValueError: If the file is not a valid question file
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        file_version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            store = self._stores.get(path)
+            if store is not None and (store.mtime_ns, store.size) == file_version:
+                self._stores.move_to_end(path)
+                return store
+
+        store = self._open_or_compile(path, stat)
+
+        with self._lock:
+            self._stores[path] = store
+            self._stores.move_to_end(path)
+            while len(self._stores) > self.max_size:
+                # Quizzes still using an evicted store keep its mapping alive
+                self._stores.popitem(last=False)
+        return store
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        Forget a store (or every store); the next open checks the file again.
+
+        Args:
+            file_path: Path of the question file, or None for all of them
+        """
+        with self._lock:
+            if file_path is None:
+                self._stores.clear()
+            else:
+                self._stores.pop(os.path.abspath(file_path), None)
+
+    def store_path(self, path: str) -> str:
+        """Get the path of the store of a question file."""
+        digest = hashlib.blake2b(path.encode('utf-8'), digest_size=10).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.qstore")
+
+    def _open_or_compile(self, path: str, stat: os.stat_result) -> QuestionStore:
+        """Open the existing store if it is still valid, else compile a new one."""
+        store_path = self.store_path(path)
+        try:
+            store = QuestionStore(store_path)
+        except (OSError, ValueError, KeyError):
+            store = None
+
+        if store is not None and store.path == path:
+            if (store.mtime_ns, store.size) == (stat.st_mtime_ns, stat.st_size):
+                return store
+            if store.size == stat.st_size and store.content_hash == _hash_file(path):
+                # Touched but not changed: the mapped contents are still right
+                log("QuestionStore",
+                    f"Reusing store of {os.path.basename(path)} (unchanged content)")
+                store.mtime_ns = stat.st_mtime_ns
+                self._refresh_mtime(store_path, stat.st_mtime_ns)
+                return store
+
+        compile_store(path, store_path, stat)
+        store = QuestionStore(store_path)
+        log("QuestionStore", f"Compiled store of {os.path.basename(path)}: {len(store)} questions")
+        return store
+
+    def _refresh_mtime(self, store_path: str, mtime_ns: int) -> None:
+        """Record a new source mtime in a store's header; failing only costs a rehash next time."""
+        try:
+            with open(store_path, 'r+b') as f:
+                f.seek(_MTIME_OFFSET)
+                f.write(_MTIME.pack(mtime_ns))
+        except OSError as e:
+            log("QuestionStore", f"Could not update store {store_path}: {e}")
+
+
+# Create a singleton instance
+question_store_cache = QuestionStoreCache()
+
+def open_question_store(file_path: str) -> QuestionStore:
+    """
+    Get the shared question store of a file.
+
+    Args:
+        file_path: Path to the JSON question file
+
+    Returns:
+        The QuestionStore
+    """
+    return question_store_cache.open(file_path)
@@ -1,26 +1,34 @@
 """
 Quiz container for displaying active quizzes.
 """
+from collections import OrderedDict
+
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import Signal
 from .components import BaseComponent
 from .styles import QUIZ_CONTAINER_BORDER_STYLE
+from .mappings import QUIZ_POOL_SIZE
+from .quiz_manager import quiz_manager
+from .debug import log
 
 class QuizContainer(BaseComponent):
     """Container for displaying the current quiz.
     
     This container manages the currently active quiz and handles
-    cleanup when switching between quizzes.
+    cleanup when switching between quizzes. Quizzes obtained through
+    get_quiz() are kept in a small LRU pool and restarted on re-entry
+    instead of being rebuilt.
     """
     
     # Signal to notify when user wants to return to menu
     return_to_menu = Signal()
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, pool_size=QUIZ_POOL_SIZE):
         """Initialize the quiz container.
         
         Args:
             parent: Parent widget
+            pool_size: Maximum number of quiz widgets kept for reuse
         """
         super().__init__(
             parent=parent,
@@ -36,6 +44,38 @@ class QuizContainer(BaseComponent):
         
         # Quiz state
         self.current_quiz = None
+        
+        # Pooled quizzes by (quiz class, options), least recently used first.
+        # Pooled quizzes stay in the layout and are hidden while not current.
+        self.pool_size = max(1, pool_size)
+        self._pool = OrderedDict()
+    
+    def get_quiz(self, name, **options):
+        """Get a quiz ready to start, reusing a pooled one if possible.
+        
+        Args:
+            name: The name of the quiz as registered with the quiz manager
+            **options: Arguments for the quiz constructor
+            
+        Returns:
+            A quiz instance at its first question, or None if the quiz is not found
+        """
+        quiz_class = quiz_manager.get_quiz_class(name)
+        if quiz_class is None:
+            return None
+        
+        key = (quiz_class, tuple(sorted(options.items())))
+        quiz = self._pool.get(key)
+        if quiz is not None:
+            log("QuizContainer", f"Reusing pooled {name}")
+            self._pool.move_to_end(key)
+            quiz.restart_quiz()
+            return quiz
+        
+        quiz = quiz_class(**options)
+        self._pool[key] = quiz
+        self._evict()
+        return quiz
     
     def set_quiz(self, quiz):
         """Set the current quiz and display it.
@@ -43,24 +83,63 @@ class QuizContainer(BaseComponent):
         Args:
             quiz: The quiz instance to display
         """
+        if quiz is self.current_quiz:
+            quiz.show()
+            return
+        
         # Clean up previous quiz
         self._clear_current_quiz()
         
         # Add new quiz
-        self.quiz_layout.addWidget(quiz)
+        if self.quiz_layout.indexOf(quiz) < 0:
+            self.quiz_layout.addWidget(quiz)
+        quiz.show()
         self.current_quiz = quiz
         
         # No need to call anything here - the quiz is already initialized
         # and next_question was already called during its initialization
     
+    def _is_pooled(self, quiz):
+        """Whether a quiz is kept in the pool."""
+        return any(pooled is quiz for pooled in self._pool.values())
+    
+    def _evict(self):
+        """Delete the least recently used quizzes beyond the pool size."""
+        while len(self._pool) > self.pool_size:
+            key, quiz = next(iter(self._pool.items()))
+            if quiz is self.current_quiz:
+                # Never evict the quiz on screen; it becomes most recent instead
+                self._pool.move_to_end(key)
+                continue
+            del self._pool[key]
+            log("QuizContainer", f"Evicting pooled {quiz.__class__.__name__}")
+            quiz.flush_attempts()
+            self.quiz_layout.removeWidget(quiz)
+            quiz.hide()
+            quiz.deleteLater()
+    
+    def flush_attempts(self):
+        """Hand the buffered answer attempts of the current and pooled quizzes to the writer."""
+        quizzes = list(self._pool.values())
+        if self.current_quiz is not None and not self._is_pooled(self.current_quiz):
+            quizzes.append(self.current_quiz)
+        for quiz in quizzes:
+            quiz.flush_attempts()
+    
     def _clear_current_quiz(self):
-        """Clear the current quiz from the container."""
+        """Clear the current quiz from the container.
+        
+        Pooled quizzes are only hidden; other quizzes are detached.
+        """
         if self.current_quiz:
-            self.current_quiz.setParent(None)
+            if self._is_pooled(self.current_quiz):
+                self.current_quiz.hide()
+            else:
+                self.current_quiz.setParent(None)
             self.current_quiz = None
         else:
             # Remove any widgets from the layout
             for i in reversed(range(self.quiz_layout.count())): 
                 widget = self.quiz_layout.itemAt(i).widget()
-                if widget:
-                    widget.setParent(None) 
\ No newline at end of file
+                if widget and not self._is_pooled(widget):
+                    widget.setParent(None)
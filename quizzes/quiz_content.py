@@ -0,0 +1,443 @@
+"""
+Discovery of file-based quizzes in the quiz data directory.
+
+Every JSON question file in the data directory is a quiz. The directory is
+scanned on a background thread at startup. What is known about each file
+(title, menu category, number of questions, input mode) is kept in a manifest
+in the cache directory, keyed by the file's modification time and size, so a
+scan only opens files that are new or changed.
+
+Discovered quizzes are registered with the quiz manager as lazy classes that
+read their file when the quiz is first started, and added to the menus. Once
+watch() is called, files that are added, changed or removed while the app runs
+are picked up by rescanning: only those files are read again, and the menus
+are updated in place. A file that can't be read (e.g. one saved halfway) keeps
+its quiz on the question store of its last good version. A file can choose its
+menu entry through its metadata:
+
+    {"metadata": {"title": "...", "category": "Languages", "input_mode": "input"},
+     "questions": [...]}
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from .mappings import (
+    MENU_CATEGORIES, SUBMENU_ITEMS, QUIZ_TYPE_MAP, DEFAULT_CONTENT_CATEGORY,
+    CONTENT_RELOAD_DELAY_MS, CONTENT_WATCH_MAX_FILES, CONTENT_POLL_INTERVAL_MS
+)
+from .question_bank import ROOT_DIR, CACHE_DIR, load_question_bank, question_bank_cache
+from .question_store import QuestionStore, open_question_store, question_store_cache
+from .debug import log
+
+# QUIZ_DATA_DIR scans another directory (e.g. for benchmarks)
+QUIZ_DATA_DIR = os.environ.get('QUIZ_DATA_DIR') or os.path.join(ROOT_DIR, 'quizz_data')
+MANIFEST_PATH = os.path.join(CACHE_DIR, 'manifest.json')
+# Bump MANIFEST_VERSION whenever the entries change shape
+MANIFEST_VERSION = 1
+
+# Extension of question files
+QUIZ_FILE_EXTENSION = '.json'
+
+
+def title_for_file(file_name: str) -> str:
+    """Get the default menu title of a question file, e.g. 'Math Quiz' for math_quiz.json."""
+    stem = os.path.splitext(file_name)[0]
+    return ' '.join(part.capitalize() for part in stem.split('_') if part)
+
+def class_name_for_file(file_name: str) -> str:
+    """Get the quiz class name of a question file, e.g. 'MathQuizQuiz' for math_quiz.json."""
+    stem = os.path.splitext(file_name)[0]
+    return ''.join(part.capitalize() for part in stem.split('_')) + 'Quiz'
+
+def index_quiz_file(path: str, stat: os.stat_result) -> Dict[str, Any]:
+    """
+    Describe one question file for the manifest.
+
+    Opening the file's question store compiles it if needed, so the first quiz
+    session doesn't have to.
+
+    Args:
+        path: Absolute path of the question file
+        stat: The file's stat result
+
+    Returns:
+        A manifest entry; files that can't be read get an 'error' instead of a title
+    """
+    file_name = os.path.basename(path)
+    entry = {'file': file_name, 'path': path, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    try:
+        try:
+            store = open_question_store(path)
+            count, metadata = len(store), store.metadata
+        except OSError:
+            # No writable cache directory; fall back to parsing the file
+            bank = load_question_bank(path)
+            count, metadata = len(bank), bank.metadata
+    except (OSError, ValueError) as e:
+        log("QuizContent", f"Skipping {file_name}: {e}")
+        entry['error'] = str(e)
+        return entry
+
+    title = metadata.get('title')
+    category = metadata.get('category')
+    input_mode = metadata.get('input_mode')
+    entry.update({
+        'title': title if isinstance(title, str) and title.strip() else title_for_file(file_name),
+        'category': category if category in MENU_CATEGORIES else DEFAULT_CONTENT_CATEGORY,
+        'class_name': class_name_for_file(file_name),
+        'count': count,
+        'input_mode': input_mode if isinstance(input_mode, str) else None,
+    })
+    return entry
+
+def invalidate_caches(path: str) -> None:
+    """Drop a question file from the in-memory bank and store caches."""
+    question_bank_cache.invalidate(path)
+    question_store_cache.invalidate(path)
+
+def load_manifest(manifest_path: str, data_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the manifest of a data directory.
+
+    Returns:
+        Entries by file name; empty if there is no usable manifest
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION and manifest.get('data_dir') == data_dir:
+            return manifest['files']
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+    return {}
+
+def save_manifest(manifest_path: str, data_dir: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """Write the manifest atomically; a read-only cache directory only costs speed."""
+    temp_path = f"{manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'data_dir': data_dir, 'files': entries},
+                      f, ensure_ascii=False)
+        os.replace(temp_path, manifest_path)
+    except OSError as e:
+        log("QuizContent", f"Could not write manifest {manifest_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+def scan_quiz_files(data_dir: str = QUIZ_DATA_DIR,
+                    manifest_path: str = MANIFEST_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    Scan a data directory for question files, indexing only new or changed ones.
+
+    Args:
+        data_dir: Directory with the question files
+        manifest_path: Path of the manifest of earlier scans
+
+    Returns:
+        Manifest entries by file name, in file name order
+    """
+    data_dir = os.path.abspath(data_dir)
+    known = load_manifest(manifest_path, data_dir)
+    entries: Dict[str, Dict[str, Any]] = {}
+    indexed = 0
+
+    try:
+        dir_entries = sorted(os.scandir(data_dir), key=lambda dir_entry: dir_entry.name)
+    except OSError as e:
+        log("QuizContent", f"Could not scan {data_dir}: {e}")
+        return entries
+
+    for dir_entry in dir_entries:
+        if not dir_entry.name.endswith(QUIZ_FILE_EXTENSION) or not dir_entry.is_file():
+            continue
+        stat = dir_entry.stat()
+        entry = known.get(dir_entry.name)
+        if entry is None or (entry['mtime_ns'], entry['size']) != (stat.st_mtime_ns, stat.st_size):
+            if entry is not None:
+                # Don't let the in-memory caches hand out the old contents
+                invalidate_caches(dir_entry.path)
+            entry = index_quiz_file(dir_entry.path, stat)
+            indexed += 1
+        entries[dir_entry.name] = entry
+
+    if indexed or entries.keys() != known.keys():
+        save_manifest(manifest_path, data_dir, entries)
+    log("QuizContent", f"Found {len(entries)} question files in {data_dir} ({indexed} indexed)")
+    return entries
+
+
+class QuizContent(QObject):
+    """The file-based quizzes of the data directory.
+
+    Quizzes are registered with the quiz manager and the menu mappings on the
+    GUI thread as scans complete; each change is announced through a signal so
+    menus can update incrementally. Quiz sessions that are running when their
+    file changes keep the questions they started with.
+    """
+
+    # Emitted with the manifest entry of each quiz found by a scan
+    quiz_added = Signal(dict)
+    # Emitted with the old and the new manifest entry of each quiz whose file changed
+    quiz_updated = Signal(dict, dict)
+    # Emitted with the manifest entry of each quiz whose file was removed
+    quiz_removed = Signal(dict)
+    # Carries scan results (or None if the scan failed) from the scanning thread to the GUI thread
+    _scanned = Signal(object)
+
+    def __init__(self, data_dir: str = QUIZ_DATA_DIR, manifest_path: str = MANIFEST_PATH,
+                 parent=None):
+        """
+        Initialize the quiz content. Nothing is scanned until start() or scan().
+
+        Args:
+            data_dir: Directory with the question files
+            manifest_path: Path of the manifest
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.data_dir = os.path.abspath(data_dir)
+        self.manifest_path = manifest_path
+        # Registered quizzes: file name -> manifest entry
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # Paths of every question file of the last scan, including unreadable ones,
+        # most recently modified first
+        self._files: List[str] = []
+        self._scanned.connect(self._apply_scan)
+
+        # At most one background scan at a time; changes during a scan trigger another
+        self._scanning = False
+        self._rescan_pending = False
+        # Created by watch()
+        self._watcher: Optional[QFileSystemWatcher] = None
+        self._rescan_timer: Optional[QTimer] = None
+        self._poll_timer: Optional[QTimer] = None
+
+    def start(self) -> Optional[threading.Thread]:
+        """
+        Scan the data directory on a background thread.
+
+        The quizzes are registered on the GUI thread once the scan is done. If
+        a scan is running already, another one follows when it is done.
+
+        Returns:
+            The started thread, or None if a scan was running
+        """
+        if self._scanning:
+            self._rescan_pending = True
+            return None
+        self._scanning = True
+        thread = threading.Thread(
+            target=self._scan_in_background, name="QuizContentScan", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def scan(self) -> None:
+        """Scan the data directory and register its quizzes right away."""
+        self._apply_entries(scan_quiz_files(self.data_dir, self.manifest_path))
+
+    def watch(self) -> None:
+        """Rescan the data directory shortly after any of its question files changes."""
+        if self._watcher is not None:
+            return
+
+        # Editors often write a file in several steps; rescan once they are done
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(CONTENT_RELOAD_DELAY_MS)
+        self._rescan_timer.timeout.connect(self.start)
+        # Picks up in-place writes to the files that are not watched, see _watch_files()
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(CONTENT_POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.start)
+
+        self._watcher = QFileSystemWatcher(self)
+        # Files added, removed or renamed
+        self._watcher.directoryChanged.connect(self._on_content_changed)
+        # Files written in place
+        self._watcher.fileChanged.connect(self._on_content_changed)
+        self._watcher.addPath(self.data_dir)
+        self._watch_files()
+        log("QuizContent", f"Watching {self.data_dir}")
+
+    def get_entries(self) -> List[Dict[str, Any]]:
+        """
+        Get the registered quizzes.
+
+        Returns:
+            Their manifest entries, in file name order
+        """
+        entries = sorted(self._entries.values(), key=lambda entry: entry['file'])
+        return [dict(entry) for entry in entries]
+
+    def register_quizzes(self, manager) -> None:
+        """
+        Register every quiz found so far with a quiz manager.
+
+        Args:
+            manager: The QuizManager
+        """
+        for entry in self._entries.values():
+            self._register_class(manager, entry)
+
+    def _on_content_changed(self, path: str) -> None:
+        """(Re)start the delay before the next rescan."""
+        self._rescan_timer.start()
+
+    def _watch_files(self) -> None:
+        """
+        Watch the most recently modified question files of the last scan.
+
+        Files written in place only notify a watch on the file itself, not the
+        one on the directory. Each watched file can take a file descriptor, so
+        at most CONTENT_WATCH_MAX_FILES are watched (replaced files have to be
+        watched again). If there are more, the directory is also rescanned
+        every CONTENT_POLL_INTERVAL_MS; a rescan only stats unchanged files.
+        """
+        wanted = set(self._files[:CONTENT_WATCH_MAX_FILES])
+        watched = set(self._watcher.files())
+        if watched - wanted:
+            self._watcher.removePaths(sorted(watched - wanted))
+        if wanted - watched:
+            self._watcher.addPaths(sorted(wanted - watched))
+
+        if len(self._files) > CONTENT_WATCH_MAX_FILES:
+            if not self._poll_timer.isActive():
+                self._poll_timer.start()
+        else:
+            self._poll_timer.stop()
+
+    def _scan_in_background(self) -> None:
+        """Scan on the worker thread and hand the result to the GUI thread."""
+        try:
+            entries = scan_quiz_files(self.data_dir, self.manifest_path)
+        except Exception as e:
+            log("QuizContent", f"Scanning {self.data_dir} failed: {e}")
+            entries = None
+        self._scanned.emit(entries)
+
+    def _apply_scan(self, entries: Optional[Dict[str, Dict[str, Any]]]) -> None:
+        """Apply a background scan, then start the next one if files changed meanwhile."""
+        self._scanning = False
+        if entries is not None:
+            self._apply_entries(entries)
+        if self._rescan_pending:
+            self._rescan_pending = False
+            self.start()
+
+    def _apply_entries(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Register, update and remove quizzes to match a scan."""
+        by_mtime = sorted(entries.values(), key=lambda entry: entry['mtime_ns'], reverse=True)
+        self._files = [entry['path'] for entry in by_mtime]
+        if self._watcher is not None:
+            self._watch_files()
+
+        for file_name in [file_name for file_name in self._entries if file_name not in entries]:
+            entry = self._entries.pop(file_name)
+            invalidate_caches(entry['path'])
+            self._remove_menu_item(entry)
+            log("QuizContent", f"Removed {file_name}")
+            self.quiz_removed.emit(dict(entry))
+
+        for file_name, entry in entries.items():
+            old_entry = self._entries.get(file_name)
+            if 'error' in entry:
+                # Probably saved halfway; the quiz keeps reading the store of the
+                # version it is registered with (see _open_store()) until the file is fixed
+                continue
+            if old_entry is None:
+                if self._add_menu_item(entry):
+                    self._entries[file_name] = entry
+                    self.quiz_added.emit(dict(entry))
+            elif (old_entry['mtime_ns'], old_entry['size']) != (entry['mtime_ns'], entry['size']):
+                if self._update_menu_item(old_entry, entry):
+                    self._entries[file_name] = entry
+                    log("QuizContent", f"Reloaded {file_name}")
+                    self.quiz_updated.emit(dict(old_entry), dict(entry))
+                else:
+                    del self._entries[file_name]
+                    self.quiz_removed.emit(dict(old_entry))
+
+    def _add_menu_item(self, entry: Dict[str, Any]) -> bool:
+        """Add a quiz to the mappings and the quiz manager. False if its title is taken."""
+        from .quiz_manager import quiz_manager
+
+        title = entry['title']
+        if QUIZ_TYPE_MAP.get(title, entry['class_name']) != entry['class_name']:
+            log("QuizContent", f"Skipping {entry['file']}: menu item {title!r} already exists")
+            return False
+
+        QUIZ_TYPE_MAP[title] = entry['class_name']
+        items = SUBMENU_ITEMS.setdefault(entry['category'], [])
+        if title not in items:
+            items.append(title)
+        self._register_class(quiz_manager, entry)
+        return True
+
+    def _update_menu_item(self, old_entry: Dict[str, Any], entry: Dict[str, Any]) -> bool:
+        """Point a quiz at the new version of its file. False if its new title is taken."""
+        if (old_entry['title'], old_entry['category']) == (entry['title'], entry['category']):
+            from .quiz_manager import quiz_manager
+            # A new class, so pooled quizzes with the old questions are not reused
+            self._register_class(quiz_manager, entry)
+            return True
+
+        self._remove_menu_item(old_entry)
+        return self._add_menu_item(entry)
+
+    def _remove_menu_item(self, entry: Dict[str, Any]) -> None:
+        """Remove a quiz from the mappings and the quiz manager."""
+        from .quiz_manager import quiz_manager
+
+        if QUIZ_TYPE_MAP.get(entry['title']) == entry['class_name']:
+            del QUIZ_TYPE_MAP[entry['title']]
+            items = SUBMENU_ITEMS.get(entry['category'], [])
+            if entry['title'] in items:
+                items.remove(entry['title'])
+        quiz_manager.unregister_quiz(entry['class_name'])
+
+    def _register_class(self, manager, entry: Dict[str, Any]) -> None:
+        """
+        Register the lazy quiz class of a manifest entry; its file is read on first use.
+
+        The class holds on to the question store it was built with, so its quizzes
+        keep their questions while a newer version of the file can't be read.
+        """
+        def load_class(path=entry['path'], title=entry['title'], input_mode=entry['input_mode']):
+            from .types import create_quiz_from_file
+            store = self._open_store(path)
+            return create_quiz_from_file(path, title, input_mode=input_mode, store=store)
+
+        manager.register_lazy_quiz(entry['class_name'], load_class)
+
+    @staticmethod
+    def _open_store(path: str) -> Optional[QuestionStore]:
+        """
+        Open the question store of a registered quiz's file.
+
+        Returns:
+            The store of the file's current contents; while those can't be read,
+            the last store compiled from the file, which is the version the quiz
+            was registered with. None if there is no store (e.g. the cache
+            directory is read-only) and the quiz has to read the file itself.
+        """
+        try:
+            return open_question_store(path)
+        except (OSError, ValueError) as e:
+            log("QuizContent", f"Can't read {os.path.basename(path)}, using its last store: {e}")
+        try:
+            store = QuestionStore(question_store_cache.store_path(path))
+        except (OSError, ValueError, KeyError):
+            return None
+        return store if store.path == path else None
+
+
+# Create a singleton instance
+quiz_content = QuizContent()
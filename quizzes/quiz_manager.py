@@ -5,6 +5,7 @@ This module provides a central manager for creating, registering, and retrieving
 quiz classes in the application.
 """
 from .mappings import QUIZ_TYPE_MAP
+from .debug import log
 
 class QuizManager:
     """Manager for quiz classes that provides centralized access to quiz types."""
@@ -12,6 +13,8 @@ class QuizManager:
     def __init__(self):
         """Initialize the quiz manager."""
         self._quiz_registry = {}
+        # Quizzes whose classes are built on first request: name -> loader
+        self._quiz_loaders = {}
         self._loaded = False
     
     def register_quiz(self, name, quiz_class):
@@ -25,8 +28,28 @@ class QuizManager:
             The registered quiz class (for chaining)
         """
         self._quiz_registry[name] = quiz_class
+        self._quiz_loaders.pop(name, None)
         return quiz_class
     
+    def register_lazy_quiz(self, name, loader):
+        """Register a quiz whose class is only imported or built when first requested.
+        
+        Args:
+            name: The name of the quiz (should match entry in QUIZ_TYPE_MAP)
+            loader: Callable without arguments returning the quiz class
+        """
+        self._quiz_registry.pop(name, None)
+        self._quiz_loaders[name] = loader
+    
+    def unregister_quiz(self, name):
+        """Remove a quiz, whether its class was built already or not.
+        
+        Args:
+            name: The name of the quiz
+        """
+        self._quiz_registry.pop(name, None)
+        self._quiz_loaders.pop(name, None)
+    
     def get_quiz_class(self, name):
         """Get a quiz class by name.
         
@@ -34,11 +57,22 @@ class QuizManager:
             name: The name of the quiz
             
         Returns:
-            The quiz class or None if not found
+            The quiz class or None if not found or its loader failed
         """
         if not self._loaded:
             self._load_quizzes()
         
+        loader = self._quiz_loaders.get(name)
+        if loader is not None:
+            try:
+                quiz_class = loader()
+            except Exception as e:
+                # Keep the loader so the quiz can be tried again (e.g. once its file is fixed)
+                log("QuizManager", f"Could not load quiz {name}: {str(e)}")
+                return None
+            self._quiz_registry[name] = quiz_class
+            self._quiz_loaders.pop(name, None)
+        
         return self._quiz_registry.get(name)
     
     def create_quiz(self, name, **kwargs):
@@ -79,7 +113,7 @@ class QuizManager:
         if not self._loaded:
             self._load_quizzes()
             
-        return list(self._quiz_registry.keys())
+        return list(self._quiz_registry.keys()) + list(self._quiz_loaders.keys())
     
     def reset(self):
         """Reset the quiz manager, clearing all registered quizzes.
@@ -87,37 +121,34 @@ class QuizManager:
         This is useful for reloading quizzes after changes to quiz files.
         """
         self._quiz_registry = {}
+        self._quiz_loaders = {}
         self._loaded = False
     
     def _load_quizzes(self):
-        """Load all quiz classes defined in the types package.
+        """Register all quiz classes defined in the types package and the file-based quizzes.
         
-        This lazy loads the quiz classes when first needed.
+        Only the names are registered here; the quiz modules are imported (and
+        question files read) when the first quiz is actually requested.
         """
-        # Import quiz types
-        from .types import (
-            AdditionQuiz,
-            MultiplicationQuiz,
-            SmallMultiplicationQuiz,
-            SubtractionQuiz,
-            DivisionQuiz,
-            create_quiz_from_file
-        )
+        # The types package imports its modules on first attribute access
+        from . import types
         
         # Register by class name (as defined in QUIZ_TYPE_MAP)
-        self.register_quiz("AdditionQuiz", AdditionQuiz)
-        self.register_quiz("MultiplicationQuiz", MultiplicationQuiz)
-        self.register_quiz("SmallMultiplicationQuiz", SmallMultiplicationQuiz)
-        self.register_quiz("SubtractionQuiz", SubtractionQuiz)
-        self.register_quiz("DivisionQuiz", DivisionQuiz)
+        for class_name in (
+            "AdditionQuiz",
+            "MultiplicationQuiz",
+            "SmallMultiplicationQuiz",
+            "SubtractionQuiz",
+            "DivisionQuiz"
+        ):
+            self.register_lazy_quiz(
+                class_name, lambda class_name=class_name: getattr(types, class_name)
+            )
         
-        # Advanced phrasal verbs quiz with input field mode
-        self.register_quiz("AdvancedPhrasalVerbsQuiz", create_quiz_from_file(
-            "quizz_data/advanced_phrasal_verbs.json", 
-            "Advanced Phrasal Verbs",
-            input_mode=True  # Use input field mode for this quiz
-        ))
-    
+        # File-based quizzes found in the quiz data directory so far; later
+        # scans register theirs as they complete
+        from .quiz_content import quiz_content
+        quiz_content.register_quizzes(self)
         
         self._loaded = True
 
@@ -0,0 +1,218 @@
+"""
+Write-behind persistence for quiz scores and answer attempts.
+
+Scores and attempts are queued in memory and written to the database by a worker
+thread, so answering or finishing a quiz never waits on the disk or on another
+kiosk holding the lock.
+"""
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Dict, List
+
+from PySide6.QtCore import QObject, Signal
+
+from .database.scores import save_scores
+from .database.attempts import save_attempts
+from .debug import log
+
+# Maximum number of items (scores or attempt batches) waiting to be written
+SCORE_QUEUE_SIZE = 256
+
+# Maximum number of queued items written in one worker pass
+SCORE_BATCH_SIZE = 64
+
+# Seconds shutdown() waits for the queue to drain
+SHUTDOWN_TIMEOUT = 5.0
+
+# Queue marker telling the worker to exit once everything before it is written
+_STOP = object()
+
+# Kinds of queued items
+_SCORE = "score"
+_ATTEMPTS = "attempts"
+
+
+class ScoreWriter(QObject):
+    """Queues scores and attempts and writes them to the database on a background thread.
+
+    The worker drains the queue in batches and writes the scores and the attempts
+    of each batch in one transaction each. Records that cannot be queued or
+    written are reported through the failure signals instead of being dropped.
+    """
+
+    # Emitted with the score records that could not be saved and the error message
+    save_failed = Signal(list, str)
+    # Emitted with the attempt records that could not be saved and the error message
+    attempts_failed = Signal(list, str)
+
+    def __init__(self, parent=None):
+        """Initialize the score writer.
+
+        Args:
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self._queue = queue.Queue(maxsize=SCORE_QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, quiz_type: str, score: int, total_questions: int,
+               player_name: str = "Anonymous") -> bool:
+        """Queue a score to be saved.
+
+        Args:
+            quiz_type: The type of quiz (e.g., 'MultiplicationQuiz')
+            score: The score achieved (number of correct answers)
+            total_questions: The total number of questions in the quiz
+            player_name: The name of the player
+
+        Returns:
+            True if the score was queued, False if it was reported as failed
+        """
+        record = {
+            "quiz_type": quiz_type,
+            "score": score,
+            "total_questions": total_questions,
+            "player_name": player_name
+        }
+        if not self._put((_SCORE, record)):
+            log("ScoreWriter", "Score queue is full, reporting score as unsaved")
+            self.save_failed.emit([record], "The score queue is full")
+            return False
+
+        return True
+
+    def submit_attempts(self, attempts: List[Dict[str, Any]]) -> bool:
+        """Queue a batch of answer attempts to be saved.
+
+        Args:
+            attempts: Attempt records as accepted by database.attempts.save_attempts
+
+        Returns:
+            True if the attempts were queued, False if they were reported as failed
+        """
+        if not attempts:
+            return True
+
+        attempts = list(attempts)
+        if not self._put((_ATTEMPTS, attempts)):
+            log("ScoreWriter", "Score queue is full, reporting attempts as unsaved")
+            self.attempts_failed.emit(attempts, "The score queue is full")
+            return False
+
+        return True
+
+    def _put(self, item) -> bool:
+        """Put an item on the queue without waiting; submitting happens on the GUI thread."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        return True
+
+    def flush(self) -> None:
+        """Block until every queued item has been written or reported."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Write all queued items and stop the worker thread.
+
+        The worker's database connection is closed by the worker itself when it
+        exits, so a worker still writing after the timeout is not cut off.
+        Submits made meanwhile wait for the worker to stop and then start a new
+        one, so there is never more than one worker.
+
+        Args:
+            timeout: Maximum number of seconds to wait for the worker
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+
+            deadline = time.monotonic() + timeout
+            try:
+                # The queue may still be full, so don't wait for room past the deadline either
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                log("ScoreWriter", "Timed out waiting for room to stop the worker")
+                return
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                # Still the worker; _ensure_worker() replaces it once it has stopped
+                log("ScoreWriter", "Timed out waiting for queued items to be written")
+            else:
+                self._thread = None
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread if it is not running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="ScoreWriter",
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Worker loop: drain the queue in batches until told to stop."""
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+
+            # Grab whatever else is already waiting, up to one batch
+            while not stop and len(batch) < SCORE_BATCH_SIZE:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            self._write_batch(batch)
+
+            # One task_done per item taken, including the stop marker
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        """Write a batch of queued items, reporting whatever fails to save."""
+        scores = [payload for kind, payload in batch if kind == _SCORE]
+        attempts = [attempt for kind, payload in batch if kind == _ATTEMPTS
+                    for attempt in payload]
+
+        if scores:
+            try:
+                save_scores(scores)
+                log("ScoreWriter", f"Saved {len(scores)} score(s)")
+            except Exception as e:
+                log("ScoreWriter", f"Failed to save {len(scores)} score(s): {str(e)}")
+                self.save_failed.emit(scores, str(e))
+
+        if attempts:
+            try:
+                save_attempts(attempts)
+                log("ScoreWriter", f"Saved {len(attempts)} attempt(s)")
+            except Exception as e:
+                log("ScoreWriter", f"Failed to save {len(attempts)} attempt(s): {str(e)}")
+                self.attempts_failed.emit(attempts, str(e))
+
+
+# Create a singleton instance
+score_writer = ScoreWriter()
+
+# Make sure queued scores reach the database even without a clean Qt shutdown
+atexit.register(score_writer.shutdown)
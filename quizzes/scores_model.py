@@ -0,0 +1,265 @@
+"""
+Lazy table model for browsing quiz scores.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import (
+    QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, Qt, Signal
+)
+
+from .database.scores import SCORES_PAGE_SIZE
+from .debug import log
+
+# Number of pages kept in memory; older pages are dropped and refetched on demand
+MAX_CACHED_PAGES = 10
+
+# Text shown in the first column of rows whose page is still being loaded
+LOADING_ROW_TEXT = "Loading..."
+
+
+class ScoresQuerySignals(QObject):
+    """Signals used by ScoresQuery to report back to the GUI thread."""
+
+    # generation, quiz_type, page rows, next page cursor, statistics
+    finished = Signal(int, object, list, object, dict)
+    # generation, error message
+    failed = Signal(int, str)
+
+
+class ScoresQuery(QRunnable):
+    """Loads a page of scores, and optionally the statistics, for a quiz type on a worker thread."""
+
+    def __init__(self, generation, quiz_type, page_size, cursor=None, with_stats=True):
+        """Initialize the query.
+
+        Args:
+            generation: Request number used by the receiver to discard stale results
+            quiz_type: The quiz type to filter by, or None for all
+            page_size: Number of rows in the page
+            cursor: Cursor of the page as returned by get_scores_page(), None for the first page
+            with_stats: Whether to load the statistics too (reported as an empty dict otherwise)
+        """
+        super().__init__()
+        self.generation = generation
+        self.quiz_type = quiz_type
+        self.page_size = page_size
+        self.cursor = cursor
+        self.with_stats = with_stats
+        self.signals = ScoresQuerySignals()
+
+    def run(self):
+        """Run the queries; the worker thread uses its own database connection."""
+        from .database.scores import get_scores_page, get_score_statistics
+
+        try:
+            rows, next_cursor = get_scores_page(self.quiz_type, self.cursor, self.page_size)
+            stats = get_score_statistics(self.quiz_type) if self.with_stats else {}
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+
+        self.signals.finished.emit(self.generation, self.quiz_type, rows, next_cursor, stats)
+
+
+class ScoresTableModel(QAbstractTableModel):
+    """Table model that loads scores page by page as the view scrolls.
+
+    Pages are fetched with keyset pagination through fetchMore(). Only the
+    cursor of each page is kept for good; the rows themselves live in a small
+    LRU cache, so scrolling through any amount of history keeps memory flat.
+    Pages are loaded by ScoresQuery on the thread pool, never on the GUI
+    thread: new pages are appended when they arrive, and rows of an evicted
+    page show LOADING_ROW_TEXT until it has been loaded again.
+    """
+
+    HEADERS = ["Quiz Type", "Player", "Score", "Percentage", "Date"]
+
+    def __init__(self, parent=None, page_size=SCORES_PAGE_SIZE, max_cached_pages=MAX_CACHED_PAGES):
+        """Initialize the model.
+
+        Args:
+            parent: Parent QObject
+            page_size: Number of rows fetched at a time
+            max_cached_pages: Number of pages kept in memory
+        """
+        super().__init__(parent)
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self.quiz_type = None
+        # Numbers the page queries; results of queries started before a reset are ignored
+        self._last_request = 0
+        self._reset_state()
+        # Nothing to fetch until set_quiz_type() or set_first_page() is called,
+        # so attaching the model to a view doesn't query the database
+        self._exhausted = True
+
+    def _reset_state(self):
+        """Forget all fetched rows."""
+        # _page_cursors[k] is the cursor that page k is fetched with
+        self._page_cursors: List[Optional[tuple]] = [None]
+        self._pages = OrderedDict()  # page index -> list of formatted rows
+        self._row_count = 0
+        self._exhausted = False
+        # Running page queries: request number -> (page index, query)
+        self._requests: Dict[int, Tuple[int, ScoresQuery]] = {}
+        # Indexes of the pages being loaded
+        self._loading = set()
+
+    def set_quiz_type(self, quiz_type):
+        """Show scores for a quiz type (None for all), loading the first page in the background.
+
+        Args:
+            quiz_type: The quiz type to filter by, or None
+        """
+        self.beginResetModel()
+        self.quiz_type = quiz_type
+        self._reset_state()
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def set_first_page(self, quiz_type, rows, next_cursor):
+        """Show scores for a quiz type using an already fetched first page.
+
+        Args:
+            quiz_type: The quiz type the rows were fetched for, or None
+            rows: Rows of the first page as returned by get_scores_page()
+            next_cursor: Cursor for the second page, or None if there is none
+        """
+        self.beginResetModel()
+        self.quiz_type = quiz_type
+        self._reset_state()
+        if rows:
+            self._add_page(rows, next_cursor)
+        else:
+            self._exhausted = True
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        """Number of rows fetched so far."""
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        """Number of columns."""
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Get the formatted text of a cell."""
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+
+        page_index, offset = divmod(index.row(), self.page_size)
+        page = self._pages.get(page_index)
+        if page is None:
+            self._load_page(page_index)
+            return LOADING_ROW_TEXT if index.column() == 0 else ""
+
+        self._pages.move_to_end(page_index)
+        return page[offset][index.column()] if offset < len(page) else None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Get the column titles."""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """Whether there are rows beyond those fetched so far."""
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Start loading the next page of rows; they are appended when they arrive."""
+        if self.canFetchMore(parent):
+            self._load_page(len(self._page_cursors) - 1)
+
+    def _load_page(self, page_index):
+        """Start a background query for a page unless one is already running."""
+        if page_index in self._loading:
+            return
+
+        self._last_request += 1
+        query = ScoresQuery(
+            self._last_request,
+            self.quiz_type,
+            self.page_size,
+            self._page_cursors[page_index],
+            with_stats=False
+        )
+        query.signals.finished.connect(self._on_page_loaded)
+        query.signals.failed.connect(self._on_page_failed)
+        self._requests[self._last_request] = (page_index, query)
+        self._loading.add(page_index)
+        QThreadPool.globalInstance().start(query)
+
+    def _on_page_loaded(self, request, quiz_type, rows, next_cursor, stats):
+        """Append a new page, or show the rows of an evicted one again."""
+        if request not in self._requests:
+            return  # Started before the model was reset
+        page_index, _ = self._requests.pop(request)
+        self._loading.discard(page_index)
+
+        first_row = page_index * self.page_size
+        if first_row < self._row_count:
+            # A page that was shown before; its row count stays as it was
+            self._cache_page(page_index, rows)
+            last_row = min(first_row + self.page_size, self._row_count) - 1
+            self.dataChanged.emit(
+                self.index(first_row, 0), self.index(last_row, self.columnCount() - 1)
+            )
+        elif not rows:
+            self._exhausted = True
+        else:
+            self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + len(rows) - 1)
+            self._add_page(rows, next_cursor)
+            self.endInsertRows()
+
+    def _on_page_failed(self, request, error):
+        """Give up on a page; it is requested again when the view next needs it."""
+        if request not in self._requests:
+            return
+        page_index, _ = self._requests.pop(request)
+        self._loading.discard(page_index)
+        log("ScoresTableModel", f"Could not load scores page {page_index}: {error}")
+
+    def _add_page(self, rows, next_cursor):
+        """Append a freshly fetched page to the end of the model."""
+        page_index = len(self._page_cursors) - 1
+        self._cache_page(page_index, rows)
+        self._row_count += len(rows)
+
+        if next_cursor is None:
+            self._exhausted = True
+        else:
+            self._page_cursors.append(next_cursor)
+
+    def _cache_page(self, page_index, rows):
+        """Format and cache a page, evicting the least recently used one if needed."""
+        page = [self._format_row(row) for row in rows]
+        self._pages[page_index] = page
+        self._pages.move_to_end(page_index)
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+        return page
+
+    @staticmethod
+    def _format_row(row):
+        """Turn a row from get_scores_page() into the displayed column texts."""
+        _, quiz_type, player_name, score, total_questions, percentage, timestamp = row
+
+        # Format timestamp
+        if timestamp and isinstance(timestamp, str):
+            # SQLite timestamps are often strings, parse if needed
+            try:
+                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                timestamp = dt.strftime('%Y-%m-%d %H:%M')
+            except ValueError:
+                pass
+
+        return (
+            quiz_type or 'Unknown',
+            player_name or 'Anonymous',
+            f"{score}/{total_questions}",
+            f"{percentage:.1f}%",
+            str(timestamp or '')
+        )
@@ -1,9 +1,17 @@
 """
 Scores page for displaying and managing quiz scores.
 """
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QComboBox, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView
-from PySide6.QtCore import Signal, Qt
-from typing import Dict, Any, List
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QHBoxLayout, QComboBox, QPushButton, QTableView, QHeaderView
+)
+from PySide6.QtCore import Signal, Qt, QThreadPool, QTimer
+from typing import Dict, Any
+from .scores_model import ScoresTableModel, ScoresQuery
+from .debug import log
+
+# Delay before a filter change runs its query; changes within the delay are merged
+QUERY_DEBOUNCE_MS = 150
+
 
 # Create a new ScoresViewer class in this file to avoid import issues
 class ScoresViewer(QWidget):
@@ -73,15 +81,34 @@ class ScoresViewer(QWidget):
         self.scores_label.setStyleSheet("font-size: 18px; font-weight: bold; margin-top: 10px;")
         self.layout.addWidget(self.scores_label)
         
-        self.scores_table = QTableWidget()
-        self.scores_table.setColumnCount(5)
-        self.scores_table.setHorizontalHeaderLabels(["Quiz Type", "Player", "Score", "Percentage", "Date"])
+        # Rows are loaded page by page as the table is scrolled
+        self.scores_model = ScoresTableModel(self)
+        self.scores_table = QTableView()
+        self.scores_table.setModel(self.scores_model)
         self.scores_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.scores_table.verticalHeader().setVisible(False)
+        # Fixed row heights let the view skip measuring every row
+        self.scores_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.layout.addWidget(self.scores_table)
         
-        # Initialize the view
+        # Loading indicator shown while a query runs in the background
+        self.loading_label = QLabel("Loading scores...")
+        self.loading_label.setAlignment(Qt.AlignCenter)
+        self.loading_label.hide()
+        self.layout.addWidget(self.loading_label)
+        
+        # Background query state. Only one query runs at a time; requests made
+        # meanwhile collapse into a single follow-up query for the latest filter.
+        self._query_generation = 0
+        self._query_in_flight = None
+        self._query_pending = False
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(QUERY_DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._start_query)
+        
+        # Initialize the view; scores are queried once the page is shown (see ScoresPage.refresh)
         self.populate_quiz_types()
-        self.update_scores()
     
     def populate_quiz_types(self):
         """Populate the quiz type filter with available quiz types."""
@@ -98,68 +125,75 @@ class ScoresViewer(QWidget):
             self.quiz_filter.addItem(quiz_type, quiz_type)
     
     def update_scores(self):
-        """Update the scores table and statistics based on the selected filter."""
-        from .database.scores import get_top_scores, get_score_statistics
-        
-        quiz_type = self.quiz_filter.currentData()
-        
-        # Get scores from database
-        scores = get_top_scores(quiz_type, limit=20)
+        """Update the scores table and statistics based on the selected filter.
+        
+        The queries run on a worker thread after a short debounce delay, so rapid
+        filter changes only query for the last selection.
+        """
+        # Any result still on its way is for an older filter now
+        self._query_generation += 1
+        self.set_loading(True)
+        self._debounce_timer.start()
+    
+    def _start_query(self):
+        """Start the background query for the current filter, or queue it behind the running one."""
+        if self._query_in_flight is not None:
+            self._query_pending = True
+            return
+        
+        query = ScoresQuery(
+            self._query_generation,
+            self.quiz_filter.currentData(),
+            self.scores_model.page_size
+        )
+        query.signals.finished.connect(self._on_query_finished)
+        query.signals.failed.connect(self._on_query_failed)
+        self._query_in_flight = query
+        QThreadPool.globalInstance().start(query)
+    
+    def _on_query_finished(self, generation, quiz_type, rows, next_cursor, stats):
+        """Show the results of a background query unless a newer one was requested."""
+        self._query_done()
+        if generation != self._query_generation:
+            log("ScoresViewer", f"Discarding stale scores query {generation}")
+            return
         
-        # Update statistics
-        stats = get_score_statistics(quiz_type)
         self.update_statistics(stats)
-        
-        # Update scores table
-        self.update_scores_table(scores)
+        self.scores_model.set_first_page(quiz_type, rows, next_cursor)
+        self.set_loading(False)
+    
+    def _on_query_failed(self, generation, error):
+        """Report a failed background query."""
+        self._query_done()
+        log("ScoresViewer", f"Scores query failed: {error}")
+        if generation == self._query_generation:
+            self.set_loading(False)
+            self.loading_label.setText(f"Could not load scores: {error}")
+            self.loading_label.show()
+    
+    def _query_done(self):
+        """Mark the running query as finished and start the queued one, if any."""
+        self._query_in_flight = None
+        if self._query_pending:
+            self._query_pending = False
+            self._start_query()
+    
+    def set_loading(self, loading: bool):
+        """Show or hide the loading state of the scores view."""
+        self.loading_label.setText("Loading scores...")
+        self.loading_label.setVisible(loading)
+        self.scores_table.setEnabled(not loading)
     
     def update_statistics(self, stats: Dict[str, Any]):
         """Update the statistics display with the provided data."""
-        total_quizzes = stats.get('total_quizzes', 0)
-        avg_percentage = stats.get('avg_percentage', 0)
-        max_percentage = stats.get('max_percentage', 0)
+        # Aggregates are NULL for quiz types without any scores yet
+        total_quizzes = stats.get('total_quizzes') or 0
+        avg_percentage = stats.get('avg_percentage') or 0
+        max_percentage = stats.get('max_percentage') or 0
         
         self.total_quizzes.setText(f"Total Quizzes: {total_quizzes}")
         self.avg_score.setText(f"Average Score: {avg_percentage:.1f}%")
         self.high_score.setText(f"Highest Score: {max_percentage:.1f}%")
-    
-    def update_scores_table(self, scores: List[Dict[str, Any]]):
-        """Update the scores table with the provided data."""
-        self.scores_table.setRowCount(0)  # Clear the table
-        
-        for row_idx, score in enumerate(scores):
-            self.scores_table.insertRow(row_idx)
-            
-            # Create table items
-            quiz_type_item = QTableWidgetItem(score.get('quiz_type', 'Unknown'))
-            player_item = QTableWidgetItem(score.get('player_name', 'Anonymous'))
-            
-            score_text = f"{score.get('score', 0)}/{score.get('total_questions', 0)}"
-            score_item = QTableWidgetItem(score_text)
-            
-            percentage = score.get('percentage', 0)
-            percentage_item = QTableWidgetItem(f"{percentage:.1f}%")
-            
-            # Format timestamp
-            timestamp = score.get('timestamp', '')
-            if timestamp:
-                # SQLite timestamps are often strings, parse if needed
-                if isinstance(timestamp, str):
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        timestamp = dt.strftime('%Y-%m-%d %H:%M')
-                    except ValueError:
-                        pass
-            
-            date_item = QTableWidgetItem(str(timestamp))
-            
-            # Set items in the table
-            self.scores_table.setItem(row_idx, 0, quiz_type_item)
-            self.scores_table.setItem(row_idx, 1, player_item)
-            self.scores_table.setItem(row_idx, 2, score_item)
-            self.scores_table.setItem(row_idx, 3, percentage_item)
-            self.scores_table.setItem(row_idx, 4, date_item)
 
 class ScoresPage(QWidget):
     """Container for the scores viewer component."""
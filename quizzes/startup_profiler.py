@@ -0,0 +1,155 @@
+"""
+Startup profiler for the quiz application.
+
+Used by `python main.py --profile-startup`. Records how long each module takes
+to import (like `python -X importtime`, but collected in-process) and how long
+each startup phase takes, and prints both once the main window has been
+painted for the first time. Does nothing unless started.
+"""
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional
+
+# Number of modules listed in the report, slowest first
+REPORT_MODULE_COUNT = 25
+
+
+class _TimedLoader:
+    """Wraps a module loader and times module creation and execution."""
+
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        # Extension modules do most of their work here
+        with self._profiler.timing_import(self._name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler.timing_import(self._name):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        # Everything else (is_package, get_resource_reader, ...) goes to the real loader
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(MetaPathFinder):
+    """Meta path finder that hands out timing wrappers around the real loaders."""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, fullname, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """Collects per-module import times and per-phase startup spans."""
+
+    def __init__(self):
+        """Initialize an inactive profiler."""
+        self.active = False
+        self._started_at = 0.0
+        self._finder: Optional[_ImportTimer] = None
+        # Module name -> [cumulative seconds, self seconds]
+        self._imports: Dict[str, List[float]] = {}
+        # Time spent in the imports currently being timed, innermost last
+        self._import_stack: List[float] = []
+        # (phase name, start offset, duration or None for a mark, nesting depth)
+        self._spans: List[tuple] = []
+        self._depth = 0
+
+    def start(self) -> None:
+        """Start profiling; imports done before this are not counted."""
+        if self.active:
+            return
+        self.active = True
+        self._started_at = time.perf_counter()
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def stop(self) -> None:
+        """Stop recording imports."""
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+        self.active = False
+
+    @contextmanager
+    def timing_import(self, name: str):
+        """Time one step of importing a module, excluding nested imports from its self time."""
+        self._import_stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._import_stack.pop()
+            if self._import_stack:
+                self._import_stack[-1] += elapsed
+            entry = self._imports.setdefault(name, [0.0, 0.0])
+            entry[0] += elapsed
+            entry[1] += elapsed - nested
+
+    @contextmanager
+    def span(self, name: str):
+        """Record how long a startup phase takes; spans may be nested."""
+        if not self.active:
+            yield
+            return
+
+        start = time.perf_counter()
+        index = len(self._spans)
+        self._spans.append(None)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self._spans[index] = (
+                name, start - self._started_at, time.perf_counter() - start, self._depth
+            )
+
+    def mark(self, name: str) -> None:
+        """Record a point in time, e.g. the first paint of the main window."""
+        if self.active:
+            self._spans.append((name, time.perf_counter() - self._started_at, None, self._depth))
+
+    def report(self, stream=None) -> None:
+        """Print the import times and startup spans.
+
+        Args:
+            stream: File to print to, defaults to stdout
+        """
+        stream = stream or sys.stdout
+
+        print("Startup phases (ms from start, duration ms; * marks a point in time):", file=stream)
+        for name, offset, duration, depth in filter(None, self._spans):
+            duration_text = f"{duration * 1000:8.1f}" if duration is not None else f"{'*':>8}"
+            print(f"  {offset * 1000:8.1f} {duration_text}  {'  ' * depth}{name}", file=stream)
+
+        total_self = sum(entry[1] for entry in self._imports.values())
+        print(f"\nImported {len(self._imports)} modules, {total_self * 1000:.1f} ms in total.",
+              file=stream)
+        print(f"Slowest {REPORT_MODULE_COUNT} (self ms, cumulative ms):", file=stream)
+        slowest = sorted(self._imports.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (cumulative, own) in slowest[:REPORT_MODULE_COUNT]:
+            print(f"  {own * 1000:8.1f} {cumulative * 1000:8.1f}  {name}", file=stream)
+
+
+# Create a singleton instance
+startup_profiler = StartupProfiler()
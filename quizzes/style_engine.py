@@ -0,0 +1,76 @@
+"""
+Property-driven styling for the quiz application.
+
+Installs the application-wide QUIZ_STYLESHEET once and styles widgets through
+their 'role' and 'state' dynamic properties. Changing a widget's look is then a
+property flip plus a re-polish of that one widget, instead of a new per-widget
+style sheet that Qt has to parse again.
+"""
+from typing import Optional
+
+from PySide6.QtWidgets import QApplication, QWidget
+
+from .styles import QUIZ_STYLESHEET
+from .debug import log
+
+# Whether QUIZ_STYLESHEET has been added to the application style sheet
+_installed = False
+
+
+def install_stylesheet(app: Optional[QApplication] = None) -> bool:
+    """
+    Add QUIZ_STYLESHEET to the application style sheet, once per process.
+
+    Args:
+        app: The application, defaults to the running QApplication
+
+    Returns:
+        True if the style sheet is installed, False if there is no application yet
+    """
+    global _installed
+    if _installed:
+        return True
+
+    app = app or QApplication.instance()
+    if app is None:
+        return False
+
+    existing = app.styleSheet()
+    app.setStyleSheet(f"{existing}\n{QUIZ_STYLESHEET}" if existing else QUIZ_STYLESHEET)
+    _installed = True
+    log("StyleEngine", "Installed the application style sheet")
+    return True
+
+
+def set_style_role(widget: QWidget, role: str) -> None:
+    """
+    Give a widget a role from QUIZ_STYLESHEET (e.g. 'question' or 'answer').
+
+    Meant to be called once, before the widget is shown.
+
+    Args:
+        widget: The widget to style
+        role: The role selector value
+    """
+    install_stylesheet()
+    widget.setProperty("role", role)
+
+
+def set_style_state(widget: QWidget, state: str = "") -> None:
+    """
+    Switch a widget to another state of its role (e.g. 'correct', or '' for the default).
+
+    Only the widget itself is re-polished, and nothing happens if the state is unchanged.
+
+    Args:
+        widget: The widget to restyle
+        state: The state selector value
+    """
+    if (widget.property("state") or "") == state:
+        return
+
+    widget.setProperty("state", state)
+    # The style sheet style drops the widget's cached rules on polish, so polish
+    # alone picks up the new state; an unpolish first would only reset the font
+    # and palette for nothing and roughly double the cost.
+    widget.style().polish(widget)
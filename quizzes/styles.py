@@ -253,4 +253,65 @@ MENU_BUTTON_DISABLED_STYLE = """
     QPushButton:pressed {
         background-color: #42A5F5;
     }
-""" 
\ No newline at end of file
+""" 
+
+# Colors of the self-assessment buttons
+SELF_ASSESS_CORRECT_COLOR = "#a3e4a3"
+SELF_ASSESS_INCORRECT_COLOR = "#e4a3a3"
+
+# Results score colors by how well the quiz went
+RESULTS_SCORE_COLORS = {
+    "good": "green",     # 80% and more
+    "fair": "orange",    # 60% and more
+    "poor": "red",
+}
+
+RESULTS_TITLE_STYLE = "font-size: 32px; font-weight: bold;"
+RESULTS_SCORE_STYLE = "font-size: 20px;"
+
+
+def _role_selector(widget_type, role, state=None):
+    """Selector matching widgets by their 'role' and optional 'state' properties."""
+    selector = f'{widget_type}[role="{role}"]'
+    if state is not None:
+        selector += f'[state="{state}"]'
+    return selector
+
+
+def _rule(widget_type, role, declarations, state=None):
+    """Turn a declaration-only style (e.g. QUESTION_LABEL_STYLE) into a scoped rule."""
+    return f"{_role_selector(widget_type, role, state)} {{ {declarations.strip()} }}"
+
+
+def _scoped(style, widget_type, role):
+    """Scope a full style sheet (e.g. ANSWER_BUTTON_STYLE) to widgets with a role."""
+    selector = _role_selector(widget_type, role)
+    style = style.replace(f"{widget_type} {{", f"{selector} {{")
+    return style.replace(f"{widget_type}:", f"{selector}:")
+
+
+# Application-wide style sheet for the quiz screen. Widgets opt in through the
+# dynamic 'role' property; feedback only flips their 'state' property (see
+# style_engine.set_style_state) instead of replacing per-widget style sheets.
+QUIZ_STYLESHEET = "\n".join([
+    _rule("QLabel", "question", QUESTION_LABEL_STYLE),
+    _rule("QLabel", "question", QUESTION_CORRECT_STYLE, state="correct"),
+    _rule("QLabel", "question", QUESTION_INCORRECT_STYLE, state="incorrect"),
+    _rule("QLabel", "feedback", FEEDBACK_LABEL_STYLE),
+    _rule("QLabel", "feedback", FEEDBACK_CORRECT_STYLE, state="correct"),
+    _rule("QLabel", "feedback", FEEDBACK_INCORRECT_STYLE, state="incorrect"),
+    _scoped(ANSWER_BUTTON_STYLE, "QPushButton", "answer"),
+    _rule("QPushButton", "answer", f"background-color: {SELF_ASSESS_CORRECT_COLOR};",
+          state="correct"),
+    _rule("QPushButton", "answer", f"background-color: {SELF_ASSESS_INCORRECT_COLOR};",
+          state="incorrect"),
+    _scoped(ANSWER_INPUT_STYLE, "QLineEdit", "answer"),
+    _scoped(SUBMIT_BUTTON_STYLE, "QPushButton", "submit"),
+    _scoped(NEXT_BUTTON_STYLE, "QPushButton", "next"),
+    _scoped(RETURN_BUTTON_STYLE, "QPushButton", "return"),
+    _rule("QLabel", "results-title", RESULTS_TITLE_STYLE),
+    _rule("QLabel", "results-score", RESULTS_SCORE_STYLE),
+] + [
+    _rule("QLabel", "results-score", f"color: {color};", state=state)
+    for state, color in RESULTS_SCORE_COLORS.items()
+])
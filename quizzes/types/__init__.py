@@ -1,15 +1,22 @@
 """
 Quiz type implementations.
 This subpackage contains all the specific quiz implementations.
+
+The quiz modules are imported on first access to one of their names (PEP 562),
+so the factory-built classes are only created when a quiz is actually used.
 """
-from .quiz_types import (
-    AdditionQuiz,
-    MultiplicationQuiz,
-    SmallMultiplicationQuiz,
-    SubtractionQuiz,
-    DivisionQuiz
-)
-from .file_based_quiz import FileBasedQuiz, create_quiz_from_file
+from ..lazy_imports import lazy_module_attrs
+
+# Public name -> module it lives in, imported on first access
+_LAZY_ATTRIBUTES = {
+    'AdditionQuiz': '.quiz_types',
+    'MultiplicationQuiz': '.quiz_types',
+    'SmallMultiplicationQuiz': '.quiz_types',
+    'SubtractionQuiz': '.quiz_types',
+    'DivisionQuiz': '.quiz_types',
+    'FileBasedQuiz': '.file_based_quiz',
+    'create_quiz_from_file': '.file_based_quiz',
+}
 
 __all__ = [
     'AdditionQuiz',
@@ -19,4 +26,6 @@ __all__ = [
     'DivisionQuiz',
     'FileBasedQuiz',
     'create_quiz_from_file'
-] 
\ No newline at end of file
+]
+
+__getattr__, __dir__ = lazy_module_attrs(globals(), _LAZY_ATTRIBUTES)
@@ -4,15 +4,22 @@ File-based quiz module for loading quizzes from external files.
 This module allows creating quizzes from JSON files containing question-answer pairs
 without requiring any coding.
 """
-import json
 import os
 import random
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Sequence, Union
 
 from ..base_quiz import BaseQuiz
 from ..components.navigation_bar import NavigationBar
+from ..question_bank import (
+    load_question_bank, load_question_metadata, sample_questions, should_stream
+)
+from ..question_store import QuestionStore, StoreSelection, open_question_store
+from ..answer_matching import AnswerMatcher, accepted_forms
 from ..debug import log
 
+# Number of wrong options shown with the correct answer in button mode
+DISTRACTOR_COUNT = 3
+
 class FileBasedQuiz(BaseQuiz):
     """Quiz that loads questions and answers from a JSON file."""
     
@@ -23,7 +30,8 @@ class FileBasedQuiz(BaseQuiz):
         total_questions=None, 
         show_questions_control=True, 
         input_mode="self_assess",
-        shuffle=True
+        shuffle=True,
+        store: Optional[QuestionStore] = None
     ):
         """Initialize a file-based quiz.
         
@@ -34,17 +42,28 @@ class FileBasedQuiz(BaseQuiz):
             show_questions_control: Whether to show the questions control
             input_mode: Mode of input ('self_assess', 'buttons', or 'input')
             shuffle: Whether to shuffle the questions
+            store: Question store to read the questions from, instead of the
+                   one compiled from the file's current contents
         """
         # We'll initialize these before super().__init__ so they are available in generate_numbers
         self.questions = []
         self.current_index = 0
         self.file_path = file_path
+        self.store = store
+        self.shuffle = shuffle
         self.current_question_text = ""
         self.current_answer_text = ""
         self.options = []
+        self.current_item: Dict[str, Any] = {}
+        # Built on first use, in button mode only
+        self._distractor_index = None
+        # Grades answers to the current question, built when the first one is checked
+        self._answer_matcher: Optional[AnswerMatcher] = None
+        # Set while a typed answer is graded; picked options get no typo tolerance
+        self._answer_typed = False
         
         # Load questions from file
-        self.questions = self._load_questions(file_path, shuffle)
+        self.questions = self._load_questions(file_path, shuffle, total_questions)
         
         # Determine total questions (cap by available questions)
         if total_questions is None or total_questions > len(self.questions):
@@ -72,37 +91,54 @@ class FileBasedQuiz(BaseQuiz):
         # Insert nav bar at the top
         self.main_layout.insertWidget(0, self.nav_bar)
     
-    def _load_questions(self, file_path: str, shuffle: bool) -> List[Dict[str, Any]]:
+    def _load_questions(self, file_path: str, shuffle: bool,
+                        limit: Optional[int] = None) -> Sequence[Dict[str, Any]]:
         """Load questions from a JSON file.
         
+        Questions are read lazily from the file's memory-mapped question store,
+        so only the questions a session asks are ever decoded. If no store can
+        be used (e.g. the cache directory is not writable), the file is loaded
+        through the shared question bank cache instead, or sampled while
+        streaming if it is very large and only limit questions are needed.
+        
         Args:
             file_path: Path to the JSON file
             shuffle: Whether to shuffle the questions
+            limit: Number of questions the quiz will ask, None for all
             
         Returns:
-            List of question dictionaries
+            Sequence of question dictionaries
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            # Check if data is a dictionary with 'questions' key
-            if isinstance(data, dict) and 'questions' in data:
-                questions = data['questions']
-            elif isinstance(data, list):
-                questions = data
+            store = self.store if self.store is not None else open_question_store(file_path)
+            return store.select(limit, shuffle)
+        except Exception as e:
+            log("FileBasedQuiz", f"No question store for {file_path}, loading it instead: {str(e)}")
+        
+        try:
+            if limit and shuffle and should_stream(file_path):
+                questions, _, _ = sample_questions(file_path, limit)
             else:
-                log("FileBasedQuiz", f"Invalid data format in {file_path}")
-                questions = []
-                
-            # Apply shuffle if requested
-            if shuffle and questions:
-                random.shuffle(questions)
-                
-            return questions
+                questions = list(load_question_bank(file_path).questions)
         except Exception as e:
             log("FileBasedQuiz", f"Error loading questions from {file_path}: {str(e)}")
             return []
+        
+        # Apply shuffle if requested
+        if shuffle and questions:
+            random.shuffle(questions)
+            
+        return questions
+    
+    def restart_quiz(self) -> None:
+        """Restart the quiz from the first question, reshuffled if shuffling is enabled."""
+        self.current_index = 0
+        if self.shuffle and self.questions:
+            if isinstance(self.questions, StoreSelection):
+                self.questions.reshuffle()
+            else:
+                random.shuffle(self.questions)
+        super().restart_quiz()
     
     def generate_numbers(self) -> None:
         """Get the next question from the loaded questions."""
@@ -110,14 +146,52 @@ class FileBasedQuiz(BaseQuiz):
             self.current_question_text = "No more questions"
             self.current_answer_text = ""
             self.options = []
+            self.current_item = {}
+            self._answer_matcher = None
             return
             
-        current_item = self.questions[self.current_index]
-        self.current_question_text = current_item.get('question', '')
-        self.current_answer_text = current_item.get('answer', '')
-        self.options = current_item.get('options', [])
+        self.current_item = self.questions[self.current_index]
+        self._answer_matcher = None
+        self.current_question_text = self.current_item.get('question', '')
+        self.current_answer_text = self.current_item.get('answer', '')
+        self.options = self.current_item.get('options', [])
         self.current_index += 1
     
+    def check_answer(self, user_answer: Union[int, str]) -> bool:
+        """Check if the answer is correct.
+        
+        The answer is compared with the question's 'correct_answers' (or its
+        'answer') ignoring case, accents and extra whitespace. Typed answers
+        are also accepted with a typo or two in longer words (see
+        answer_matching.py).
+        
+        Args:
+            user_answer: The user's answer
+        
+        Returns:
+            Whether the answer is correct
+        """
+        # The current question was decoded by generate_numbers()
+        if not self.current_item:
+            return False
+        
+        if self._answer_matcher is None:
+            # Canonical forms are precomputed in the question store and bank;
+            # questions sampled while streaming don't have them
+            forms = self.current_item.get('accepted_forms')
+            self._answer_matcher = AnswerMatcher(
+                accepted_forms(self.current_item) if forms is None else forms
+            )
+        return self._answer_matcher.matches(user_answer, fuzzy=self._answer_typed)
+    
+    def handle_submit_button(self) -> None:
+        """Handle the submit button click in input mode, tolerating typos."""
+        self._answer_typed = True
+        try:
+            super().handle_submit_button()
+        finally:
+            self._answer_typed = False
+    
     def calculate_answer(self) -> Union[int, str]:
         """Return the answer for the current question."""
         return self.current_answer_text
@@ -134,7 +208,8 @@ class FileBasedQuiz(BaseQuiz):
         """Generate answer options for the current question.
         
         This method will use any provided options in the question data.
-        If no options are provided, it falls back to the base implementation.
+        If no options are provided, the answers of the file most similar to the
+        correct one are offered as wrong options (see distractors.py).
         
         Returns:
             List of answer options
@@ -147,15 +222,48 @@ class FileBasedQuiz(BaseQuiz):
                 random.shuffle(options)
                 return options
             return self.options
-        else:
-            # No options provided in the question, use base implementation
-            # For text-based answers, we'll need to provide plausible alternatives
-            # This is challenging without additional context
-            # For now, we'll return just the correct answer for button mode
+        
+        if self.self_assess_mode or self.input_mode:
+            # Only option buttons need wrong answers
             return [self.current_answer_text]
+        
+        distractors = self._get_distractors()
+        options = [self.current_answer_text] + distractors
+        random.shuffle(options)
+        return options
+    
+    def _get_distractors(self) -> List[str]:
+        """Get wrong options for the current question from the file's distractor index.
+        
+        Returns:
+            Up to DISTRACTOR_COUNT answers of other questions, or an empty list
+        """
+        # NumPy is only imported once a file-based quiz shows option buttons
+        from ..distractors import DistractorIndex, load_distractor_index
+        
+        if self._distractor_index is None:
+            try:
+                self._distractor_index = load_distractor_index(self.file_path, self.store)
+            except Exception as e:
+                log("FileBasedQuiz", f"No distractor index for {self.file_path}, "
+                                     f"using this session's questions: {str(e)}")
+                self._distractor_index = DistractorIndex.build(
+                    question.get('answer', '') for question in self.questions
+                )
+        
+        return self._distractor_index.similar(
+            self.current_answer_text,
+            DISTRACTOR_COUNT,
+            exclude=self.current_item.get('correct_answers') or ()
+        )
 
 
-def create_quiz_from_file(file_path: str, quiz_name: Optional[str] = None, input_mode: Optional[Union[bool, str]] = None) -> FileBasedQuiz:
+def create_quiz_from_file(
+    file_path: str,
+    quiz_name: Optional[str] = None,
+    input_mode: Optional[Union[bool, str]] = None,
+    store: Optional[QuestionStore] = None
+) -> FileBasedQuiz:
     """Create a quiz from a JSON file.
     
     This function creates a specialized FileBasedQuiz class for the given file,
@@ -166,6 +274,8 @@ def create_quiz_from_file(file_path: str, quiz_name: Optional[str] = None, input
         quiz_name: Optional name for the quiz class
         input_mode: Input mode for the quiz ('buttons', 'input', or 'self_assess')
                     If True, uses 'input', if False uses 'self_assess'
+        store: Question store every quiz of the class reads from, e.g. the last
+               good version of a file that is being edited (see quiz_content)
     
     Returns:
         A FileBasedQuiz subclass
@@ -189,61 +299,30 @@ def create_quiz_from_file(file_path: str, quiz_name: Optional[str] = None, input
                 show_questions_control: Whether to show the questions control
                 input_mode: Mode of input ('self_assess', 'buttons', or 'input')
             """
-            # Load file and get quiz metadata if available
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Extract quiz metadata if available
-                if isinstance(data, dict):
-                    metadata = data.get('metadata', {})
-                    # Determine final input mode, with precedence:
-                    # 1. Parameter passed to create_quiz_from_file
-                    # 2. Metadata in JSON file
-                    # 3. Default ('self_assess')
-                    file_input_mode = metadata.get('input_mode')
-                    actual_input_mode = input_mode or file_input_mode or 'self_assess'
-                    
-                else:
-                    actual_input_mode = input_mode or 'self_assess'
-            except Exception:
-                actual_input_mode = input_mode or 'self_assess'
+            # Determine final input mode, with precedence:
+            # 1. Parameter passed to create_quiz_from_file
+            # 2. Metadata in JSON file (from the shared store or bank, no second parse)
+            # 3. Default ('self_assess')
+            file_input_mode = None
+            if not input_mode:
+                try:
+                    file_store = store if store is not None else open_question_store(file_path)
+                    file_input_mode = file_store.input_mode
+                except Exception:
+                    try:
+                        file_input_mode = load_question_metadata(file_path).get('input_mode')
+                    except Exception:
+                        pass
+            actual_input_mode = input_mode or file_input_mode or 'self_assess'
             
             super().__init__(
                 file_path=file_path,
                 parent=parent,
                 total_questions=total_questions,
                 show_questions_control=show_questions_control,
-                input_mode=actual_input_mode
+                input_mode=actual_input_mode,
+                store=store
             )
-        
-        def check_answer(self, user_answer):
-            """Check if the answer is correct, with special handling for multiple correct answers.
-            
-            Args:
-                user_answer: The user's answer
-            
-            Returns:
-                Whether the answer is correct
-            """
-            # Get current question
-            if not self.questions or self.current_index <= 0 or self.current_index > len(self.questions):
-                return False
-                
-            current_item = self.questions[self.current_index - 1]
-            
-            # Check for multiple correct answers
-            correct_answers = current_item.get('correct_answers', [])
-            if correct_answers:
-                # Convert answers to strings for comparison
-                correct_answers = [str(ans).strip().lower() for ans in correct_answers]
-                user_answer_str = str(user_answer).strip().lower()
-                return user_answer_str in correct_answers
-            else:
-                # Fall back to the standard answer
-                correct_answer = str(self.current_answer_text).strip().lower()
-                user_answer_str = str(user_answer).strip().lower()
-                return user_answer_str == correct_answer
     
     # Set the class name if provided
     if quiz_name:
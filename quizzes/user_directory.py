@@ -0,0 +1,230 @@
+"""
+In-memory user directory for the quiz application.
+
+Caches the users table with indexes by id and username so that looking up or
+switching users never has to query the database.
+"""
+import bisect
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from .database import users as users_db
+from .debug import log
+
+
+class UserDirectory(QObject):
+    """Cached view of the users table.
+
+    All user changes should go through this class so the cache stays in sync;
+    each change is announced through a signal so views can update incrementally.
+    """
+
+    # Emitted with the new user's data after a user is created
+    user_added = Signal(dict)
+    # Emitted with the updated user's data after a user is changed
+    user_updated = Signal(dict)
+    # Emitted with the user ID after a user is deleted
+    user_removed = Signal(int)
+    # Emitted after the whole directory was reloaded from the database
+    users_reset = Signal()
+
+    def __init__(self, parent=None):
+        """
+        Initialize the user directory. Users are loaded on first access.
+
+        Args:
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self._users_by_id: Dict[int, Dict[str, Any]] = {}
+        self._users_by_username: Dict[str, Dict[str, Any]] = {}
+        # (display_name, id) pairs kept in the same order as ORDER BY display_name
+        self._order: List[tuple] = []
+        self._loaded = False
+
+    def reload(self) -> None:
+        """Reload every user from the database and rebuild the indexes."""
+        users = users_db.get_all_users()
+
+        self._users_by_id = {}
+        self._users_by_username = {}
+        for user in users:
+            self._index(user)
+        self._order = sorted(self.sort_key(user) for user in self._users_by_id.values())
+        self._loaded = True
+
+        log("UserDirectory", f"Loaded {len(users)} users")
+        self.users_reset.emit()
+
+    def invalidate(self) -> None:
+        """Drop the cache so the next access reloads it from the database."""
+        self._loaded = False
+
+    def get_all_users(self) -> List[Dict[str, Any]]:
+        """
+        Get all users ordered by display name.
+
+        Returns:
+            A list of dictionaries containing user data
+        """
+        self._ensure_loaded()
+        return [dict(self._users_by_id[user_id]) for _, user_id in self._order]
+
+    def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a user by ID.
+
+        Args:
+            user_id: The ID of the user to retrieve
+
+        Returns:
+            User data as a dictionary, or None if not found
+        """
+        self._ensure_loaded()
+        user = self._users_by_id.get(user_id)
+        return dict(user) if user else None
+
+    def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user by username.
+
+        Args:
+            username: The username to look up
+
+        Returns:
+            User data as a dictionary, or None if not found
+        """
+        self._ensure_loaded()
+        user = self._users_by_username.get(username)
+        return dict(user) if user else None
+
+    def index_of(self, user_id: int) -> int:
+        """
+        Get the position of a user in display name order.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            The position in get_all_users(), or -1 if not found
+        """
+        self._ensure_loaded()
+        user = self._users_by_id.get(user_id)
+        if user is None:
+            return -1
+        return bisect.bisect_left(self._order, self.sort_key(user))
+
+    def count(self) -> int:
+        """Get the number of users."""
+        self._ensure_loaded()
+        return len(self._order)
+
+    def user_at(self, index: int) -> Dict[str, Any]:
+        """
+        Get the user at a position in display name order.
+
+        Args:
+            index: Position in get_all_users()
+
+        Returns:
+            User data as a dictionary
+        """
+        self._ensure_loaded()
+        return dict(self._users_by_id[self._order[index][1]])
+
+    def create_user(self, username: str, display_name: str = None) -> int:
+        """
+        Create a new user and add it to the directory.
+
+        Args:
+            username: The unique username
+            display_name: The display name (defaults to username if not provided)
+
+        Returns:
+            The ID of the newly created user
+        """
+        self._ensure_loaded()
+        user_id = users_db.create_user(username, display_name)
+
+        user = users_db.get_user(user_id) or {
+            "id": user_id,
+            "username": username,
+            "display_name": display_name or username
+        }
+        self._index(user)
+        bisect.insort(self._order, self.sort_key(user))
+
+        self.user_added.emit(dict(user))
+        return user_id
+
+    def update_user(self, user_id: int, display_name: str) -> bool:
+        """
+        Update a user's display name.
+
+        Args:
+            user_id: The ID of the user to update
+            display_name: The new display name
+
+        Returns:
+            True if successful, False otherwise
+        """
+        self._ensure_loaded()
+        if not users_db.update_user(user_id, display_name):
+            return False
+
+        user = self._users_by_id.get(user_id)
+        if user is None:
+            # Changed behind our back; resync instead of guessing
+            self.reload()
+            return True
+
+        self._order.pop(bisect.bisect_left(self._order, self.sort_key(user)))
+        user["display_name"] = display_name
+        bisect.insort(self._order, self.sort_key(user))
+
+        self.user_updated.emit(dict(user))
+        return True
+
+    def delete_user(self, user_id: int) -> bool:
+        """
+        Delete a user.
+
+        Args:
+            user_id: The ID of the user to delete
+
+        Returns:
+            True if successful, False otherwise
+        """
+        self._ensure_loaded()
+        if not users_db.delete_user(user_id):
+            return False
+
+        user = self._users_by_id.pop(user_id, None)
+        if user is not None:
+            self._users_by_username.pop(user["username"], None)
+            self._order.pop(bisect.bisect_left(self._order, self.sort_key(user)))
+            self.user_removed.emit(user_id)
+
+        return True
+
+    def _ensure_loaded(self) -> None:
+        """Load the directory on first access or after invalidate()."""
+        if not self._loaded:
+            self.reload()
+
+    def _index(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a copy of a user to the id and username indexes and return it."""
+        user = dict(user)
+        self._users_by_id[user["id"]] = user
+        self._users_by_username[user["username"]] = user
+        return user
+
+    @staticmethod
+    def sort_key(user: Dict[str, Any]) -> tuple:
+        """Sort key matching ORDER BY display_name, with the ID as tie breaker."""
+        return (user.get("display_name") or "", user["id"])
+
+
+# Create a singleton instance
+user_directory = UserDirectory()
@@ -0,0 +1,181 @@
+"""
+Shared Qt list model of the quiz application's users.
+
+Every user selector uses the same model, which mirrors the user directory's
+display name order and applies the directory's change signals as row inserts,
+removals, moves and data changes. Adding one user therefore inserts one row in
+every combo box instead of clearing and refilling each of them.
+"""
+import bisect
+from typing import Dict, List
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from .constants import ADD_USER_ITEM_TEXT
+from .user_directory import user_directory
+from .debug import log
+
+# User ID of the trailing "+ Add New User" row
+ADD_USER_ID = -1
+
+
+class UserListModel(QAbstractListModel):
+    """List model of users ordered by display name, plus an "add user" row.
+
+    The display role holds the display name and Qt.UserRole the user ID, so a
+    QComboBox using this model keeps working with currentData()/findData().
+    """
+
+    def __init__(self, directory=user_directory, parent=None):
+        """
+        Initialize the model. Users are loaded on first access.
+
+        Args:
+            directory: The UserDirectory to mirror
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.directory = directory
+        # The directory's (display_name, id) sort keys, in the same order
+        self._keys: List[tuple] = []
+        self._names_by_id: Dict[int, str] = {}
+        self._loaded = False
+
+        directory.user_added.connect(self._on_user_added)
+        directory.user_updated.connect(self._on_user_updated)
+        directory.user_removed.connect(self._on_user_removed)
+        directory.users_reset.connect(self._on_users_reset)
+
+    def rowCount(self, parent=QModelIndex()):
+        """Number of users plus the "add user" row."""
+        if parent.isValid():
+            return 0
+        self._ensure_loaded()
+        return len(self._keys) + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Display name for the display role and user ID for Qt.UserRole."""
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        if row == len(self._keys):
+            if role == Qt.DisplayRole:
+                return ADD_USER_ITEM_TEXT
+            if role == Qt.UserRole:
+                return ADD_USER_ID
+            return None
+        if row > len(self._keys):
+            return None
+
+        display_name, user_id = self._keys[row]
+        if role == Qt.DisplayRole:
+            return display_name
+        if role == Qt.UserRole:
+            return user_id
+        return None
+
+    def user_count(self) -> int:
+        """Get the number of users, not counting the "add user" row."""
+        self._ensure_loaded()
+        return len(self._keys)
+
+    def row_of(self, user_id: int) -> int:
+        """
+        Get the row of a user.
+
+        Args:
+            user_id: The ID of the user, or ADD_USER_ID for the "add user" row
+
+        Returns:
+            The row, or -1 if the user is not in the model
+        """
+        self._ensure_loaded()
+        if user_id == ADD_USER_ID:
+            return len(self._keys)
+        display_name = self._names_by_id.get(user_id)
+        if display_name is None:
+            return -1
+        return bisect.bisect_left(self._keys, (display_name, user_id))
+
+    def _ensure_loaded(self) -> None:
+        """Copy the directory's order on first access."""
+        if not self._loaded:
+            self._load()
+
+    def _load(self) -> None:
+        """Rebuild the rows from the directory."""
+        users = self.directory.get_all_users()
+        self._keys = [self.directory.sort_key(user) for user in users]
+        self._names_by_id = {user_id: display_name for display_name, user_id in self._keys}
+        self._loaded = True
+
+    def _on_user_added(self, user):
+        """Insert the row of a new user."""
+        if not self._loaded:
+            return
+
+        key = self.directory.sort_key(user)
+        row = bisect.bisect_left(self._keys, key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._keys.insert(row, key)
+        self._names_by_id[user["id"]] = key[0]
+        self.endInsertRows()
+
+    def _on_user_updated(self, user):
+        """Update a user's row in place, moving it if its position changed."""
+        if not self._loaded:
+            return
+
+        old_row = self.row_of(user["id"])
+        if old_row < 0:
+            self._on_user_added(user)
+            return
+
+        key = self.directory.sort_key(user)
+        # Position among the other rows, i.e. after taking this one out
+        new_row = bisect.bisect_left(self._keys, key)
+        if new_row > old_row:
+            new_row -= 1
+
+        if new_row != old_row:
+            # The destination is given in row numbers from before the move
+            destination = new_row + 1 if new_row > old_row else new_row
+            self.beginMoveRows(QModelIndex(), old_row, old_row, QModelIndex(), destination)
+            del self._keys[old_row]
+            self._keys.insert(new_row, key)
+            self._names_by_id[user["id"]] = key[0]
+            self.endMoveRows()
+        else:
+            self._keys[old_row] = key
+            self._names_by_id[user["id"]] = key[0]
+
+        index = self.index(new_row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def _on_user_removed(self, user_id):
+        """Remove the row of a deleted user."""
+        if not self._loaded:
+            return
+
+        row = self.row_of(user_id)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._keys[row]
+        del self._names_by_id[user_id]
+        self.endRemoveRows()
+
+    def _on_users_reset(self):
+        """Rebuild every row after the directory was reloaded."""
+        if not self._loaded:
+            return
+
+        self.beginResetModel()
+        self._load()
+        self.endResetModel()
+        log("UserListModel", f"Reset with {len(self._keys)} users")
+
+
+# Create a singleton instance
+user_list_model = UserListModel()
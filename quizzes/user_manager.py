@@ -2,11 +2,13 @@
 User management module for the quiz application.
 This centralizes all user-related functionality in one place.
 """
-from PySide6.QtWidgets import QMessageBox, QComboBox, QWidget, QHBoxLayout, QLabel
+from PySide6.QtWidgets import QMessageBox
 from PySide6.QtCore import QObject, Signal
-from .database.users import get_all_users, get_user
+from .user_directory import user_directory
+from .user_list_model import user_list_model, ADD_USER_ID
 from .components.user_dialog import UserDialog
 from .components.navigation_bar import NavigationBar
+from .components.user_picker import UserPicker
 from .debug import is_debug_mode, log
 
 
@@ -29,54 +31,31 @@ class UserManager(QObject):
         
         # Set current user - default to Anonymous (ID 1)
         self.current_user_id = 1
-        self.current_user = get_user(self.current_user_id) or {"id": 1, "username": "anonymous", "display_name": "Anonymous"}
+        self.current_user = user_directory.get_user(self.current_user_id) or {
+            "id": 1, "username": "anonymous", "display_name": "Anonymous"
+        }
         self.user_dropdown = None
+        # Every user dropdown created so far; they all share user_list_model
+        self.user_dropdowns = []
+        # Every searchable user picker created so far
+        self.user_pickers = []
         self.nav_bar = None
+        # Set while the new user dialog is open
+        self._adding_user = False
         
         log("UserManager", "Initialized")
     
     def create_user_selector(self):
         """
-        Create a widget with a user selection dropdown.
+        Create a searchable user picker.
         
         Returns:
-            A widget containing the user selection dropdown
+            A UserPicker showing the current user
         """
-        # Create container
-        container = QWidget()
-        container_layout = QHBoxLayout()
-        container_layout.setContentsMargins(0, 0, 0, 0)
-        container_layout.setSpacing(5)
-        container.setLayout(container_layout)
-        
-        # Add label
-        label = QLabel("User:")
-        container_layout.addWidget(label)
-        
-        # Create and populate the combo box
-        self.user_dropdown = QComboBox()
-        self.user_dropdown.setFixedWidth(150)
-        
-        # Populate with users
-        users = get_all_users()
-        current_index = 0
-        
-        for i, user in enumerate(users):
-            self.user_dropdown.addItem(user['display_name'], user['id'])
-            if user['id'] == self.current_user_id:
-                current_index = i
-        
-        # Add a special item for adding a new user
-        self.user_dropdown.addItem("+ Add New User", -1)
-        
-        # Set current user
-        self.user_dropdown.setCurrentIndex(current_index)
-        
-        # Connect signal
-        self.user_dropdown.currentIndexChanged.connect(self.on_user_changed)
-        
-        container_layout.addWidget(self.user_dropdown)
-        return container
+        picker = UserPicker(self.current_user)
+        picker.user_selected.connect(self.on_user_changed)
+        self.user_pickers.append(picker)
+        return picker
     
     def setup_navigation_bar(self, return_callback=None):
         """
@@ -92,19 +71,18 @@ class UserManager(QObject):
         self.nav_bar = NavigationBar(return_callback or (lambda: None))  # No return callback if not provided
         self.nav_bar.setFixedHeight(40)
         
-        # Get users from database
+        # Load users from database
         try:
-            users = get_all_users()
-            log("UserManager", f"Retrieved {len(users)} users from database")
+            log("UserManager", f"Retrieved {user_list_model.user_count()} users from database")
         except Exception as e:
             error_msg = f"Failed to load users: {str(e)}"
             log("UserManager", f"Error: {error_msg}")
             if parent := self.parent():
                 QMessageBox.warning(parent, "Database Error", error_msg)
-            users = [{"id": 1, "display_name": "Anonymous"}]
         
         # Add user dropdown
-        self.user_dropdown = self.nav_bar.add_user_dropdown(users, self.current_user_id)
+        self.user_dropdown = self.nav_bar.add_user_dropdown(user_list_model, self.current_user_id)
+        self.user_dropdowns.append(self.user_dropdown)
         
         # Connect to our own handler instead of directly to the signal
         self.nav_bar.user_changed.connect(self.on_user_changed)
@@ -118,14 +96,23 @@ class UserManager(QObject):
         Args:
             user_id: The ID of the selected user
         """
+        # Rows inserted or removed above the selection shift its index without
+        # changing the user; there is nothing to do then
+        if user_id is None or user_id == self.current_user_id or self._adding_user:
+            return
+        
         log("UserManager", f"User changed to ID: {user_id}")
         
         # If it's the special "Add New User" option
-        if user_id == -1:
+        if user_id == ADD_USER_ID:
             # Add new user was selected
             log("UserManager", "Add new user selected, opening dialog...")
             parent = self.parent()
-            result = UserDialog.create_user(parent)
+            self._adding_user = True
+            try:
+                result = UserDialog.create_user(parent)
+            finally:
+                self._adding_user = False
             log("UserManager", f"Dialog result: {result}")
             
             if result:
@@ -133,9 +120,6 @@ class UserManager(QObject):
                 new_user_id, username, display_name = result
                 log("UserManager", f"New user created: {new_user_id}, {username}, {display_name}")
                 
-                # Update the dropdown with the new user selected
-                self.refresh_user_dropdown(new_user_id)
-                
                 # Set as current user
                 self.current_user_id = new_user_id
                 self.current_user = {
@@ -144,69 +128,55 @@ class UserManager(QObject):
                     "display_name": display_name
                 }
                 
+                # The shared model already has the new user; just select it
+                self.refresh_user_dropdown(new_user_id)
+                
                 # Emit signal
                 self.user_changed.emit(self.current_user)
             else:
                 # Dialog was canceled or failed
                 log("UserManager", "User creation canceled or failed")
                 # Reset to the previously selected user
-                try:
-                    # Find the index for the current user ID
-                    for i in range(self.user_dropdown.count()):
-                        if self.user_dropdown.itemData(i) == self.current_user_id:
-                            self.user_dropdown.setCurrentIndex(i)
-                            break
-                except Exception as e:
-                    log("UserManager", f"Error resetting user dropdown: {str(e)}")
-                    # If all else fails, set to the first item
-                    if self.user_dropdown.count() > 0:
-                        self.user_dropdown.setCurrentIndex(0)
+                self.refresh_user_dropdown(self.current_user_id)
         else:
             # Regular user selection
             self.current_user_id = user_id
-            self.current_user = get_user(user_id) or {"id": user_id}
+            self.current_user = user_directory.get_user(user_id) or {"id": user_id}
+            
+            # Show the new user in the other selectors too
+            self.refresh_user_dropdown(user_id)
             
             # Emit signal
             self.user_changed.emit(self.current_user)
     
     def refresh_user_dropdown(self, select_user_id=None):
         """
-        Refresh the user dropdown with current users.
+        Select a user in every user dropdown and picker.
+        
+        The dropdowns show the shared user model, which follows user changes by
+        itself, so only the selection needs updating here.
         
         Args:
-            select_user_id: User ID to select after refresh
+            select_user_id: User ID to select
         """
-        if not self.user_dropdown:
+        if not self.user_dropdowns and not self.user_pickers:
             log("UserManager", "Cannot refresh dropdown: dropdown not initialized")
             return
-            
-        try:
-            users = get_all_users()
-            log("UserManager", f"Refreshing dropdown with {len(users)} users")
-            
-            # Clear and repopulate dropdown
-            current_index = 0
-            self.user_dropdown.clear()
-            
-            for i, user in enumerate(users):
-                self.user_dropdown.addItem(user['display_name'], user['id'])
-                if select_user_id and user['id'] == select_user_id:
-                    current_index = i
-            
-            # Add the "Add New User" option
-            self.user_dropdown.addItem("+ Add New User", -1)
-            
-            # Set the selected index
-            if select_user_id:
-                self.user_dropdown.setCurrentIndex(current_index)
-                log("UserManager", f"Selected user ID {select_user_id} at index {current_index}")
-                
-        except Exception as e:
-            error_msg = f"Failed to refresh users: {str(e)}"
-            log("UserManager", f"Error: {error_msg}")
-            parent = self.parent()
-            if parent:
-                QMessageBox.warning(parent, "Database Error", error_msg)
+        if select_user_id is None:
+            return
+        
+        for picker in self.user_pickers:
+            picker.set_current_user(user_directory.get_user(select_user_id) or self.current_user)
+        if not self.user_dropdowns:
+            return
+        
+        row = user_list_model.row_of(select_user_id)
+        if row < 0:
+            # If all else fails, fall back to the first user
+            row = 0
+        for dropdown in self.user_dropdowns:
+            dropdown.setCurrentIndex(row)
+        log("UserManager", f"Selected user ID {select_user_id} at index {row}")
     
     def get_current_user(self):
         """
@@ -0,0 +1,168 @@
+"""
+Prefix search over the quiz application's users.
+
+Keeps a sorted list of (search term, user ID) pairs built from the user
+directory: the case-folded display name, the username and every later word of
+the display name, so "kow" finds "Anna Kowalska". A search is a binary search
+for the prefix followed by a walk over the matching run, which stays well under
+a millisecond even for rosters of thousands of students.
+
+Rosters of USER_SEARCH_SQL_MIN_USERS or more are not indexed in memory; they
+are searched with database.users.search_users() through the COLLATE NOCASE
+indexes instead, matching the start of the display name or username only.
+"""
+import bisect
+from typing import Any, Dict, List
+
+from .database import users as users_db
+from .mappings import USER_SEARCH_SQL_MIN_USERS
+from .user_directory import user_directory
+from .debug import log
+
+# Default maximum number of users returned by a search
+SEARCH_RESULT_LIMIT = 20
+
+
+def normalize(text: str) -> str:
+    """Normalize text for case-insensitive prefix matching."""
+    return " ".join((text or "").casefold().split())
+
+
+class UserSearchIndex:
+    """Sorted prefix index over the display names and usernames in a UserDirectory.
+
+    The index is built on the first search and then kept in sync with the
+    directory's change signals, one user at a time.
+    """
+
+    def __init__(self, directory=user_directory, sql_min_users=USER_SEARCH_SQL_MIN_USERS):
+        """
+        Initialize the index.
+
+        Args:
+            directory: The UserDirectory to index
+            sql_min_users: Roster size from which searches go to the database instead
+        """
+        self.directory = directory
+        self.sql_min_users = sql_min_users
+        # Sorted (term, user ID) pairs
+        self._entries: List[tuple] = []
+        # User ID -> the terms indexed for it, to find its entries again
+        self._terms_by_id: Dict[int, tuple] = {}
+        self._built = False
+
+        directory.user_added.connect(self._on_user_added)
+        directory.user_updated.connect(self._on_user_updated)
+        directory.user_removed.connect(self._on_user_removed)
+        directory.users_reset.connect(self._on_users_reset)
+
+    def search(self, text: str, limit: int = SEARCH_RESULT_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Find users whose display name, username or a word of the display name
+        starts with the given text, ignoring case.
+
+        Args:
+            text: The text typed so far
+            limit: Maximum number of users to return
+
+        Returns:
+            Up to limit users, in display name order. An empty text returns the
+            first users of the roster.
+        """
+        prefix = normalize(text)
+        if not prefix:
+            count = min(limit, self.directory.count())
+            return [self.directory.user_at(i) for i in range(count)]
+
+        if self.directory.count() >= self.sql_min_users:
+            return self._search_database(text, limit)
+
+        self._ensure_built()
+
+        user_ids = []
+        seen = set()
+        position = bisect.bisect_left(self._entries, (prefix,))
+        while position < len(self._entries) and len(user_ids) < limit:
+            term, user_id = self._entries[position]
+            if not term.startswith(prefix):
+                break
+            if user_id not in seen:
+                seen.add(user_id)
+                user_ids.append(user_id)
+            position += 1
+
+        users = [self.directory.get_user(user_id) for user_id in user_ids]
+        users.sort(key=self.directory.sort_key)
+        return users
+
+    def _search_database(self, text: str, limit: int) -> List[Dict[str, Any]]:
+        """Search a large roster through the database's name indexes."""
+        rows = users_db.search_users(" ".join(text.split()), limit)
+        users = [self.directory.get_user(row["id"]) or dict(row) for row in rows]
+        users.sort(key=self.directory.sort_key)
+        return users
+
+    def _ensure_built(self) -> None:
+        """Build the index on first use."""
+        if not self._built:
+            self._build()
+
+    def _build(self) -> None:
+        """Index every user in the directory."""
+        self._terms_by_id = {
+            user["id"]: self._terms(user) for user in self.directory.get_all_users()
+        }
+        self._entries = sorted(
+            (term, user_id)
+            for user_id, terms in self._terms_by_id.items()
+            for term in terms
+        )
+        self._built = True
+        log("UserSearchIndex",
+            f"Indexed {len(self._terms_by_id)} users, {len(self._entries)} terms")
+
+    @staticmethod
+    def _terms(user: Dict[str, Any]) -> tuple:
+        """Get the distinct search terms of a user."""
+        display_name = normalize(user.get("display_name"))
+        terms = {display_name, normalize(user.get("username"))}
+        # Later words, so a search can start at a surname
+        words = display_name.split(" ")
+        terms.update(" ".join(words[i:]) for i in range(1, len(words)))
+        terms.discard("")
+        return tuple(terms)
+
+    def _add(self, user: Dict[str, Any]) -> None:
+        """Add the entries of one user."""
+        terms = self._terms(user)
+        self._terms_by_id[user["id"]] = terms
+        for term in terms:
+            bisect.insort(self._entries, (term, user["id"]))
+
+    def _remove(self, user_id: int) -> None:
+        """Remove the entries of one user."""
+        for term in self._terms_by_id.pop(user_id, ()):
+            position = bisect.bisect_left(self._entries, (term, user_id))
+            if position < len(self._entries) and self._entries[position] == (term, user_id):
+                del self._entries[position]
+
+    def _on_user_added(self, user):
+        if self._built:
+            self._add(user)
+
+    def _on_user_updated(self, user):
+        if self._built:
+            self._remove(user["id"])
+            self._add(user)
+
+    def _on_user_removed(self, user_id):
+        if self._built:
+            self._remove(user_id)
+
+    def _on_users_reset(self):
+        # Rebuilt on the next search
+        self._built = False
+
+
+# Create a singleton instance
+user_search_index = UserSearchIndex()
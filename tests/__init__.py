@@ -0,0 +1,17 @@
+"""
+Tests for the quiz application.
+
+The tests run against a throwaway database and question store cache, so they
+never touch quiz_data.db or .cache/, and use Qt's offscreen platform.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix='quiz-tests-')
+atexit.register(shutil.rmtree, _TMP_DIR, True)
+
+os.environ.setdefault('QUIZ_DB_FILE', os.path.join(_TMP_DIR, 'quiz_data.db'))
+os.environ.setdefault('QUIZ_CACHE_DIR', os.path.join(_TMP_DIR, 'cache'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
@@ -0,0 +1,105 @@
+"""
+Tests for grading typed answers to file-based quiz questions.
+"""
+import unittest
+
+from quizzes.answer_matching import (
+    AnswerMatcher, _SCAN_LIMIT, accepted_forms, allowed_distance, canonical_form, within_distance
+)
+
+
+class CanonicalFormTest(unittest.TestCase):
+    """The form answers are compared in."""
+
+    def test_case_accents_and_whitespace(self):
+        self.assertEqual(canonical_form('  Zepsuć   SIĘ '), 'zepsuc sie')
+        self.assertEqual(canonical_form('Straße'), 'strasse')
+        self.assertEqual(canonical_form('Łódź'), 'lodz')
+        self.assertEqual(canonical_form('Ærø'), 'aero')
+
+    def test_compatibility_forms(self):
+        # Full-width letters and ligatures decompose to plain ones
+        self.assertEqual(canonical_form('ＡＢＣ'), 'abc')
+        self.assertEqual(canonical_form('ﬁsh'), 'fish')
+
+    def test_numbers_compare_as_text(self):
+        self.assertEqual(canonical_form(42), '42')
+
+    def test_accepted_forms(self):
+        self.assertEqual(accepted_forms({'answer': 'Café'}), {'cafe'})
+        self.assertEqual(
+            accepted_forms({'answer': 'Coffee', 'correct_answers': ['Kaffee', ' ', 'KAWA']}),
+            {'kaffee', 'kawa'}
+        )
+        self.assertEqual(accepted_forms({'answer': 7}), {'7'})
+        self.assertEqual(accepted_forms({'correct_answers': 'Tak'}), {'tak'})
+
+
+class EditDistanceTest(unittest.TestCase):
+    """The typo threshold and the banded Levenshtein check."""
+
+    def test_allowed_distance_grows_with_length(self):
+        self.assertEqual(allowed_distance('cat'), 0)
+        self.assertEqual(allowed_distance('horse'), 1)
+        self.assertEqual(allowed_distance('photosynthesis'), 1)
+        self.assertEqual(allowed_distance('photosynthesis', max_distance=2), 2)
+
+    def test_answers_with_digits_match_exactly(self):
+        self.assertEqual(allowed_distance('route 66'), 0)
+
+    def test_within_distance(self):
+        self.assertTrue(within_distance('kitten', 'kitten', 0))
+        self.assertTrue(within_distance('kitten', 'sitten', 1))   # substitution
+        self.assertTrue(within_distance('kitten', 'kiten', 1))    # deletion
+        self.assertTrue(within_distance('kitten', 'kittens', 1))  # insertion
+        self.assertFalse(within_distance('kitten', 'sitting', 2))
+        self.assertTrue(within_distance('kitten', 'sitting', 3))
+        self.assertFalse(within_distance('abc', 'abcdef', 2))
+        self.assertTrue(within_distance('', 'a', 1))
+
+
+class AnswerMatcherTest(unittest.TestCase):
+    """Grading against the accepted forms of one question."""
+
+    def test_exact_match_in_any_form(self):
+        matcher = AnswerMatcher(accepted_forms({'answer': 'Zepsuć się'}))
+        self.assertTrue(matcher.matches('zepsuc  sie'))
+        self.assertTrue(matcher.matches('ZEPSUĆ SIĘ', fuzzy=False))
+
+    def test_one_typo_in_a_long_answer(self):
+        matcher = AnswerMatcher(accepted_forms({'answer': 'photosynthesis'}))
+        self.assertTrue(matcher.matches('photosynthesys'))
+        self.assertTrue(matcher.matches('photosyntesis'))
+        self.assertFalse(matcher.matches('fotosyntesis'))
+
+    def test_short_answers_must_match_exactly(self):
+        matcher = AnswerMatcher(accepted_forms({'answer': 'dog'}))
+        self.assertFalse(matcher.matches('dig'))
+
+    def test_no_typos_for_picked_options(self):
+        matcher = AnswerMatcher(accepted_forms({'answer': 'photosynthesis'}))
+        self.assertFalse(matcher.matches('photosynthesys', fuzzy=False))
+
+    def test_numbers_must_match_exactly(self):
+        matcher = AnswerMatcher(accepted_forms({'answer': '1066'}))
+        self.assertTrue(matcher.matches(1066))
+        self.assertFalse(matcher.matches('1067'))
+
+    def test_empty_answer(self):
+        matcher = AnswerMatcher(accepted_forms({'answer': 'horse'}))
+        self.assertFalse(matcher.matches('   '))
+
+    def test_many_accepted_answers_use_deletion_index(self):
+        answers = [f'answer{chr(ord("a") + i % 26)}{chr(ord("a") + i // 26)}xyz'
+                   for i in range(_SCAN_LIMIT * 2)]
+        matcher = AnswerMatcher(accepted_forms({'correct_answers': answers}))
+        self.assertTrue(matcher.matches('answerbaxyz'))
+        self.assertTrue(matcher.matches('answrbaxyz'))    # deletion
+        self.assertTrue(matcher.matches('answerbaxyzz'))  # insertion
+        self.assertTrue(matcher.matches('answerbaxyq'))   # substitution
+        self.assertFalse(matcher.matches('anwerbaxyq'))
+        self.assertIsNotNone(matcher._variants)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Tests for picking multiple-choice distractors by answer similarity.
+"""
+import random
+import unittest
+
+from quizzes.distractors import DistractorIndex
+
+ANSWERS = [
+    'photosynthesis', 'photosynthetic', 'photograph', 'photography', 'telegraph',
+    'mitochondria', 'chloroplast', 'Photosynthesis', 'zebra',
+]
+
+
+class DistractorIndexTest(unittest.TestCase):
+    """k-nearest answers of a built index."""
+
+    def setUp(self):
+        self.index = DistractorIndex.build(ANSWERS)
+
+    def test_repeats_are_indexed_once(self):
+        # 'Photosynthesis' is the same answer as 'photosynthesis' once canonical
+        self.assertEqual(len(self.index), len(ANSWERS) - 1)
+
+    def test_most_similar_first(self):
+        self.assertEqual(
+            self.index.similar('photograph', 3), ['photography', 'telegraph', 'photosynthetic']
+        )
+        self.assertEqual(self.index.similar('photosynthesis', 1), ['photosynthetic'])
+
+    def test_correct_answer_is_excluded(self):
+        for answer in ANSWERS:
+            with self.subTest(answer=answer):
+                picked = self.index.similar(answer, 3, rng=random.Random(1))
+                self.assertEqual(len(picked), 3)
+                self.assertNotIn(answer.lower(), [other.lower() for other in picked])
+
+    def test_correct_answer_is_excluded_in_any_form(self):
+        picked = self.index.similar('  PHOTOSYNTHESIS ', 8, rng=random.Random(1))
+        self.assertNotIn('photosynthesis', picked)
+        self.assertEqual(len(picked), len(self.index) - 1)
+
+    def test_accepted_alternatives_are_excluded(self):
+        picked = self.index.similar('photosynthesis', 3, exclude=['Photosynthetic'])
+        self.assertNotIn('photosynthetic', picked)
+        self.assertNotIn('photosynthesis', picked)
+
+    def test_dissimilar_answers_are_filled_in_at_random(self):
+        picked = self.index.similar('zebra', 3, rng=random.Random(1))
+        self.assertEqual(len(set(picked)), 3)
+        self.assertNotIn('zebra', picked)
+
+    def test_unknown_answer_gets_random_answers(self):
+        picked = self.index.similar('not in the file', 3, rng=random.Random(1))
+        self.assertEqual(len(set(picked)), 3)
+
+    def test_fewer_answers_than_requested(self):
+        index = DistractorIndex.build(['one', 'two'])
+        self.assertEqual(index.similar('one', 3), ['two'])
+
+    def test_section_round_trip(self):
+        data, layout = self.index.to_section()
+        loaded = DistractorIndex.from_section(memoryview(data), layout, 'hash')
+        self.assertEqual(loaded.answers, self.index.answers)
+        self.assertEqual(loaded.content_hash, 'hash')
+        for answer in ANSWERS:
+            self.assertEqual(loaded._most_similar(answer, 3), self.index._most_similar(answer, 3))
+
+    def test_section_of_other_version_is_ignored(self):
+        data, layout = self.index.to_section()
+        layout['version'] = -1
+        self.assertIsNone(DistractorIndex.from_section(memoryview(data), layout))
+
+
+if __name__ == '__main__':
+    unittest.main()
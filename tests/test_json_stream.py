@@ -0,0 +1,126 @@
+"""
+Tests for streaming and sampling large JSON arrays.
+"""
+import io
+import json
+import os
+import random
+import tempfile
+import tracemalloc
+import unittest
+from collections import Counter
+
+from quizzes.json_stream import iter_array_items, sample_array_items
+from quizzes.question_bank import sample_questions
+
+
+def questions(count):
+    """count numbered question dicts."""
+    return [{'question': f'question {i}', 'answer': f'answer {i}'} for i in range(count)]
+
+
+class IterArrayItemsTest(unittest.TestCase):
+    """Reading the items of an array one at a time."""
+
+    def test_list_form(self):
+        stream = io.StringIO(json.dumps(questions(3)))
+        self.assertEqual(list(iter_array_items(stream, key='questions')), questions(3))
+
+    def test_object_form_keeps_other_members(self):
+        members = {}
+        document = {'metadata': {'title': 'Test'}, 'questions': questions(3)}
+        stream = io.StringIO(json.dumps(document))
+        items = list(iter_array_items(stream, key='questions', members=members))
+        self.assertEqual(items, questions(3))
+        self.assertEqual(members['metadata'], {'title': 'Test'})
+
+    def test_object_without_key(self):
+        with self.assertRaises(ValueError):
+            list(iter_array_items(io.StringIO('{"users": []}'), key='questions'))
+
+
+class SampleArrayItemsTest(unittest.TestCase):
+    """Reservoir sampling of array items."""
+
+    def test_list_form(self):
+        stream = io.StringIO(json.dumps(list(range(100))))
+        sample, count = sample_array_items(stream, 10, rng=random.Random(1))
+        self.assertEqual(count, 100)
+        self.assertEqual(len(sample), 10)
+        self.assertEqual(len(set(sample)), 10)
+        # Picked items come back in array order
+        self.assertEqual(sample, sorted(sample))
+
+    def test_object_form(self):
+        members = {}
+        document = {'metadata': {'title': 'Test'}, 'questions': questions(50)}
+        stream = io.StringIO(json.dumps(document))
+        sample, count = sample_array_items(
+            stream, 5, key='questions', members=members, rng=random.Random(1)
+        )
+        self.assertEqual(count, 50)
+        self.assertEqual(len(sample), 5)
+        for item in sample:
+            self.assertIn(item, document['questions'])
+        self.assertEqual(members['metadata'], {'title': 'Test'})
+
+    def test_short_array_is_returned_whole(self):
+        sample, count = sample_array_items(io.StringIO('[1, 2, 3]'), 10)
+        self.assertEqual((sample, count), ([1, 2, 3], 3))
+
+    def test_zero_items_still_counts(self):
+        self.assertEqual(sample_array_items(io.StringIO('[1, 2, 3]'), 0), ([], 3))
+
+    def test_every_item_is_equally_likely(self):
+        rng = random.Random(7)
+        picks = Counter()
+        for _ in range(4000):
+            sample, _ = sample_array_items(io.StringIO('[0, 1, 2, 3, 4, 5, 6, 7]'), 2, rng=rng)
+            picks.update(sample)
+        # 1000 picks each are expected
+        for item in range(8):
+            self.assertTrue(850 < picks[item] < 1150, picks)
+
+    def test_memory_is_bounded_by_sample_size(self):
+        text = json.dumps(questions(20000))
+        stream = io.StringIO(text)
+        tracemalloc.start()
+        try:
+            sample, count = sample_array_items(stream, 5, key='questions')
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual((len(sample), count), (5, 20000))
+        # Parsing the whole array would take several times the text's size
+        self.assertLess(peak, len(text) // 2)
+
+
+class SampleQuestionsTest(unittest.TestCase):
+    """Sampling the questions of a question file."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'questions.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, document):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+
+    def test_list_form(self):
+        self.write(questions(30))
+        sampled, total, metadata = sample_questions(self.path, 4, rng=random.Random(1))
+        self.assertEqual((len(sampled), total, metadata), (4, 30, {}))
+
+    def test_object_form_drops_entries_that_are_not_questions(self):
+        self.write({'metadata': {'input_mode': 'input'}, 'questions': questions(3) + ['stray']})
+        sampled, total, metadata = sample_questions(self.path, 10)
+        self.assertEqual(sampled, questions(3))
+        self.assertEqual(total, 4)
+        self.assertEqual(metadata, {'input_mode': 'input'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Tests for the menu entries that open special screens instead of a quiz.
+"""
+import unittest
+from unittest import mock
+
+from PySide6.QtWidgets import QApplication
+
+import main
+from quizzes.components.roster_dialog import RosterDialog
+
+
+class SettingsMenuTest(unittest.TestCase):
+    """Entries of the Settings submenu."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.window = main.MainWindow(prewarm=False)
+        self.submenu = self.window.menu.get_submenu("Settings")
+
+    def tearDown(self):
+        self.window.deleteLater()
+
+    def test_users_opens_roster_dialog(self):
+        with mock.patch.object(RosterDialog, 'exec', return_value=0) as exec_dialog:
+            self.submenu.buttons["Users"].click()
+        exec_dialog.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Tests that the listing queries are served by their indexes.
+
+Run with: python -m unittest discover -s tests -t .
+"""
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from quizzes.database.__main__ import main
+from quizzes.database.migrations import migrate
+from quizzes.database.query_plans import (
+    INDEXED_QUERIES, ORDERED_INDEX_SCANS, check_query_plans, is_unindexed_step
+)
+
+
+class QueryPlanTest(unittest.TestCase):
+    """Query plans of a freshly migrated schema."""
+
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        migrate(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_listing_queries_are_indexed(self):
+        self.assertEqual(check_query_plans(self.conn), {})
+
+    def test_missing_index_is_reported(self):
+        self.conn.execute('DROP INDEX idx_scores_quiz_rank')
+        problems = check_query_plans(self.conn)
+        self.assertIn('top_scores_by_type', problems)
+        self.assertIn('scores_first_page_by_type', problems)
+
+    def test_ordered_scans_name_known_queries(self):
+        self.assertLessEqual(set(ORDERED_INDEX_SCANS), set(INDEXED_QUERIES))
+
+
+class UnindexedStepTest(unittest.TestCase):
+    """Classification of single plan steps."""
+
+    def test_table_scan(self):
+        self.assertTrue(is_unindexed_step('SCAN scores'))
+
+    def test_temporary_sort(self):
+        self.assertTrue(is_unindexed_step('USE TEMP B-TREE FOR ORDER BY'))
+
+    def test_index_search(self):
+        self.assertFalse(is_unindexed_step(
+            'SEARCH scores USING COVERING INDEX idx_scores_quiz_rank (quiz_type=?)'
+        ))
+
+    def test_index_scan_needs_allowance(self):
+        step = 'SCAN scores USING COVERING INDEX idx_scores_rank'
+        self.assertTrue(is_unindexed_step(step))
+        self.assertTrue(is_unindexed_step(step, 'idx_scores_player_history'))
+        self.assertFalse(is_unindexed_step(step, 'idx_scores_rank'))
+
+    def test_non_covering_index_scan(self):
+        step = 'SCAN scores USING INDEX idx_scores_rank'
+        self.assertTrue(is_unindexed_step(step, 'idx_scores_rank'))
+
+
+class CheckPlansCommandTest(unittest.TestCase):
+    """Exit status of python -m quizzes.database check-plans."""
+
+    def run_check_plans(self, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return main(['check-plans', *args])
+
+    def test_passes_on_fresh_schema(self):
+        self.assertEqual(self.run_check_plans(), 0)
+
+    def test_fails_on_database_without_indexes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'quiz_data.db')
+            conn = sqlite3.connect(path)
+            migrate(conn)
+            conn.execute('DROP INDEX idx_scores_rank')
+            conn.commit()
+            conn.close()
+            self.assertEqual(self.run_check_plans('--db', path), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Tests for compiling, opening and invalidating question stores.
+"""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from quizzes import question_store
+from quizzes.question_store import QuestionStoreCache
+
+
+QUESTIONS = [
+    {'question': 'Capital of France?', 'answer': 'Paris'},
+    {'question': 'Pick a prime', 'answer': '7', 'options': ['4', '6', '7', 9]},
+    'not a question',
+    {'question': 'Café?', 'answer': 'Coffee', 'correct_answers': ['Coffee', 'Kaffee']},
+]
+
+
+class QuestionStoreTest(unittest.TestCase):
+    """Stores compiled into a throwaway cache directory."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'questions.json')
+        self.cache = QuestionStoreCache(os.path.join(self.tmp.name, 'cache'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, document, mtime_ns=None):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_round_trip(self):
+        self.write({'metadata': {'title': 'Test', 'input_mode': 'input'}, 'questions': QUESTIONS})
+        store = self.cache.open(self.path)
+
+        # Entries that are not objects are dropped
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.metadata, {'title': 'Test', 'input_mode': 'input'})
+        self.assertEqual(store.input_mode, 'input')
+        for number, expected in enumerate(q for q in QUESTIONS if isinstance(q, dict)):
+            question = store.get(number)
+            self.assertEqual({k: v for k, v in question.items() if k != 'accepted_forms'}, expected)
+        self.assertEqual(store.get(2)['accepted_forms'], ['coffee', 'kaffee'])
+        self.assertEqual(store.field(0, 'options', 'none'), 'none')
+        with self.assertRaises(IndexError):
+            store.get(3)
+
+    def test_list_form(self):
+        self.write(QUESTIONS)
+        store = self.cache.open(self.path)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.metadata, {})
+
+    def test_select_in_order_and_shuffled(self):
+        self.write(QUESTIONS)
+        store = self.cache.open(self.path)
+        selection = store.select(2, shuffle=False)
+        self.assertEqual([q['answer'] for q in selection], ['Paris', '7'])
+
+        selection = store.select(shuffle=True)
+        self.assertEqual(sorted(q['answer'] for q in selection), ['7', 'Coffee', 'Paris'])
+
+    def test_store_is_reused_while_unchanged(self):
+        self.write(QUESTIONS)
+        store = self.cache.open(self.path)
+        self.assertIs(self.cache.open(self.path), store)
+
+        # A new cache opens the compiled store file instead of compiling again
+        cache = QuestionStoreCache(self.cache.cache_dir)
+        with mock.patch.object(question_store, 'compile_store') as compile_store:
+            self.assertEqual(cache.open(self.path).content_hash, store.content_hash)
+        compile_store.assert_not_called()
+
+    def test_touched_file_is_not_recompiled(self):
+        self.write(QUESTIONS, mtime_ns=1_000_000_000)
+        store = self.cache.open(self.path)
+        os.utime(self.path, ns=(2_000_000_000, 2_000_000_000))
+
+        with mock.patch.object(question_store, 'compile_store') as compile_store:
+            touched = self.cache.open(self.path)
+        compile_store.assert_not_called()
+        self.assertEqual(touched.content_hash, store.content_hash)
+        self.assertEqual(touched.mtime_ns, 2_000_000_000)
+
+    def test_changed_content_of_same_size_is_recompiled(self):
+        self.write([{'question': 'q', 'answer': 'a'}], mtime_ns=1_000_000_000)
+        store = self.cache.open(self.path)
+        self.write([{'question': 'q', 'answer': 'b'}], mtime_ns=2_000_000_000)
+
+        changed = self.cache.open(self.path)
+        self.assertNotEqual(changed.content_hash, store.content_hash)
+        self.assertEqual(changed.get(0)['answer'], 'b')
+        # Quizzes still holding the old store keep reading it
+        self.assertEqual(store.get(0)['answer'], 'a')
+
+    def test_invalidate_checks_file_again(self):
+        self.write(QUESTIONS)
+        store = self.cache.open(self.path)
+        self.cache.invalidate(self.path)
+        reopened = self.cache.open(self.path)
+        self.assertIsNot(reopened, store)
+        self.assertEqual(reopened.content_hash, store.content_hash)
+
+    def test_invalid_file(self):
+        self.write({'metadata': 'not an object', 'questions': []})
+        with self.assertRaises(ValueError):
+            self.cache.open(self.path)
+
+    def test_big_file_has_no_distractor_section(self):
+        from quizzes.distractors import DistractorIndex
+
+        self.write(QUESTIONS)
+        self.assertIsNotNone(self.cache.open(self.path).section('distractors'))
+
+        self.cache.invalidate()
+        self.write(QUESTIONS + [{'question': 'Extra', 'answer': 'Rome'}])
+        with mock.patch.object(question_store, 'QUESTION_STREAMING_MIN_BYTES', 0):
+            store = self.cache.open(self.path)
+        self.assertIsNone(store.section('distractors'))
+        self.assertEqual(len(DistractorIndex.from_store(store)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests for bulk roster import and export.
+"""
+import io
+import json
+import unittest
+
+from quizzes.database.db import get_connection
+from quizzes.database.roster import (
+    ISSUE_CONFLICT, ISSUE_DUPLICATE, ISSUE_INVALID, ISSUE_RESERVED, ON_CONFLICT_SKIP,
+    export_roster, import_roster
+)
+
+
+def roster_csv(*rows):
+    """A CSV roster with the given (username, display_name) rows."""
+    lines = ['username,display_name']
+    lines += [f'{username},{display_name}' for username, display_name in rows]
+    return io.StringIO('\n'.join(lines) + '\n', newline='')
+
+
+class RosterTest(unittest.TestCase):
+    """Roster import and export against the test database."""
+
+    def setUp(self):
+        self.conn = get_connection()
+        self.conn.execute("DELETE FROM users WHERE username != 'anonymous'")
+        self.conn.commit()
+
+    def users(self):
+        """Display name of every user but the anonymous one, by username."""
+        rows = self.conn.execute(
+            "SELECT username, display_name FROM users WHERE username != 'anonymous'"
+        )
+        return {row['username']: row['display_name'] for row in rows}
+
+    def issues(self, report):
+        """(line, kind) of every issue in a report."""
+        return [(issue['line'], issue['kind']) for issue in report['issues']]
+
+    def test_import_csv(self):
+        report = import_roster(roster_csv(('ada', 'Ada Lovelace'), ('alan', 'Alan Turing')), 'csv')
+        self.assertEqual(report['inserted'], 2)
+        self.assertEqual(report['issues'], [])
+        self.assertEqual(self.users(), {'ada': 'Ada Lovelace', 'alan': 'Alan Turing'})
+
+    def test_import_json_users_member(self):
+        stream = io.StringIO(json.dumps({'users': [{'username': 'ada'}]}))
+        report = import_roster(stream, 'json')
+        self.assertEqual(report['inserted'], 1)
+        # The display name defaults to the username
+        self.assertEqual(self.users(), {'ada': 'ada'})
+
+    def test_invalid_duplicate_and_reserved_rows_are_skipped(self):
+        stream = roster_csv(
+            ('ada', 'Ada'), ('bad name', 'Bad'), ('ada', 'Again'), ('Anonymous', 'Anon')
+        )
+        report = import_roster(stream, 'csv')
+        self.assertEqual(report['inserted'], 1)
+        self.assertEqual(report['skipped'], 3)
+        self.assertEqual(self.issues(report), [
+            (3, ISSUE_INVALID), (4, ISSUE_DUPLICATE), (5, ISSUE_RESERVED)
+        ])
+        self.assertEqual(self.users(), {'ada': 'Ada'})
+
+    def test_conflict_updates_display_name(self):
+        import_roster(roster_csv(('ada', 'Ada'), ('alan', 'Alan')), 'csv')
+        report = import_roster(roster_csv(('ada', 'Ada Lovelace'), ('alan', 'Alan')), 'csv')
+        self.assertEqual((report['updated'], report['unchanged']), (1, 1))
+        self.assertEqual(self.issues(report), [(2, ISSUE_CONFLICT)])
+        self.assertEqual(self.users()['ada'], 'Ada Lovelace')
+
+    def test_conflict_skip_keeps_display_name(self):
+        import_roster(roster_csv(('ada', 'Ada')), 'csv')
+        stream = roster_csv(('ada', 'Ada Lovelace'))
+        report = import_roster(stream, 'csv', on_conflict=ON_CONFLICT_SKIP)
+        self.assertEqual((report['updated'], report['skipped']), (0, 1))
+        self.assertEqual(self.issues(report), [(2, ISSUE_CONFLICT)])
+        self.assertEqual(self.users()['ada'], 'Ada')
+
+    def test_dry_run_reports_without_writing(self):
+        import_roster(roster_csv(('ada', 'Ada')), 'csv')
+        stream = roster_csv(('ada', 'Ada Lovelace'), ('alan', 'Alan'))
+        report = import_roster(stream, 'csv', dry_run=True)
+        self.assertEqual((report['inserted'], report['updated']), (1, 1))
+        self.assertEqual(self.users(), {'ada': 'Ada'})
+
+    def test_malformed_row_rolls_back_whole_import(self):
+        stream = io.StringIO('[{"username": "ada"}, {"username": "alan"}, {"username": ]')
+        with self.assertRaises(ValueError):
+            import_roster(stream, 'json')
+        self.assertEqual(self.users(), {})
+        # The connection is usable again after the rollback
+        self.assertEqual(import_roster(roster_csv(('ada', 'Ada')), 'csv')['inserted'], 1)
+
+    def test_missing_username_column(self):
+        with self.assertRaises(ValueError):
+            import_roster(io.StringIO('name\nada\n', newline=''), 'csv')
+
+    def test_export_imports_again(self):
+        import_roster(roster_csv(('ada', 'Ada Lovelace'), ('alan', 'Alan Turing')), 'csv')
+        for fmt in ('csv', 'json'):
+            with self.subTest(fmt=fmt):
+                stream = io.StringIO(newline='')
+                # Every user, the anonymous one included
+                self.assertEqual(export_roster(stream, fmt), 3)
+                stream.seek(0)
+                report = import_roster(stream, fmt)
+                self.assertEqual((report['inserted'], report['unchanged']), (0, 2))
+                self.assertEqual(self.issues(report), [(2 if fmt == 'csv' else 1, ISSUE_RESERVED)])
+
+
+if __name__ == '__main__':
+    unittest.main()